@@ -0,0 +1 @@
+"""Benchmarks for calculating the YAML source map."""
@@ -0,0 +1,62 @@
+"""
+Measure how long calculating a source map blocks the asyncio event loop.
+
+Run with:
+
+    python -m benchmarks.asynchronous
+
+"""
+
+import asyncio
+import concurrent.futures
+import time
+
+from yaml_source_map import acalculate, calculate
+
+from . import documents
+
+
+async def _heartbeat(delays: list, stop: asyncio.Event) -> None:
+    """Record how late each tick of the event loop is."""
+    while not stop.is_set():
+        start_time = time.perf_counter()
+        await asyncio.sleep(0.001)
+        delays.append(time.perf_counter() - start_time - 0.001)
+
+
+async def _measure(name: str, calculation) -> None:
+    """Print the time of a calculation and the longest stall of the event loop."""
+    delays: list = []
+    stop = asyncio.Event()
+    heartbeat = asyncio.ensure_future(_heartbeat(delays, stop))
+    await asyncio.sleep(0.01)
+    start_time = time.perf_counter()
+    await calculation()
+    elapsed = time.perf_counter() - start_time
+    stop.set()
+    await heartbeat
+    print(  # allow-print
+        f"{name}: {elapsed * 1000:.0f}ms, longest stall {max(delays) * 1000:.1f}ms"
+    )
+
+
+async def main() -> None:
+    """Calculate the compact source map of a document of about 1MB."""
+    source = documents.openapi(3000)
+
+    async def blocking():
+        calculate(source, compact=True)
+
+    await _measure("calculate in the event loop", blocking)
+    await _measure("acalculate in threads", lambda: acalculate(source, compact=True))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
+        # Start the worker before measuring
+        await acalculate("0", executor=executor)
+        await _measure(
+            "acalculate in processes",
+            lambda: acalculate(source, compact=True, executor=executor),
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+"""
+Compare calculate_many against calculating the source maps one at a time.
+
+Run with:
+
+    python -m benchmarks.batch
+
+"""
+
+import functools
+import os
+import timeit
+import typing
+
+from yaml_source_map import calculate, calculate_many
+
+from . import documents
+
+
+def _pooled(sources: typing.List[str], workers: int) -> None:
+    """Calculate the compact source maps with a pool of processes."""
+    list(calculate_many(sources, compact=True, workers=workers))
+
+
+def main() -> None:
+    """Time calculating many documents sequentially and with a pool of processes."""
+    sources = [documents.openapi(100 + index % 50) for index in range(200)]
+    sequential = min(
+        timeit.repeat(
+            lambda: [calculate(source, compact=True) for source in sources],
+            number=1,
+            repeat=3,
+        )
+    )
+    print(  # allow-print
+        f"{len(sources)} documents on {os.cpu_count()} processors: "
+        f"sequential {sequential:.2f}s"
+    )
+    for workers in sorted({1, 2, os.cpu_count() or 1}):
+        pooled = min(
+            timeit.repeat(
+                functools.partial(_pooled, sources, workers),
+                number=1,
+                repeat=3,
+            )
+        )
+        print(  # allow-print
+            f"calculate_many with {workers} workers {pooled:.2f}s, "
+            f"speedup {sequential / pooled:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Compare calculate against loading with safe_load and then mapping with handle.
+
+Both use the same engine. With libyaml, calculate also validates the source with
+the C parser before its tokens are scanned, the pure Python engine scans the source
+only once.
+
+Run with:
+
+    python -m benchmarks.calculate
+
+"""
+
+import functools
+import timeit
+import typing
+
+import yaml
+
+from yaml_source_map import calculate, handle, loader, types
+
+from . import documents
+
+_LOADERS = {"libyaml": getattr(yaml, "CSafeLoader", None), "python": yaml.SafeLoader}
+
+
+def two_pass(source: str, engine: types.TEngine) -> types.TSourceMap:
+    """Validate with safe_load and then map with a second scan of the source."""
+    yaml.load(source, Loader=_LOADERS[engine])  # nosec
+    token_loader = loader.create(source, engine=engine)
+    token_loader.get_token()
+    return dict(handle.value(loader=token_loader))
+
+
+def main() -> None:
+    """Time both approaches with each engine for increasing document sizes."""
+    engines: typing.Tuple[types.TEngine, ...] = ("libyaml", "python")
+    for engine in engines:
+        if _LOADERS[engine] is None:
+            continue
+        for path_count in (100, 1000, 5000):
+            source = documents.openapi(path_count)
+            assert calculate(source, engine=engine) == two_pass(source, engine)
+
+            number = max(1, 1000 // path_count)
+            single = min(
+                timeit.repeat(
+                    functools.partial(calculate, source, engine=engine),
+                    number=number,
+                    repeat=3,
+                )
+            )
+            double = min(
+                timeit.repeat(
+                    functools.partial(two_pass, source, engine),
+                    number=number,
+                    repeat=3,
+                )
+            )
+            print(  # allow-print
+                f"{engine:>7} {len(source):>10} characters: "
+                f"calculate {single / number:.4f}s, "
+                f"safe_load and calculate {double / number:.4f}s, "
+                f"ratio {single / double:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
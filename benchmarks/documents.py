@@ -0,0 +1,197 @@
+"""Generate large YAML documents for benchmarks."""
+
+
+def openapi(path_count: int) -> str:
+    """
+    Generate an OpenAPI style document.
+
+    Args:
+        path_count: The number of paths in the document.
+
+    Returns:
+        The YAML document.
+
+    """
+    lines = ["openapi: '3.0.0'", "info:", "  title: Benchmark", "paths:"]
+    for index in range(path_count):
+        lines.extend(
+            (
+                f"  /resource{index}:",
+                "    get:",
+                f"      summary: Retrieve resource {index}",
+                "      tags: [resource, benchmark]",
+                "      parameters:",
+                "        - name: id",
+                "          in: query",
+                "          required: true",
+                "      responses:",
+                "        '200':",
+                "          description: OK",
+                "          content: {application/json: {schema: {type: object}}}",
+            )
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _repeat(item: str, size: int) -> str:
+    """Repeat a formatted item until the document has at least size characters."""
+    parts = []
+    length = 0
+    index = 0
+    while length < size:
+        part = item.format(index=index)
+        parts.append(part)
+        length += len(part)
+        index += 1
+    return "".join(parts)
+
+
+def wide(size: int) -> str:
+    """
+    Generate a single mapping with many short scalar values.
+
+    Args:
+        size: The approximate number of characters of the document.
+
+    Returns:
+        The YAML document.
+
+    """
+    return _repeat("key{index}: {index}\n", size)
+
+
+def deep(depth: int, count: int = 1) -> str:
+    """
+    Generate a sequence of flow mappings nested inside each other.
+
+    Flow style is used so that the size of the document grows linearly with the
+    depth rather than with the square of the depth as block style indentation would.
+    The JSON pointers of the source map still grow with the square of the depth, so
+    large documents repeat mappings of a bounded depth rather than nesting deeper.
+
+    Args:
+        depth: The number of nested mappings of each item of the sequence.
+        count: The number of items of the sequence.
+
+    Returns:
+        The YAML document.
+
+    """
+    return ("- " + "{key: " * depth + "0" + "}" * depth + "\n") * count
+
+
+def deep_sequence(depth: int) -> str:
+    """
+    Generate flow sequences nested inside each other.
+
+    Args:
+        depth: The number of nested sequences.
+
+    Returns:
+        The YAML document.
+
+    """
+    return "[" * depth + "0" + "]" * depth + "\n"
+
+
+def deep_block(depth: int) -> str:
+    """
+    Generate block sequences nested inside each other on a single line.
+
+    Compact nested sequences keep the size of the document linear in the depth since
+    no line is indented.
+
+    Args:
+        depth: The number of nested sequences.
+
+    Returns:
+        The YAML document.
+
+    """
+    return "- " * depth + "0\n"
+
+
+def deep_indented(depth: int) -> str:
+    """
+    Generate block mappings nested inside each other with one key per line.
+
+    The size of the document grows with the square of the depth due to the
+    indentation.
+
+    Args:
+        depth: The number of nested mappings.
+
+    Returns:
+        The YAML document.
+
+    """
+    return "".join("  " * level + "key:\n" for level in range(depth)) + (
+        "  " * depth + "0\n"
+    )
+
+
+def flow(size: int) -> str:
+    """
+    Generate a sequence of flow style mappings and sequences.
+
+    Args:
+        size: The approximate number of characters of the document.
+
+    Returns:
+        The YAML document.
+
+    """
+    return _repeat(
+        "- {{name: item{index}, value: {index}, tags: [a, b, c], "
+        "nested: {{enabled: true, ratio: 0.5}}}}\n",
+        size,
+    )
+
+
+def block(size: int) -> str:
+    """
+    Generate an OpenAPI style document of block style mappings and sequences.
+
+    Args:
+        size: The approximate number of characters of the document.
+
+    Returns:
+        The YAML document.
+
+    """
+    # Each path of the OpenAPI document has about 300 characters
+    return openapi(max(1, size // 300))
+
+
+def long_scalar(size: int) -> str:
+    """
+    Generate a mapping of a few long plain, quoted and literal scalars.
+
+    Args:
+        size: The approximate number of characters of the document.
+
+    Returns:
+        The YAML document.
+
+    """
+    length = max(1, size // 4)
+    words = ("lorem ipsum " * (length // 12 + 1))[:length].strip()
+    literal = "\n".join(
+        f"  {words[start:start + 80]}" for start in range(0, len(words), 80)
+    )
+    return (
+        f"plain: {words}\n"
+        f"single: '{words}'\n"
+        f'double: "{words}"\n'
+        f"literal: |\n{literal}\n"
+    )
+
+
+# The generator of each kind of document by its name, called with a size
+GENERATORS = {
+    "wide": wide,
+    "deep": lambda size: deep(100, max(1, size // 700)),
+    "flow": flow,
+    "block": block,
+    "long_scalar": long_scalar,
+}
@@ -0,0 +1,53 @@
+"""
+Compare calculating the documents of a stream in one scan against in parallel.
+
+Run with:
+
+    python -m benchmarks.documents_stream
+
+"""
+
+import os
+import time
+
+from yaml_source_map import calculate_all
+
+_MANIFEST = """\
+---
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: service-{index}
+  labels: {{app: service-{index}, tier: backend}}
+spec:
+  replicas: 3
+  template:
+    spec:
+      containers:
+        - name: service-{index}
+          image: registry.example.com/service-{index}:1.0.{index}
+          ports: [{{containerPort: 8080}}, {{containerPort: 9090}}]
+          env:
+            - {{name: LOG_LEVEL, value: info}}
+            - {{name: INDEX, value: "{index}"}}
+"""
+
+
+def main() -> None:
+    """Time the compact source maps of a stream of 2000 manifests."""
+    source = "".join(_MANIFEST.format(index=index) for index in range(2000))
+    print(  # allow-print
+        f"{len(source) / 1e6:.1f}MB stream, {os.cpu_count()} processors"
+    )
+
+    for name, parallel in (("one scan", False), ("parallel", True)):
+        start_time = time.perf_counter()
+        source_maps = calculate_all(source, compact=True, parallel=parallel)
+        elapsed = time.perf_counter() - start_time
+        print(  # allow-print
+            f"{name}: {elapsed * 1000:.0f}ms for {len(source_maps)} documents"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Compare the libyaml and pure Python engines of calculate.
+
+The libyaml time includes the validation pass of its C parser before the tokens are
+scanned, the pure Python engine scans the source once.
+
+Run with:
+
+    python -m benchmarks.engine
+
+"""
+
+import functools
+import timeit
+import typing
+
+from yaml_source_map import calculate, types
+
+from . import documents
+
+
+def main() -> None:
+    """Time both engines for increasing document sizes."""
+    for path_count in (100, 1000, 5000):
+        source = documents.openapi(path_count)
+        assert calculate(source, engine="libyaml") == calculate(source, engine="python")
+
+        number = max(1, 1000 // path_count)
+        engines: typing.Tuple[types.TEngine, ...] = ("libyaml", "python")
+        times = {
+            engine: min(
+                timeit.repeat(
+                    functools.partial(calculate, source, engine=engine),
+                    number=number,
+                    repeat=3,
+                )
+            )
+            / number
+            for engine in engines
+        }
+        print(  # allow-print
+            f"{len(source):>10} characters: "
+            f"libyaml with validation pass {times['libyaml']:.4f}s, "
+            f"python {times['python']:.4f}s, "
+            f"speedup {times['python'] / times['libyaml']:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Measure the construction time and size of the source map types.
+
+Compares the slotted and frozen Location and Entry against dataclasses with a
+__dict__ for each instance.
+
+Run with:
+
+    python -m benchmarks.entry
+
+"""
+
+import dataclasses
+import functools
+import sys
+import timeit
+import typing
+
+from yaml_source_map import types
+
+
+@dataclasses.dataclass
+class DictLocation:
+    """Location with a __dict__ for each instance."""
+
+    line: int
+    column: int
+    position: int
+
+
+@dataclasses.dataclass
+class DictEntry:
+    """Entry with a __dict__ for each instance."""
+
+    value_start: DictLocation
+    value_end: DictLocation
+    key_start: typing.Optional[DictLocation] = None
+    key_end: typing.Optional[DictLocation] = None
+
+
+def size(instance: typing.Any) -> int:
+    """Calculate the bytes used by an instance including its locations."""
+    total = sys.getsizeof(instance)
+    if hasattr(instance, "__dict__"):
+        total += sys.getsizeof(instance.__dict__)
+        names = tuple(instance.__dict__)
+    else:
+        names = instance.__slots__
+    for name in names:
+        value = getattr(instance, name)
+        if isinstance(value, (types.Location, DictLocation)):
+            total += size(value)
+    return total
+
+
+def construct(
+    location: typing.Callable[..., typing.Any], entry: typing.Callable[..., typing.Any]
+) -> typing.Any:
+    """Construct an entry with a key from the location and entry types."""
+    return entry(
+        location(0, 6, 6), location(0, 7, 7), location(0, 1, 1), location(0, 4, 4)
+    )
+
+
+def main() -> None:
+    """Time the construction of an entry with a key and compare the sizes."""
+    kinds: typing.Tuple[
+        typing.Tuple[
+            str, typing.Callable[..., typing.Any], typing.Callable[..., typing.Any]
+        ],
+        ...,
+    ] = (
+        ("slotted", types.Location, types.Entry),
+        ("dict", DictLocation, DictEntry),
+    )
+    for name, location, entry in kinds:
+        number = 100000
+        seconds = min(
+            timeit.repeat(
+                functools.partial(construct, location, entry), number=number, repeat=5
+            )
+        )
+        instance = construct(location, entry)
+        print(  # allow-print
+            f"{name:>8}: {seconds / number * 1e9:.0f}ns per entry, "
+            f"{size(instance)} bytes per entry"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compare exporting source maps to JSON against converting each entry naively.
+
+Run with:
+
+    python -m benchmarks.export
+
+"""
+
+import functools
+import io
+import json
+import timeit
+import typing
+
+from yaml_source_map import calculate, to_json_source_map, types, write_json
+
+from . import documents
+
+
+def _location(location: types.Location) -> types.TLocationDict:
+    """Convert a location to a dictionary."""
+    return {"line": location.line, "column": location.column, "pos": location.position}
+
+
+def naive(source_map: typing.Mapping[str, types.Entry]) -> str:
+    """Convert each entry to dictionaries one at a time and then to JSON."""
+    json_source_map = {}
+    for pointer, entry in source_map.items():
+        json_entry = {
+            "value": _location(entry.value_start),
+            "valueEnd": _location(entry.value_end),
+        }
+        if entry.key_start is not None and entry.key_end is not None:
+            json_entry["key"] = _location(entry.key_start)
+            json_entry["keyEnd"] = _location(entry.key_end)
+        json_source_map[pointer] = json_entry
+    return json.dumps(json_source_map)
+
+
+def _dumps(source_map: typing.Mapping[str, types.Entry]) -> str:
+    """Export a source map with to_json_source_map and then to JSON."""
+    return json.dumps(to_json_source_map(source_map))
+
+
+def _write(source_map: typing.Mapping[str, types.Entry]) -> None:
+    """Export a source map with write_json to a new file in memory."""
+    write_json(source_map, io.StringIO())
+
+
+def _time(function: typing.Callable[[], typing.Any]) -> float:
+    """Time the fastest of three calls of a function in milliseconds."""
+    return min(timeit.repeat(function, number=1, repeat=3)) * 1000
+
+
+def main() -> None:
+    """Time each way of exporting the dictionary and the compact source map."""
+    source = documents.openapi(7000)
+    source_map = calculate(source)
+    compact_source_map = calculate(source, compact=True)
+    expected = naive(source_map)
+    print(f"{len(source_map)} entries")  # allow-print
+
+    source_maps: typing.Tuple[
+        typing.Tuple[str, typing.Mapping[str, types.Entry]], ...
+    ] = (
+        ("dictionary", source_map),
+        ("compact", compact_source_map),
+    )
+    for name, current_source_map in source_maps:
+        file = io.StringIO()
+        write_json(current_source_map, file)
+        assert file.getvalue() == expected
+        print(  # allow-print
+            f"{name}: naive and json.dumps "
+            f"{_time(functools.partial(naive, current_source_map)):.1f}ms, "
+            "to_json_source_map and json.dumps "
+            f"{_time(functools.partial(_dumps, current_source_map)):.1f}ms, "
+            f"write_json {_time(functools.partial(_write, current_source_map)):.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare the peak memory of calculate_file against reading the file for calculate.
+
+Run with:
+
+    python -m benchmarks.file
+
+"""
+
+import functools
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import typing
+
+from yaml_source_map import SourceMap, calculate, calculate_file, types
+
+from . import documents
+
+
+def _measure(function: typing.Callable[[], SourceMap]) -> None:
+    """Print the time and the peak memory allocated by a call of a function."""
+    gc.collect()
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    source_map = function()
+    elapsed = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(  # allow-print
+        f"  {elapsed:.2f}s, peak {peak / 1e6:.1f}MB, "
+        f"source map {sys.getsizeof(source_map) / 1e6:.1f}MB"
+    )
+
+
+def _read_and_calculate(path: str, engine: types.TEngine) -> SourceMap:
+    """Read and decode the file in full before calculating the source map."""
+    with open(path, "rb") as file:
+        data = file.read()
+    return calculate(data.decode("utf-8"), engine=engine, compact=True)
+
+
+def _calculate_file(path: str, engine: types.TEngine) -> SourceMap:
+    """Calculate the source map of the file while it is read in chunks."""
+    return calculate_file(path, engine=engine, compact=True)
+
+
+def main() -> None:
+    """Measure the compact source map of a file of about 3MB with each engine."""
+    with tempfile.NamedTemporaryFile("wb", suffix=".yaml", delete=False) as file:
+        file.write(documents.openapi(10000).encode("utf-8"))
+    try:
+        print(f"{os.path.getsize(file.name) / 1e6:.1f}MB file")  # allow-print
+        engines: typing.Tuple[types.TEngine, ...] = ("libyaml", "python")
+        for engine in engines:
+            print(f"{engine} read and calculate:")  # allow-print
+            _measure(functools.partial(_read_and_calculate, file.name, engine))
+            print(f"{engine} calculate_file:")  # allow-print
+            _measure(functools.partial(_calculate_file, file.name, engine))
+    finally:
+        os.unlink(file.name)
+
+
+if __name__ == "__main__":
+    main()
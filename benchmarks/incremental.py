@@ -0,0 +1,49 @@
+"""
+Compare recalculating the source map after an edit with calculating it again.
+
+Run with:
+
+    python -m benchmarks.incremental
+
+"""
+
+import time
+
+from yaml_source_map import calculate, recalculate
+
+from . import documents
+
+
+def main() -> None:
+    """Time typing characters into a summary at the start, middle and end."""
+    source = documents.openapi(7000)
+    source_map = calculate(source, compact=True)
+    start_time = time.perf_counter()
+    calculate(source, compact=True)
+    full_time = time.perf_counter() - start_time
+    print(  # allow-print
+        f"{len(source)} characters, {len(source_map)} entries, "
+        f"full calculation {full_time * 1000:.1f}ms"
+    )
+
+    for name, path_index in (("start", 0), ("middle", 3500), ("end", 6999)):
+        position = source.index(f"Retrieve resource {path_index}\n") + 8
+        times = []
+        for text in "abcdefghijklmnopqrst":
+            start_time = time.perf_counter()
+            source_map = recalculate(
+                source_map, source, start=position, end=position, text=text
+            )
+            times.append(time.perf_counter() - start_time)
+            source = source[:position] + text + source[position:]
+            position += 1
+
+        assert source_map == calculate(source, compact=True)
+        print(  # allow-print
+            f"{name:>6}: mean {sum(times) / len(times) * 1000:.2f}ms, "
+            f"max {max(times) * 1000:.2f}ms per edit"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Compare looking up few and many positions with lookup_many against lookup.
+
+Run with:
+
+    python -m benchmarks.index
+
+"""
+
+import functools
+import random
+import timeit
+import typing
+
+from yaml_source_map import PositionIndex, calculate
+
+from . import documents
+
+
+def _lookup(index: PositionIndex, positions: typing.Sequence[int]) -> None:
+    """Look up each position on its own."""
+    for position in positions:
+        index.lookup(position)
+
+
+def _time(function: typing.Callable[[], typing.Any]) -> float:
+    """Time the fastest of five calls of a function in milliseconds."""
+    return min(timeit.repeat(function, number=1, repeat=5)) * 1000
+
+
+def main() -> None:
+    """Time looking up increasing numbers of random positions in a large index."""
+    source = documents.openapi(7000)
+    index = PositionIndex(calculate(source, compact=True))
+    print(f"{len(source)} characters")  # allow-print
+    positions_random = random.Random(0)
+    for count in (1, 10, 1000, 100_000):
+        positions = [positions_random.randrange(len(source)) for _ in range(count)]
+        assert index.lookup_many(positions) == [
+            index.lookup(position) for position in positions
+        ]
+        print(  # allow-print
+            f"{count} positions: lookup "
+            f"{_time(functools.partial(_lookup, index, positions)):.3f}ms, "
+            "lookup_many "
+            f"{_time(functools.partial(index.lookup_many, positions)):.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
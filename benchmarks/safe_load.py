@@ -0,0 +1,64 @@
+"""
+Compare safe_load against loading the value and calculating the source map apart.
+
+Run with:
+
+    python -m benchmarks.safe_load
+
+"""
+
+import functools
+import timeit
+import typing
+
+import yaml
+
+from yaml_source_map import calculate, safe_load, types
+
+from . import documents
+
+_LOADERS: typing.Dict[types.TEngine, typing.Any] = {
+    "libyaml": getattr(yaml, "CSafeLoader", None),
+    "python": yaml.SafeLoader,
+}
+
+
+def separate(source: str, engine: types.TEngine, loader: typing.Any) -> None:
+    """Load the value with PyYAML and then calculate the source map."""
+    yaml.load(source, Loader=loader)  # nosec
+    calculate(source, engine=engine, compact=True)
+
+
+def combined(source: str, engine: types.TEngine) -> None:
+    """Load the value together with the source map."""
+    safe_load(source, engine=engine, compact=True)
+
+
+def main() -> None:
+    """Time both approaches with each engine for a document of about 1MB."""
+    source = documents.openapi(3000)
+    for engine, loader in _LOADERS.items():
+        if loader is None:
+            continue
+
+        separate_seconds = min(
+            timeit.repeat(
+                functools.partial(separate, source, engine, loader),
+                number=1,
+                repeat=3,
+            )
+        )
+        combined_seconds = min(
+            timeit.repeat(
+                functools.partial(combined, source, engine), number=1, repeat=3
+            )
+        )
+        print(  # allow-print
+            f"{engine}: yaml.load and calculate {separate_seconds:.3f}s, "
+            f"safe_load {combined_seconds:.3f}s, "
+            f"speedup {separate_seconds / combined_seconds:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Check that calculating the source map scales linearly in the width and depth.
+
+Each kind of document is generated at doubling sizes and the exponent of the time
+against the number of characters is fitted. The run fails if any exponent is above
+1 by more than the tolerance. The known superlinear behaviour of the scanners is
+checked against the exponent recorded for it instead, so that it is tracked rather
+than ignored.
+
+Run with:
+
+    python -m benchmarks.scaling
+
+"""
+
+import argparse
+import functools
+import math
+import sys
+import timeit
+import typing
+
+from yaml_source_map import calculate, types
+
+from . import documents
+
+# The document of each dimension at a size, with the smallest size to measure
+_DIMENSIONS: typing.Dict[str, typing.Tuple[typing.Callable[[int], str], int]] = {
+    "mapping width": (documents.wide, 50_000),
+    "sequence width": (documents.flow, 50_000),
+    "mapping depth": (documents.deep, 250),
+    "sequence depth": (documents.deep_sequence, 250),
+    "block depth": (documents.deep_block, 1000),
+    "indented depth": (documents.deep_indented, 250),
+    "scalar length": (documents.long_scalar, 200_000),
+}
+# The exponent and the reason of each engine and dimension that is known to scale
+# superlinearly
+_KNOWN: typing.Dict[typing.Tuple[str, str], typing.Tuple[float, str]] = {
+    ("libyaml", "mapping depth"): (
+        2.0,
+        "the libyaml scanner checks the simple key of every flow level at each token",
+    ),
+    ("libyaml", "sequence depth"): (
+        2.0,
+        "the libyaml scanner checks the simple key of every flow level at each token",
+    ),
+    ("libyaml", "block depth"): (
+        1.5,
+        "the JSON pointers grow with the depth, which shows once the scanning is fast",
+    ),
+    ("python", "sequence depth"): (
+        2.5,
+        "the PyYAML scanner checks the possible simple key of every flow level at "
+        "each token",
+    ),
+}
+
+
+def exponent(sizes: typing.Sequence[float], seconds: typing.Sequence[float]) -> float:
+    """
+    Fit the exponent k of seconds = c * size ** k by least squares on a log scale.
+
+    Args:
+        sizes: The size of each measurement.
+        seconds: The time of each measurement.
+
+    Returns:
+        The exponent, 1 for linear and 2 for quadratic scaling.
+
+    """
+    log_sizes = [math.log(size) for size in sizes]
+    log_seconds = [math.log(second) for second in seconds]
+    mean_size = sum(log_sizes) / len(log_sizes)
+    mean_seconds = sum(log_seconds) / len(log_seconds)
+    return sum(
+        (log_size - mean_size) * (log_second - mean_seconds)
+        for log_size, log_second in zip(log_sizes, log_seconds)
+    ) / sum((log_size - mean_size) ** 2 for log_size in log_sizes)
+
+
+def _calculate(source: str, engine: types.TEngine) -> None:
+    """Calculate the compact source map of a source."""
+    calculate(source, engine=engine, compact=True)
+
+
+def main() -> None:
+    """Fit the exponent of each dimension for each engine and fail if superlinear."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=4)
+    parser.add_argument("--tolerance", type=float, default=0.3)
+    parser.add_argument(
+        "--dimensions", nargs="+", choices=list(_DIMENSIONS), default=list(_DIMENSIONS)
+    )
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        choices=typing.get_args(types.TEngine),
+        default=["libyaml", "python"],
+    )
+    args = parser.parse_args()
+
+    found = []
+    for engine in args.engines:
+        for dimension in args.dimensions:
+            generate, smallest = _DIMENSIONS[dimension]
+            sizes = []
+            seconds = []
+            for step in range(args.steps):
+                source = generate(smallest * 2**step)
+                sizes.append(len(source))
+                seconds.append(
+                    min(
+                        timeit.repeat(
+                            functools.partial(_calculate, source, engine),
+                            number=1,
+                            repeat=3,
+                        )
+                    )
+                )
+            fitted = exponent(sizes, seconds)
+            print(  # allow-print
+                f"{engine:>7} {dimension:>14}: exponent {fitted:.2f}, "
+                f"{seconds[0]:.3f}s to {seconds[-1]:.3f}s "
+                f"for {sizes[-1] // sizes[0]}x the size"
+            )
+            expected = 1.0
+            if (engine, dimension) in _KNOWN:
+                expected, reason = _KNOWN[(engine, dimension)]
+                print(f"  known exponent {expected:.2f}: {reason}")  # allow-print
+            if fitted > expected + args.tolerance:
+                found.append(
+                    f"{engine} {dimension}: exponent {fitted:.2f}, "
+                    f"expected {expected:.2f}"
+                )
+
+    if found:
+        print("superlinear:", *found, sep="\n  ")  # allow-print
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compare the binary format of source maps against pickling the dictionary.
+
+Run with:
+
+    python -m benchmarks.serialize
+
+"""
+
+import pickle
+import tempfile
+import time
+
+from yaml_source_map import calculate, dump, dumps, load, loads
+
+from . import documents
+
+
+def _time(function) -> float:
+    """Time a single call of a function in milliseconds."""
+    start_time = time.perf_counter()
+    function()
+    return (time.perf_counter() - start_time) * 1000
+
+
+def main() -> None:
+    """Time dumping and loading a source map with about 500k entries."""
+    source = documents.openapi(28000)
+    source_map = calculate(source, compact=True)
+    dictionary = dict(source_map)
+
+    data = dumps(source_map)
+    pickled = pickle.dumps(dictionary, protocol=pickle.HIGHEST_PROTOCOL)
+    print(  # allow-print
+        f"{len(source_map)} entries: binary {len(data) / 1e6:.1f}MB, "
+        f"pickled dictionary {len(pickled) / 1e6:.1f}MB"
+    )
+    print(  # allow-print
+        f"dump: binary {_time(lambda: dumps(source_map)):.1f}ms, pickled dictionary "
+        f"{_time(lambda: pickle.dumps(dictionary)):.1f}ms"
+    )
+    print(  # allow-print
+        f"load: binary {_time(lambda: loads(data)):.3f}ms, pickled dictionary "
+        f"{_time(lambda: pickle.loads(pickled)):.1f}ms"
+    )
+
+    with tempfile.TemporaryFile() as file:
+        dump(source_map, file)
+        file.flush()
+        file.seek(0)
+        start_time = time.perf_counter()
+        entry = load(file)["/paths//resource14000/get/summary"]
+        elapsed = (time.perf_counter() - start_time) * 1000
+        print(  # allow-print
+            f"memory-mapped load and first lookup {elapsed:.3f}ms, "
+            f"line {entry.value_start.line}"
+        )
+
+
+if __name__ == "__main__":
+    main()
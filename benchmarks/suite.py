@@ -0,0 +1,202 @@
+"""
+Measure calculate and the handle functions for synthetic documents of any size.
+
+Reports the throughput, the time per source map entry and the peak memory traced by
+tracemalloc for each kind of document, size and function. The results are compared
+against the baselines stored by a previous run with --update and the run fails if
+any of them regressed by more than the tolerance.
+
+Run with:
+
+    python -m benchmarks.suite
+    python -m benchmarks.suite --sizes 10KB 1MB 200MB --update
+
+"""
+
+import argparse
+import collections
+import gc
+import json
+import pathlib
+import sys
+import timeit
+import tracemalloc
+import typing
+
+from yaml_source_map import calculate, handle, loader, types
+
+from . import documents
+
+_BASELINES = pathlib.Path(__file__).parent / "baselines.json"
+_UNITS = {"KB": 1_000, "MB": 1_000_000, "GB": 1_000_000_000}
+
+
+def _handle(function: typing.Callable, source: str, engine: types.TEngine) -> None:
+    """Consume the source map of a handle function from a new source of tokens."""
+    source_loader = loader.create(source, engine=engine)
+    source_loader.get_token()
+    collections.deque(function(loader=source_loader), maxlen=0)
+
+
+# The function that calculates the source map of a source with an engine by its name
+FUNCTIONS: typing.Dict[str, typing.Callable[[str, types.TEngine], typing.Any]] = {
+    "calculate": lambda source, engine: calculate(source, engine=engine),
+    "calculate compact": lambda source, engine: calculate(
+        source, engine=engine, compact=True
+    ),
+    "handle.value": lambda source, engine: _handle(handle.value, source, engine),
+    "handle.walk": lambda source, engine: _handle(handle.walk, source, engine),
+}
+
+
+def parse_size(size: str) -> int:
+    """
+    Convert a size such as 10KB or 200MB to a number of characters.
+
+    Args:
+        size: The number optionally followed by KB, MB or GB.
+
+    Returns:
+        The number of characters.
+
+    """
+    for unit, factor in _UNITS.items():
+        if size.upper().endswith(unit):
+            return int(float(size[: -len(unit)]) * factor)
+    return int(size)
+
+
+def peak_memory(function: typing.Callable[[], typing.Any]) -> int:
+    """
+    Trace the peak memory allocated while a function is called.
+
+    Args:
+        function: The function to call.
+
+    Returns:
+        The peak number of bytes allocated, including the return value.
+
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def measure(source: str, name: str, engine: types.TEngine) -> typing.Dict[str, float]:
+    """
+    Measure a function for a source.
+
+    Args:
+        source: The YAML document.
+        name: The name of the function, see FUNCTIONS.
+        engine: The engine that scans the source.
+
+    Returns:
+        The seconds, the throughput in MB per second, the nanoseconds per source map
+        entry and the peak memory in bytes.
+
+    """
+    function = FUNCTIONS[name]
+    # Large documents are timed once, small ones often enough to be measurable
+    number = max(1, 1_000_000 // len(source))
+    seconds = (
+        min(timeit.repeat(lambda: function(source, engine), number=number, repeat=3))
+        / number
+    )
+    entry_count = len(calculate(source, engine=engine, compact=True))
+    return {
+        "seconds": seconds,
+        "throughput": len(source) / seconds / 1e6,
+        "entry_latency": seconds / entry_count * 1e9,
+        "peak": peak_memory(lambda: function(source, engine)),
+    }
+
+
+def regressions(
+    key: str,
+    result: typing.Dict[str, float],
+    baseline: typing.Optional[typing.Dict[str, float]],
+    tolerance: float,
+) -> typing.List[str]:
+    """
+    Compare a result against its baseline.
+
+    Args:
+        key: The name of the measurement.
+        result: The measurement, see measure.
+        baseline: The measurement stored by a previous run, if any.
+        tolerance: The fraction by which the result may be worse than the baseline.
+
+    Returns:
+        A description of each regression.
+
+    """
+    if baseline is None:
+        return []
+
+    found = []
+    if result["throughput"] < baseline["throughput"] * (1 - tolerance):
+        found.append(
+            f"{key}: throughput {result['throughput']:.2f}MB/s, "
+            f"baseline {baseline['throughput']:.2f}MB/s"
+        )
+    if result["peak"] > baseline["peak"] * (1 + tolerance):
+        found.append(
+            f"{key}: peak {result['peak'] / 1e6:.2f}MB, "
+            f"baseline {baseline['peak'] / 1e6:.2f}MB"
+        )
+    return found
+
+
+def main() -> None:
+    """Measure each combination, compare against the baselines and store them."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", nargs="+", default=["10KB", "1MB"])
+    parser.add_argument("--documents", nargs="+", default=list(documents.GENERATORS))
+    parser.add_argument("--functions", nargs="+", default=list(FUNCTIONS))
+    parser.add_argument(
+        "--engine", choices=typing.get_args(types.TEngine), default="auto"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--baselines", type=pathlib.Path, default=_BASELINES)
+    parser.add_argument(
+        "--update", action="store_true", help="store the results as the baselines"
+    )
+    args = parser.parse_args()
+
+    baselines = (
+        json.loads(args.baselines.read_text()) if args.baselines.exists() else {}
+    )
+    found = []
+    for document in args.documents:
+        for size in args.sizes:
+            source = documents.GENERATORS[document](parse_size(size))
+            for name in args.functions:
+                key = f"{document}/{size}/{name}/{args.engine}"
+                result = measure(source, name, args.engine)
+                print(  # allow-print
+                    f"{key:>45}: {result['throughput']:7.2f}MB/s, "
+                    f"{result['entry_latency']:8.0f}ns per entry, "
+                    f"peak {result['peak'] / 1e6:8.2f}MB"
+                )
+                found.extend(
+                    regressions(key, result, baselines.get(key), args.tolerance)
+                )
+                if args.update:
+                    baselines[key] = result
+
+    if args.update:
+        args.baselines.write_text(json.dumps(baselines, indent=2, sort_keys=True))
+        print(f"stored baselines in {args.baselines}")  # allow-print
+    if found:
+        print("regressions:", *found, sep="\n  ")  # allow-print
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Fixtures shared by the tests."""
+
+import pytest
+
+from yaml_source_map import calculate, errors
+
+
+@pytest.fixture(name="sources")
+def fixture_sources(tmp_path):
+    """Create YAML documents, paths to them and sources that cannot be calculated."""
+    path = tmp_path / "document.yaml"
+    path.write_bytes("key:\r\n  - é\r\n".encode())
+    return [
+        "key: value",
+        path,
+        "key: [",
+        "key: \x07",
+        tmp_path / "missing.yaml",
+        1,
+        "- 1\n- 2",
+    ]
+
+
+def _check_results(results, sources, compact=False):
+    """Check the result of each source against calculating it directly."""
+    assert sorted(result.index for result in results) == list(range(len(sources)))
+    for result in results:
+        source = sources[result.index]
+        if isinstance(source, int):
+            expected_error = errors.InvalidInputError
+        elif not isinstance(source, str) and not source.exists():
+            expected_error = OSError
+        else:
+            text = source if isinstance(source, str) else source.read_bytes().decode()
+            try:
+                expected_source_map = calculate(text)
+            except errors.BaseError as error:
+                expected_error = type(error)
+            else:
+                assert result.error is None
+                assert dict(result.source_map) == expected_source_map
+                assert isinstance(result.source_map, dict) != compact
+                continue
+        assert result.source_map is None
+        assert isinstance(result.error, expected_error)
+
+
+@pytest.fixture(name="check_results")
+def fixture_check_results():
+    """Check the result of each source of calculate_many or acalculate_many."""
+    return _check_results
@@ -0,0 +1,212 @@
+"""Tests for anchors and aliases."""
+
+import pytest
+import yaml
+
+from yaml_source_map import calculate, errors, resolve_alias
+from yaml_source_map.handle import documents, value, walk
+from yaml_source_map.selection import Selection
+from yaml_source_map.types import Entry, Location
+
+SOURCE = """\
+a: &x
+  b: [1, {c: 2}]
+d: *x
+e: [*x, &y {f: *x}]
+g: *y
+h: &r [*r]
+"""
+
+RESOLVE_ALIAS_TESTS = [
+    pytest.param("", "", id="document"),
+    pytest.param("/a/b/1/c", "/a/b/1/c", id="no alias"),
+    pytest.param("/d", "/a", id="alias"),
+    pytest.param("/d/b/1/c", "/a/b/1/c", id="through alias"),
+    pytest.param("/e/1/f/b/0", "/a/b/0", id="through alias in anchored value"),
+    pytest.param("/g/f/b", "/a/b", id="through aliases"),
+    pytest.param("/h/0/0/0", "/h", id="recursive"),
+]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("pointer, expected_pointer", RESOLVE_ALIAS_TESTS)
+def test_resolve_alias(pointer, expected_pointer, compact):
+    """
+    GIVEN source map with aliases and JSON pointer
+    WHEN resolve_alias is called with the source map and JSON pointer
+    THEN the JSON pointer of the value in the source map is returned.
+    """
+    source_map = calculate(SOURCE, compact=compact)
+
+    returned_pointer = resolve_alias(source_map, pointer)
+
+    assert returned_pointer == expected_pointer
+    assert returned_pointer in source_map
+
+
+@pytest.mark.parametrize("pointer", ["/d/x", "/x", "/d/b/2"])
+def test_resolve_alias_missing(pointer):
+    """
+    GIVEN source map with aliases and JSON pointer of no value
+    WHEN resolve_alias is called with the source map and JSON pointer
+    THEN KeyError is raised.
+    """
+    with pytest.raises(KeyError):
+        resolve_alias(calculate(SOURCE), pointer)
+
+
+@pytest.mark.parametrize("pointer", ["a", None])
+def test_resolve_alias_error(pointer):
+    """
+    GIVEN JSON pointer that does not start with /
+    WHEN resolve_alias is called with the JSON pointer
+    THEN InvalidInputError is raised.
+    """
+    with pytest.raises(errors.InvalidInputError):
+        resolve_alias(calculate(SOURCE), pointer)
+
+
+ALIAS_TESTS = [
+    pytest.param(
+        "a: &x 1\nb: *x\n",
+        {},
+        [("", 0, 14), ("/a", 3, 7), ("/b", 11, 13)],
+        {"/b": "/a"},
+        id="scalar",
+    ),
+    pytest.param(
+        "a: &x [1]\nb: [*x, *x]\n",
+        {},
+        [("", 0, 22), ("/a", 3, 9), ("/a/0", 7, 8), ("/b", 13, 21)]
+        + [("/b/0", 14, 16), ("/b/1", 18, 20)],
+        {"/b/0": "/a", "/b/1": "/a"},
+        id="sequence",
+    ),
+    pytest.param("&r [*r]", {}, [("", 0, 7), ("/0", 4, 6)], {"/0": ""}, id="recursive"),
+    pytest.param(
+        "a: &x 1\nb: &x 2\nc: *x",
+        {},
+        [("", 0, 21), ("/a", 3, 7), ("/b", 11, 15), ("/c", 19, 21)],
+        {"/c": "/b"},
+        id="redefined anchor",
+    ),
+    pytest.param(
+        "&k a: 1\nb: *k",
+        {},
+        [("", 0, 13), ("/a", 6, 7), ("/b", 11, 13)],
+        {},
+        id="anchored key",
+    ),
+    pytest.param(
+        "a: &x [1, &y 2]\nb: *y\nc: &z 3\nd: *z",
+        {"selection": Selection(["/b", "/d"])},
+        [("/b", 19, 21), ("/d", 33, 35)],
+        {},
+        id="anchors not selected",
+    ),
+    pytest.param(
+        "a: &x [1]\nb: *x\nc: [*x]",
+        {"selection": Selection(["/a/*", "/b", "/c"])},
+        [("/a/0", 7, 8), ("/b", 13, 15), ("/c", 19, 23)],
+        {},
+        id="anchored collection not selected",
+    ),
+    pytest.param(
+        "x: &x 1\na: *x\nb: [*x]",
+        {"selection": Selection(["/a/*", "/b/*"])},
+        [("/b/0", 18, 20)],
+        {},
+        id="aliases not selected",
+    ),
+    pytest.param(
+        "- &x 1\n- &y [*x]\n- *y\n- {a: 1, &k b: *x}",
+        {"max_items": 1},
+        [("", 0, 40), ("/0", 2, 6)],
+        {},
+        id="anchors of skipped items",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "source, kwargs, expected_spans, expected_aliases", ALIAS_TESTS
+)
+def test_walk_aliases(source, kwargs, expected_spans, expected_aliases):
+    """
+    GIVEN source with anchors and aliases and options
+    WHEN loader is created and walk is called with the loader, options and aliases
+    THEN each alias has its own entry and the aliases of the included anchored values
+        are linked to them.
+    """
+    loader = yaml.Loader(source)
+    loader.get_token()
+    aliases = {}
+
+    returned_marks = list(walk(loader=loader, aliases=aliases, **kwargs))
+
+    assert sorted(
+        (pointer, value_start.index, value_end.index)
+        for _, pointer, value_start, value_end, *_ in returned_marks
+    ) == sorted(expected_spans)
+    assert aliases == expected_aliases
+
+
+def test_value_aliases():
+    """
+    GIVEN source with an alias
+    WHEN loader is created and value is called with the loader
+    THEN the entry of the alias has the JSON pointer of the anchored value.
+    """
+    loader = yaml.Loader("a: &x 1\nb: *x")
+    loader.get_token()
+
+    returned_entries = dict(value(loader=loader))
+
+    assert returned_entries["/a"].anchor is None
+    assert returned_entries["/b"] == Entry(
+        value_start=Location(1, 3, 11),
+        value_end=Location(1, 5, 13),
+        key_start=Location(1, 0, 8),
+        key_end=Location(1, 1, 9),
+        anchor="/a",
+    )
+
+
+def test_documents_aliases():
+    """
+    GIVEN stream with an anchor of the same name in each document
+    WHEN loader is created and documents is called with the loader
+    THEN the aliases of each document refer to the anchor of the document.
+    """
+    loader = yaml.Loader("a: &x 1\nb: *x\n---\n- &x 2\n- *x\n---\n")
+    loader.get_token()
+
+    returned_aliases = []
+    for marks, aliases in documents(loader=loader):
+        list(marks)
+        returned_aliases.append(aliases)
+
+    assert returned_aliases == [{"/b": "/a"}, {"/1": "/0"}, {}]
+
+
+ALIAS_ERROR_TESTS = [
+    pytest.param("a: *x", {}, id="undefined"),
+    pytest.param("a: [*x]\nb: 1", {"selection": Selection(["/b"])}, id="skipped"),
+    pytest.param("a: *x\nb: 1", {"selection": Selection(["/b"])}, id="skipped value"),
+    pytest.param("- 1\n- *x", {"max_items": 1}, id="skipped item"),
+    pytest.param("a: &x 1\n? *x\n: 2", {}, id="key"),
+]
+
+
+@pytest.mark.parametrize("source, kwargs", ALIAS_ERROR_TESTS)
+def test_walk_alias_error(source, kwargs):
+    """
+    GIVEN source with an alias that is not defined or is a key and options
+    WHEN loader is created and walk is called with the loader and options
+    THEN InvalidYamlError is raised.
+    """
+    loader = yaml.Loader(source)
+    loader.get_token()
+
+    with pytest.raises(errors.InvalidYamlError):
+        list(walk(loader=loader, **kwargs))
@@ -0,0 +1,291 @@
+"""Tests for acalculate and acalculate_many."""
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+import pytest
+
+import yaml_source_map
+from yaml_source_map import (
+    SourceMap,
+    acalculate,
+    acalculate_many,
+    asynchronous,
+    calculate,
+    errors,
+)
+
+SOURCE = "a: [1, {b: 2}]\nc: 3\n"
+
+
+@pytest.fixture(name="process_executor", scope="module")
+def fixture_process_executor():
+    """Create a process executor shared by the tests."""
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+def _collect(iterator):
+    """Consume an asynchronous iterator in a new event loop."""
+
+    async def collect():
+        return [result async for result in iterator]
+
+    return asyncio.run(collect())
+
+
+class _Concurrency:  # pylint: disable=too-few-public-methods
+    """Record the largest number of calls of a function that run at the same time."""
+
+    def __init__(self, function):
+        """Construct."""
+        self._function = function
+        self._lock = threading.Lock()
+        self._running = 0
+        self.maximum = 0
+
+    def __call__(self, *args, **kwargs):
+        """Call the function and record the number of calls running meanwhile."""
+        with self._lock:
+            self._running += 1
+            self.maximum = max(self.maximum, self._running)
+        try:
+            time.sleep(0.01)
+            return self._function(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("use_process_executor", [False, True])
+def test_acalculate(process_executor, use_process_executor, compact):
+    """
+    GIVEN source, executor and compact
+    WHEN acalculate is called with the source in the executor
+    THEN the same source map as calculate is returned.
+    """
+    executor = process_executor if use_process_executor else None
+
+    returned_source_map = asyncio.run(
+        acalculate(SOURCE, compact=compact, executor=executor, include=["/a/**"])
+    )
+
+    assert isinstance(returned_source_map, SourceMap) == compact
+    assert dict(returned_source_map) == calculate(SOURCE, include=["/a/**"])
+
+
+@pytest.mark.parametrize(
+    "source, kwargs",
+    [
+        pytest.param(1, {}, id="not string"),
+        pytest.param("", {}, id="empty"),
+        pytest.param("[0", {}, id="invalid YAML"),
+        pytest.param(SOURCE, {"include": "/a"}, id="include string"),
+        pytest.param(SOURCE, {"max_depth": -1}, id="negative max depth"),
+        pytest.param(SOURCE, {"max_items": 1.0}, id="float max items"),
+    ],
+)
+def test_acalculate_error(source, kwargs):
+    """
+    GIVEN invalid source or arguments
+    WHEN acalculate is called with them
+    THEN InvalidInputError is raised.
+    """
+    with pytest.raises(errors.InvalidInputError):
+        asyncio.run(acalculate(source, **kwargs))
+
+
+def test_acalculate_semaphore(monkeypatch):
+    """
+    GIVEN semaphore of 2 and a thread executor with more threads
+    WHEN acalculate is called for many sources at once
+    THEN at most 2 source maps are calculated at the same time.
+    """
+    concurrency = _Concurrency(calculate)
+    monkeypatch.setattr(yaml_source_map, "calculate", concurrency)
+
+    async def calculate_all():
+        semaphore = asyncio.Semaphore(2)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            return await asyncio.gather(
+                *(
+                    acalculate(SOURCE, executor=executor, semaphore=semaphore)
+                    for _ in range(8)
+                )
+            )
+
+    returned_source_maps = asyncio.run(calculate_all())
+
+    assert returned_source_maps == [calculate(SOURCE)] * 8
+    assert concurrency.maximum == 2
+
+
+def test_run_cancel_waiting():
+    """
+    GIVEN semaphore that is held
+    WHEN run is cancelled while it waits for the semaphore
+    THEN the function is not called and the semaphore is not taken.
+    """
+    calls = []
+
+    async def cancel():
+        semaphore = asyncio.Semaphore(1)
+        async with semaphore:
+            task = asyncio.ensure_future(
+                asynchronous.run(
+                    lambda: calls.append(None), executor=None, semaphore=semaphore
+                )
+            )
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        return semaphore.locked()
+
+    assert not asyncio.run(cancel())
+    assert not calls
+
+
+def test_run_cancel_running():
+    """
+    GIVEN function running in an executor
+    WHEN run is cancelled
+    THEN the semaphore is released without waiting for the function.
+    """
+    event = threading.Event()
+
+    async def cancel():
+        semaphore = asyncio.Semaphore(1)
+        task = asyncio.ensure_future(
+            asynchronous.run(event.wait, executor=None, semaphore=semaphore)
+        )
+        while not semaphore.locked():
+            await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        locked = semaphore.locked()
+        event.set()
+        return locked
+
+    assert not asyncio.run(cancel())
+
+
+@pytest.mark.parametrize("use_process_executor", [False, True])
+def test_acalculate_many(
+    sources, check_results, process_executor, use_process_executor
+):
+    """
+    GIVEN sources and executor
+    WHEN acalculate_many is called with the sources in the executor
+    THEN the result of each source is returned in order.
+    """
+    executor = process_executor if use_process_executor else None
+
+    results = _collect(acalculate_many(sources, executor=executor, concurrency=2))
+
+    assert [result.index for result in results] == list(range(len(sources)))
+    check_results(results, sources)
+
+
+def test_acalculate_many_unordered(sources, check_results):
+    """
+    GIVEN sources
+    WHEN acalculate_many is called with the sources and ordered False
+    THEN the result of each source is returned.
+    """
+    results = _collect(acalculate_many(sources, ordered=False, concurrency=3))
+
+    check_results(results, sources)
+
+
+def test_acalculate_many_options():
+    """
+    GIVEN sources and options
+    WHEN acalculate_many is called with the sources and options
+    THEN the source maps are calculated with the options.
+    """
+    kwargs = {"include": ["/a/**"], "max_depth": 2, "max_items": 1}
+
+    results = _collect(acalculate_many([SOURCE], compact=True, **kwargs))
+
+    assert isinstance(results[0].source_map, SourceMap)
+    assert dict(results[0].source_map) == calculate(SOURCE, **kwargs)
+
+
+def test_acalculate_many_concurrency(monkeypatch):
+    """
+    GIVEN many sources and concurrency of 3
+    WHEN acalculate_many is called with the sources in a larger thread executor
+    THEN at most 3 sources are calculated at the same time.
+    """
+    concurrency = _Concurrency(calculate)
+    monkeypatch.setattr(yaml_source_map, "calculate", concurrency)
+
+    async def calculate_all():
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            return [
+                result
+                async for result in acalculate_many(
+                    [SOURCE] * 12, executor=executor, concurrency=3
+                )
+            ]
+
+    results = asyncio.run(calculate_all())
+
+    assert len(results) == 12
+    assert concurrency.maximum == 3
+
+
+def test_acalculate_many_close():
+    """
+    GIVEN many sources consumed lazily
+    WHEN the first result of acalculate_many is retrieved and the iterator is closed
+    THEN only the sources up to the concurrency after the first are consumed and no
+        task is left pending.
+    """
+    consumed = []
+
+    def sources():
+        for index in range(100):
+            consumed.append(index)
+            yield f"- {index}"
+
+    async def first():
+        iterator = acalculate_many(sources(), concurrency=2)
+        result = await iterator.__anext__()
+        await iterator.aclose()
+        pending = [
+            task
+            for task in asyncio.all_tasks()
+            if task is not asyncio.current_task() and not task.done()
+        ]
+        return result, pending
+
+    result, pending = asyncio.run(first())
+
+    assert result.index == 0
+    assert consumed == [0, 1, 2]
+    assert not pending
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        pytest.param({"concurrency": 0}, id="zero concurrency"),
+        pytest.param({"concurrency": True}, id="bool concurrency"),
+        pytest.param({"include": "/a"}, id="include string"),
+        pytest.param({"max_depth": -1}, id="negative max depth"),
+    ],
+)
+def test_acalculate_many_error(kwargs):
+    """
+    GIVEN invalid arguments
+    WHEN acalculate_many is called with them
+    THEN InvalidInputError is raised before the sources are consumed.
+    """
+    with pytest.raises(errors.InvalidInputError):
+        acalculate_many([SOURCE], **kwargs)
@@ -0,0 +1,106 @@
+"""Tests for calculating the source maps of many YAML documents."""
+
+import functools
+
+import pytest
+
+from yaml_source_map import batch, calculate, calculate_many, errors
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_calculate_many(sources, check_results, compact):
+    """
+    GIVEN YAML documents, paths and sources that cannot be calculated
+    WHEN calculate_many is called
+    THEN the source maps and errors are returned in the order of the sources.
+    """
+    results = list(calculate_many(sources, compact=compact, workers=2, chunk_size=2))
+
+    assert [result.index for result in results] == list(range(len(sources)))
+    check_results(results, sources, compact)
+
+
+def test_calculate_many_unordered(sources, check_results):
+    """
+    GIVEN YAML documents, paths and sources that cannot be calculated
+    WHEN calculate_many is called with ordered False
+    THEN the source maps and errors of every source are returned.
+    """
+    results = list(calculate_many(sources * 5, workers=2, chunk_size=3, ordered=False))
+
+    check_results(results, sources * 5)
+
+
+def test_calculate_many_options():
+    """
+    GIVEN YAML documents
+    WHEN calculate_many is called with options
+    THEN the options are used to calculate each source map.
+    """
+    sources = ["a: 1\nb: [1, 2]", "b: [3]"]
+    kwargs = {"engine": "python", "include": iter(["/b/*"]), "max_items": 1}
+
+    results = list(calculate_many(sources, workers=1, **kwargs))
+
+    kwargs["include"] = ["/b/*"]
+    assert [result.source_map for result in results] == [
+        calculate(source, **kwargs) for source in sources
+    ]
+
+
+def test_calculate_many_close():
+    """
+    GIVEN calculate_many for more sources than are pending at once
+    WHEN the iteration is stopped after the first result
+    THEN the sources after the pending ones are not consumed.
+    """
+    consumed = []
+
+    def sources():
+        """Record each source when it is consumed."""
+        for index in range(100):
+            consumed.append(index)
+            yield f"key: {index}"
+
+    results = calculate_many(sources(), workers=1, chunk_size=1)
+    first_result = next(results)
+    results.close()
+
+    assert first_result.source_map == calculate("key: 0")
+    assert len(consumed) < 100
+
+
+def test_calculate_chunk(sources, check_results):
+    """
+    GIVEN chunk of YAML documents, paths and sources that cannot be calculated
+    WHEN the chunk is calculated in the current process
+    THEN the serialized source map or error of each source is returned.
+    """
+    chunk_result = batch._calculate_chunk(  # pylint: disable=protected-access
+        functools.partial(calculate, compact=True), list(enumerate(sources))
+    )
+
+    results = batch._results(  # pylint: disable=protected-access
+        chunk_result, compact=False
+    )
+    check_results(list(results), sources)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        pytest.param({"workers": 0}, id="zero workers"),
+        pytest.param({"chunk_size": 0}, id="zero chunk size"),
+        pytest.param({"chunk_size": True}, id="bool chunk size"),
+        pytest.param({"include": "/key"}, id="include string"),
+        pytest.param({"max_depth": -1}, id="negative max depth"),
+    ],
+)
+def test_calculate_many_error(kwargs):
+    """
+    GIVEN invalid arguments
+    WHEN calculate_many is called
+    THEN InvalidInputError is raised before any source is calculated.
+    """
+    with pytest.raises(errors.InvalidInputError):
+        calculate_many(["key: value"], **kwargs)
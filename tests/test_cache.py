@@ -0,0 +1,540 @@
+"""Tests for the cache of source maps."""
+
+import importlib.metadata
+import os
+import pathlib
+import sys
+import threading
+import types
+
+import pytest
+
+from yaml_source_map import Cache, CacheStatistics, DiskCache, calculate, errors
+from yaml_source_map.source_map import SourceMap
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_calculate_cache(compact):
+    """
+    GIVEN cache
+    WHEN calculate is called twice with the same source and cache
+    THEN the same read-only source map is returned and it is equal to the uncached one.
+    """
+    cache = Cache()
+    source = "key:\n  - 1\n  - 2"
+
+    first_source_map = calculate(source, compact=compact, cache=cache)
+    second_source_map = calculate(source, compact=compact, cache=cache)
+
+    assert second_source_map is first_source_map
+    assert dict(first_source_map) == dict(calculate(source))
+    assert isinstance(
+        first_source_map, SourceMap if compact else types.MappingProxyType
+    )
+    assert cache.statistics == CacheStatistics(
+        hits=1, misses=1, evictions=0, entries=1, size=cache.statistics.size
+    )
+
+
+def test_calculate_cache_read_only():
+    """
+    GIVEN source map returned by calculate with a cache
+    WHEN an entry is assigned
+    THEN TypeError is raised.
+    """
+    source_map = calculate("key: value", cache=Cache())
+
+    with pytest.raises(TypeError):
+        source_map["/other"] = source_map["/key"]  # type: ignore
+
+
+def _change_positions(source_map):
+    """Assign the first position."""
+    source_map.positions[0] = 5
+
+
+def _change_pointers(source_map):
+    """Assign the first JSON pointer."""
+    source_map.pointers[0] = "/other"
+
+
+def _change_indexes(source_map):
+    """Assign the index of a JSON pointer."""
+    source_map.indexes["/key"] = 0
+
+
+def _change_aliases(source_map):
+    """Assign an alias."""
+    source_map.aliases["/key"] = ""
+
+
+def _change_line_starts(source_map):
+    """Assign the start of the first line."""
+    source_map.lines.line_starts[0] = 5
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        pytest.param(_change_positions, id="positions"),
+        pytest.param(_change_pointers, id="pointers"),
+        pytest.param(_change_indexes, id="indexes"),
+        pytest.param(_change_aliases, id="aliases"),
+        pytest.param(_change_line_starts, id="line starts"),
+    ],
+)
+def test_calculate_cache_compact_read_only(change):
+    """
+    GIVEN compact source map returned by calculate with a cache
+    WHEN its pointers, positions, indexes, aliases or line starts are changed
+    THEN TypeError is raised and the next cache hit returns the same entries.
+    """
+    cache = Cache()
+    source = "key: value\nother: 1"
+    source_map = calculate(source, compact=True, cache=cache)
+
+    with pytest.raises(TypeError):
+        change(source_map)
+
+    returned_source_map = calculate(source, compact=True, cache=cache)
+    assert cache.statistics.hits == 1
+    assert returned_source_map == calculate(source, compact=True)
+    assert returned_source_map.lines.line_starts[0] == 0
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        pytest.param({"engine": "python"}, id="engine"),
+        pytest.param({"compact": True}, id="compact"),
+        pytest.param({"include": ["/key"]}, id="include"),
+        pytest.param({"max_depth": 0}, id="max depth"),
+        pytest.param({"max_items": 0}, id="max items"),
+    ],
+)
+def test_calculate_cache_options(kwargs):
+    """
+    GIVEN cache with a source map calculated with the default options
+    WHEN calculate is called with the same source and different options
+    THEN the source map is calculated with the options.
+    """
+    cache = Cache()
+    source = "key: value"
+    calculate(source, cache=cache)
+
+    returned_source_map = calculate(source, cache=cache, **kwargs)
+
+    assert dict(returned_source_map) == dict(calculate(source, **kwargs))
+    assert cache.statistics.misses == 2
+
+
+def test_calculate_cache_include_order():
+    """
+    GIVEN cache with a source map calculated with some included JSON pointers
+    WHEN calculate is called with the same JSON pointers in a different order
+    THEN the cached source map is returned.
+    """
+    cache = Cache()
+    source = "a: 1\nb: 2"
+    first_source_map = calculate(source, include=["/a", "/b"], cache=cache)
+
+    returned_source_map = calculate(source, include=iter(["/b", "/a"]), cache=cache)
+
+    assert returned_source_map is first_source_map
+
+
+def test_calculate_cache_error():
+    """
+    GIVEN cache that is not a Cache
+    WHEN calculate is called with the cache
+    THEN InvalidInputError is raised.
+    """
+    with pytest.raises(errors.InvalidInputError):
+        calculate("key: value", cache={})  # type: ignore
+
+
+def test_max_entries():
+    """
+    GIVEN cache with a maximum number of entries
+    WHEN more source maps are calculated than fit and the first one is used again
+    THEN the least recently used source map is evicted.
+    """
+    cache = Cache(max_entries=2)
+    calculate("a: 1", cache=cache)
+    calculate("b: 2", cache=cache)
+    calculate("a: 1", cache=cache)
+
+    calculate("c: 3", cache=cache)
+
+    calculate("a: 1", cache=cache)
+    calculate("b: 2", cache=cache)
+    assert len(cache) == 2
+    assert cache.statistics.hits == 2
+    assert cache.statistics.misses == 4
+    assert cache.statistics.evictions == 2
+
+
+def test_max_bytes():
+    """
+    GIVEN cache with a maximum number of bytes
+    WHEN source maps are stored that exceed the maximum together or on their own
+    THEN the least recently used source maps are evicted and those that do not fit
+        are not stored.
+    """
+    small = calculate("a: 1")
+    unlimited_cache = Cache()
+    unlimited_cache.put("small", small)
+    size = unlimited_cache.statistics.size
+    cache = Cache(max_entries=None, max_bytes=2 * size)
+
+    cache.put("first", small)
+    cache.put("second", small)
+    cache.put("third", small)
+    cache.put(
+        "large", calculate("\n".join(f"k{index}: {index}" for index in range(50)))
+    )
+
+    assert cache.get("first") is None
+    assert cache.get("second") is small
+    assert cache.get("third") is small
+    assert cache.get("large") is None
+    assert cache.statistics.size == 2 * size
+    assert cache.statistics.evictions == 1
+
+
+def test_size():
+    """
+    GIVEN source maps
+    WHEN they are stored in a cache
+    THEN the size includes the entries of a dictionary and the size of a SourceMap.
+    """
+    source_map = calculate("key: value")
+    compact_source_map = calculate("key: value", compact=True)
+    entry = source_map["/key"]
+    cache = Cache()
+
+    cache.put("dictionary", source_map)
+    cache.put("compact", compact_source_map)
+
+    assert cache.statistics.size == (
+        sys.getsizeof(source_map)
+        + sum(sys.getsizeof(pointer) for pointer in source_map)
+        + sum(sys.getsizeof(value) for value in source_map.values())
+        + 6 * sys.getsizeof(entry.value_start)
+        + sys.getsizeof(compact_source_map)
+    )
+
+
+def test_put_replace_and_clear():
+    """
+    GIVEN cache with a source map
+    WHEN a source map is stored with the same key and the cache is cleared
+    THEN the source map is replaced and then removed while the statistics are kept.
+    """
+    cache = Cache()
+    cache.put("key", calculate("a: 1"))
+    replacement = calculate("b: 2")
+
+    cache.put("key", replacement)
+
+    assert cache.get("key") is replacement
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get("key") is None
+    assert cache.statistics == CacheStatistics(
+        hits=1, misses=1, evictions=0, entries=0, size=0
+    )
+
+
+def test_threads():
+    """
+    GIVEN cache shared by threads
+    WHEN the threads calculate source maps concurrently
+    THEN every calculation is counted as a hit or a miss and the limit is kept.
+    """
+    cache = Cache(max_entries=4)
+    sources = [f"key: {index}" for index in range(8)]
+
+    def work():
+        """Calculate each source map a few times."""
+        for _ in range(10):
+            for source in sources:
+                assert dict(calculate(source, cache=cache)) == calculate(source)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    statistics = cache.statistics
+    assert statistics.hits + statistics.misses == 4 * 10 * len(sources)
+    assert statistics.entries == len(cache) <= 4
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        pytest.param({"max_entries": 0}, id="zero max entries"),
+        pytest.param({"max_bytes": -1}, id="negative max bytes"),
+        pytest.param({"max_entries": 1.5}, id="float max entries"),
+        pytest.param({"max_bytes": True}, id="bool max bytes"),
+    ],
+)
+def test_limits_error(kwargs):
+    """
+    GIVEN invalid limits
+    WHEN Cache is constructed with the limits
+    THEN InvalidInputError is raised.
+    """
+    with pytest.raises(errors.InvalidInputError):
+        Cache(**kwargs)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_disk_cache(tmp_path, compact):
+    """
+    GIVEN disk cache with a source map calculated by another instance
+    WHEN calculate is called with the same source and a new instance
+    THEN the source map is read from the directory without leaving temporary files.
+    """
+    source = "key:\n  - 1\n  - 2"
+    calculate(source, compact=compact, cache=DiskCache(tmp_path))
+    disk_cache = DiskCache(tmp_path)
+
+    returned_source_map = calculate(source, compact=compact, cache=disk_cache)
+
+    assert dict(returned_source_map) == calculate(source)
+    assert isinstance(returned_source_map, SourceMap if compact else dict)
+    assert [path.suffix for path in tmp_path.iterdir()] == [".ysm"]
+    assert disk_cache.statistics == CacheStatistics(
+        hits=1,
+        misses=0,
+        evictions=0,
+        entries=1,
+        size=next(tmp_path.iterdir()).stat().st_size,
+    )
+
+
+def test_disk_cache_shared(tmp_path):
+    """
+    GIVEN disk cache
+    WHEN calculate is called with and without compact
+    THEN both are calculated from the same cached compact source map.
+    """
+    disk_cache = DiskCache(tmp_path / "nested" / "directory")
+    source = "key: value"
+
+    calculate(source, compact=True, cache=disk_cache)
+    calculate(source, cache=disk_cache)
+
+    assert disk_cache.directory == tmp_path / "nested" / "directory"
+    assert len(disk_cache) == 1
+    assert disk_cache.statistics.hits == 1
+
+
+def test_disk_cache_version(monkeypatch):
+    """
+    GIVEN the installed version of the package changes
+    WHEN the key of the disk cache is calculated
+    THEN it changes as well.
+    """
+
+    def version(name):
+        """Raise like importlib.metadata.version for a package that is not installed."""
+        raise importlib.metadata.PackageNotFoundError(name)
+
+    monkeypatch.setattr(importlib.metadata, "version", version)
+    unknown_key = DiskCache.key("key: value", {})
+    monkeypatch.setattr(importlib.metadata, "version", lambda _: "2.0.0")
+
+    assert DiskCache.key("key: value", {}) != unknown_key
+
+
+def test_disk_cache_prune(tmp_path):
+    """
+    GIVEN disk cache with a maximum number of bytes
+    WHEN source maps are stored that exceed the maximum together or on their own
+    THEN the least recently used files are removed and those that do not fit are not
+        stored.
+    """
+    small = calculate("a: 1", compact=True)
+    unlimited_cache = DiskCache(tmp_path / "unlimited")
+    unlimited_cache.put("small", small)
+    size = unlimited_cache.statistics.size
+    disk_cache = DiskCache(tmp_path / "limited", max_bytes=2 * size)
+
+    disk_cache.put("first", small)
+    disk_cache.put("second", small)
+    os.utime(disk_cache.directory / "first.ysm", (0, 0))
+    os.utime(disk_cache.directory / "second.ysm", (1, 1))
+    assert disk_cache.get("first") is not None
+    disk_cache.put("third", small)
+    disk_cache.put(
+        "large",
+        calculate("\n".join(f"k{index}: {index}" for index in range(50)), compact=True),
+    )
+
+    assert sorted(path.name for path in disk_cache.directory.iterdir()) == [
+        "first.ysm",
+        "third.ysm",
+    ]
+    assert disk_cache.statistics.size == 2 * size
+    assert disk_cache.statistics.evictions == 1
+
+
+def test_disk_cache_concurrent_removal(tmp_path, monkeypatch):
+    """
+    GIVEN disk cache with files that another process removes while they are listed
+    WHEN the cache is pruned
+    THEN the removed files are skipped.
+    """
+    small = calculate("a: 1", compact=True)
+    disk_cache = DiskCache(tmp_path)
+    disk_cache.put("first", small)
+    disk_cache.put("second", small)
+    size = disk_cache.statistics.size
+    stat = pathlib.Path.stat
+    unlink = pathlib.Path.unlink
+
+    def removed_stat(path, *args, **kwargs):
+        """Raise for the second file as if it was removed."""
+        if path.name == "second.ysm":
+            raise FileNotFoundError(path)
+        return stat(path, *args, **kwargs)
+
+    def removed_unlink(path, *args, **kwargs):
+        """Remove the file and then raise as if another process removed it first."""
+        unlink(path, *args, **kwargs)
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(pathlib.Path, "stat", removed_stat)
+    assert len(disk_cache) == 1
+    monkeypatch.setattr(pathlib.Path, "stat", stat)
+    monkeypatch.setattr(pathlib.Path, "unlink", removed_unlink)
+    disk_cache._prune(size // 2)  # pylint: disable=protected-access
+
+    assert len(disk_cache) == 1
+    assert disk_cache.statistics.evictions == 0
+
+
+def test_disk_cache_invalid_file(tmp_path):
+    """
+    GIVEN disk cache with a file that is not a serialized source map
+    WHEN calculate is called for the source map of the file
+    THEN it is calculated again and the file is replaced.
+    """
+    disk_cache = DiskCache(tmp_path)
+    source = "key: value"
+    calculate(source, cache=disk_cache)
+    path = next(tmp_path.iterdir())
+    path.write_bytes(b"invalid")
+
+    returned_source_map = calculate(source, cache=disk_cache)
+
+    assert returned_source_map == calculate(source)
+    assert disk_cache.statistics.misses == 2
+    assert disk_cache.get(path.stem) is not None
+
+
+@pytest.mark.parametrize(
+    "corrupt",
+    [
+        pytest.param(lambda data: data[:-1], id="truncated"),
+        pytest.param(
+            lambda data: data[:100] + bytes([data[100] ^ 1]) + data[101:],
+            id="changed position",
+        ),
+        pytest.param(lambda data: data[:-1] + bytes([data[-1] ^ 1]), id="checksum"),
+        pytest.param(lambda data: data[:2], id="shorter than checksum"),
+    ],
+)
+def test_disk_cache_corrupt_file(tmp_path, corrupt):
+    """
+    GIVEN disk cache with a file that has been corrupted
+    WHEN the source map of the file is retrieved and calculated
+    THEN it is not found and is calculated again.
+    """
+    disk_cache = DiskCache(tmp_path)
+    source = "key: [1, {a: b}]\nother: &x c\nalias: *x\n"
+    calculate(source, compact=True, cache=disk_cache)
+    path = next(tmp_path.iterdir())
+    path.write_bytes(corrupt(path.read_bytes()))
+
+    assert disk_cache.get(path.stem) is None
+    returned_source_map = calculate(source, compact=True, cache=disk_cache)
+
+    assert dict(returned_source_map) == calculate(source)
+    assert disk_cache.statistics.misses == 3
+    assert disk_cache.get(path.stem) is not None
+
+
+def test_disk_cache_write_error(tmp_path, monkeypatch):
+    """
+    GIVEN disk cache and replacing the file fails
+    WHEN a source map is stored
+    THEN the error is raised and the temporary file is removed.
+    """
+    disk_cache = DiskCache(tmp_path)
+
+    def replace(source, destination):
+        """Fail to replace the file."""
+        raise OSError(f"cannot replace {destination} with {source}")
+
+    monkeypatch.setattr("yaml_source_map.cache.os.replace", replace)
+    with pytest.raises(OSError):
+        disk_cache.put("key", calculate("key: value", compact=True))
+
+    assert not list(tmp_path.iterdir())
+
+
+def test_disk_cache_clear(tmp_path):
+    """
+    GIVEN disk cache with a source map
+    WHEN the cache is cleared
+    THEN the file is removed.
+    """
+    disk_cache = DiskCache(tmp_path)
+    calculate("key: value", cache=disk_cache)
+
+    disk_cache.clear()
+
+    assert len(disk_cache) == 0
+    assert not list(tmp_path.iterdir())
+
+
+def test_disk_cache_threads(tmp_path):
+    """
+    GIVEN instances of a disk cache sharing a directory
+    WHEN they calculate and prune source maps concurrently
+    THEN every source map is correct and no temporary files are left.
+    """
+    sources = [f"key: {index}" for index in range(8)]
+
+    def work():
+        """Calculate each source map a few times."""
+        disk_cache = DiskCache(tmp_path, max_bytes=4096)
+        for _ in range(5):
+            for source in sources:
+                assert calculate(source, cache=disk_cache) == calculate(source)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(path.suffix == ".ysm" for path in tmp_path.iterdir())
+
+
+def test_disk_cache_errors(tmp_path):
+    """
+    GIVEN disk cache
+    WHEN it is constructed with an invalid limit or a dictionary is stored in it
+    THEN InvalidInputError is raised.
+    """
+    with pytest.raises(errors.InvalidInputError):
+        DiskCache(tmp_path, max_bytes=0)
+    with pytest.raises(errors.InvalidInputError):
+        DiskCache(tmp_path).put("key", calculate("key: value"))
@@ -0,0 +1,86 @@
+"""Tests for construct."""
+
+import pytest
+import yaml
+
+from yaml_source_map import construct, handle, loader
+from yaml_source_map.errors import InvalidYamlError
+
+BUILDER_TESTS = [
+    pytest.param("0", id="scalar"),
+    pytest.param("'0'", id="quoted scalar"),
+    pytest.param("[0, {key: 1}, []]", id="flow"),
+    pytest.param("key:\n  - 0\n  - key: 1\nother: |\n  text\n", id="block"),
+    pytest.param("a: 1\n<<: {b: 2}\n", id="merge key"),
+    pytest.param("a: &x [1, {b: 2}]\nb: *x\n&k c: &s 3\nd: *s\n", id="aliases"),
+]
+
+
+def _compare(returned_node, expected_node):
+    """Check that two nodes and their values are composed the same way."""
+    assert type(returned_node) is type(expected_node)
+    assert returned_node.tag == expected_node.tag
+    assert returned_node.start_mark.index == expected_node.start_mark.index
+    assert returned_node.end_mark.index == expected_node.end_mark.index
+    if isinstance(expected_node, yaml.ScalarNode):
+        assert returned_node.value == expected_node.value
+        assert returned_node.style == expected_node.style
+        return
+
+    assert returned_node.flow_style == expected_node.flow_style
+    assert len(returned_node.value) == len(expected_node.value)
+    for returned_item, expected_item in zip(returned_node.value, expected_node.value):
+        if isinstance(expected_node, yaml.MappingNode):
+            _compare(returned_item[0], expected_item[0])
+            _compare(returned_item[1], expected_item[1])
+        else:
+            _compare(returned_item, expected_item)
+
+
+@pytest.mark.parametrize("source", BUILDER_TESTS)
+def test_builder(source):
+    """
+    GIVEN source
+    WHEN the tokens of the source map are retrieved from a builder
+    THEN the same nodes as by the PyYAML composer are composed and the value is
+        constructed.
+    """
+    builder = construct.Builder(loader.PythonLoader(source))
+    builder.get_token()
+
+    list(builder.record(handle.walk(loader=builder)))
+
+    _compare(builder._root, yaml.compose(source))  # pylint: disable=protected-access
+    value, objects = builder.construct()
+    assert value == yaml.safe_load(source)
+    assert objects[""] is value
+
+
+def test_builder_shared():
+    """
+    GIVEN source with aliases
+    WHEN the value is constructed by a builder
+    THEN the anchored value is constructed once and shared by the aliases.
+    """
+    builder = construct.Builder(loader.PythonLoader("a: &x [1]\nb: [*x, *x]\n"))
+    builder.get_token()
+    list(builder.record(handle.walk(loader=builder)))
+
+    value, objects = builder.construct()
+
+    assert value["b"][0] is value["a"]
+    assert value["b"][1] is value["a"]
+    assert objects["/b/0"] is value["a"]
+
+
+def test_builder_undefined_alias():
+    """
+    GIVEN source with an alias that is not defined
+    WHEN the tokens are retrieved from a builder
+    THEN InvalidYamlError is raised.
+    """
+    builder = construct.Builder(loader.PythonLoader("a: *x"))
+
+    with pytest.raises(InvalidYamlError):
+        while True:
+            builder.get_token()
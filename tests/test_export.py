@@ -0,0 +1,107 @@
+"""Tests for exporting source maps in the shape of the json-source-map package."""
+
+import io
+import json
+
+import pytest
+
+from yaml_source_map import calculate, recalculate, to_json_source_map, write_json
+
+
+def _naive(source_map):
+    """Convert each entry of a source map to dictionaries one at a time."""
+    json_source_map = {}
+    for pointer, entry in source_map.items():
+        json_entry = {}
+        for name, location in (
+            ("value", entry.value_start),
+            ("valueEnd", entry.value_end),
+            ("key", entry.key_start),
+            ("keyEnd", entry.key_end),
+        ):
+            if location is not None:
+                json_entry[name] = {
+                    "line": location.line,
+                    "column": location.column,
+                    "pos": location.position,
+                }
+        json_source_map[pointer] = json_entry
+    return json_source_map
+
+
+EXPORT_TESTS = [
+    pytest.param("value", id="scalar"),
+    pytest.param("key: value", id="mapping"),
+    pytest.param("- 1\n- [2, {a: 3}]\n", id="nested"),
+    pytest.param('"a\\"b\\u00e9\\t": 1\r\nc:\n  d: 2', id="special characters"),
+    pytest.param("\ufeffkey: value\nother: 1", id="byte order mark"),
+    pytest.param(
+        "\n".join(f"key{index}: {index}" for index in range(3000)), id="many entries"
+    ),
+]
+
+
+@pytest.mark.parametrize("source", EXPORT_TESTS)
+@pytest.mark.parametrize("compact", [False, True])
+def test_to_json_source_map(source, compact):
+    """
+    GIVEN source map
+    WHEN to_json_source_map is called
+    THEN the dictionaries of each entry are returned in document order.
+    """
+    source_map = calculate(source, compact=compact)
+
+    returned_json_source_map = to_json_source_map(source_map)
+
+    expected_json_source_map = _naive(source_map)
+    assert returned_json_source_map == expected_json_source_map
+    assert list(returned_json_source_map) == list(expected_json_source_map)
+
+
+@pytest.mark.parametrize("source", EXPORT_TESTS)
+@pytest.mark.parametrize("compact", [False, True])
+def test_write_json(source, compact):
+    """
+    GIVEN source map
+    WHEN write_json is called
+    THEN the same JSON as json.dumps of the dictionaries is written.
+    """
+    source_map = calculate(source, compact=compact)
+    file = io.StringIO()
+
+    write_json(source_map, file)
+
+    assert file.getvalue() == json.dumps(_naive(source_map))
+
+
+def test_recalculated():
+    """
+    GIVEN compact source map that has been recalculated after an edit
+    WHEN to_json_source_map and write_json are called
+    THEN the locations after the edit are shifted.
+    """
+    source = "a:\n  b: 1\n  c: 2\nd: 3\n"
+    source_map = recalculate(
+        calculate(source, compact=True), source, start=8, end=9, text="10\n  e: 4"
+    )
+    file = io.StringIO()
+
+    write_json(source_map, file)
+
+    assert to_json_source_map(source_map) == _naive(source_map)
+    assert json.loads(file.getvalue()) == _naive(source_map)
+
+
+def test_empty():
+    """
+    GIVEN empty source map
+    WHEN to_json_source_map and write_json are called
+    THEN an empty dictionary and object are returned.
+    """
+    source_map = calculate("key: value", include=[])
+    file = io.StringIO()
+
+    write_json(source_map, file)
+
+    assert to_json_source_map(source_map) == {}
+    assert file.getvalue() == "{}"
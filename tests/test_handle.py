@@ -1,10 +1,20 @@
 """Tests for functions that handle different types of values."""
 
+import sys
+
 import pytest
 import yaml
 
 from yaml_source_map.errors import InvalidYamlError
-from yaml_source_map.handle import mapping, primitive, sequence, value
+from yaml_source_map.handle import (
+    documents,
+    mapping,
+    primitive,
+    sequence,
+    value,
+    walk,
+)
+from yaml_source_map.selection import Selection
 from yaml_source_map.types import Entry, Location
 
 VALUE_TESTS = [
@@ -44,6 +54,142 @@ def test_value(source, expected_entries):
     assert returned_entries == expected_entries
 
 
+WALK_TESTS = [
+    pytest.param("0", [(0, "")], id="primitive"),
+    pytest.param("[0, 1]", [(1, "/0"), (2, "/1"), (0, "")], id="sequence"),
+    pytest.param(
+        "{key: [0], other: 1}",
+        [(2, "/key/0"), (1, "/key"), (3, "/other"), (0, "")],
+        id="nested",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "source, expected_indexes_pointers",
+    WALK_TESTS,
+)
+def test_walk(source, expected_indexes_pointers):
+    """
+    GIVEN source and expected indexes and pointers
+    WHEN loader is created and walk is called with the loader
+    THEN the entries are returned as soon as they are known with their index.
+    """
+    loader = yaml.Loader(source)
+    loader.get_token()
+
+    returned_entries = list(walk(loader=loader))
+
+    assert [
+        (index, pointer) for index, pointer, *_ in returned_entries
+    ] == expected_indexes_pointers
+
+
+DOCUMENTS_TESTS = [
+    pytest.param("", [], id="empty stream"),
+    pytest.param("# comment\n", [], id="comment"),
+    pytest.param("0", [[(0, "", 0, 1)]], id="implicit document"),
+    pytest.param("---\n0\n", [[(0, "", 4, 5)]], id="explicit document"),
+    pytest.param(
+        "a: 1\n---\n[2]\n...\n",
+        [[(1, "/a", 3, 4), (0, "", 0, 5)], [(1, "/0", 10, 11), (0, "", 9, 12)]],
+        id="multiple documents",
+    ),
+    pytest.param(
+        "---\n---\n...\n--- 1",
+        [[(0, "", 4, 4)], [(0, "", 8, 8)], [(0, "", 16, 17)]],
+        id="empty documents",
+    ),
+    pytest.param("0\n---\n", [[(0, "", 0, 1)], [(0, "", 6, 6)]], id="empty last"),
+    pytest.param(
+        "%YAML 1.1\n---\n0\n...\n%TAG ! tag:x,2000:\n---\n%YAML 1.1\n---\n1",
+        [[(0, "", 14, 15)], [(0, "", 43, 43)], [(0, "", 57, 58)]],
+        id="directives",
+    ),
+]
+
+
+@pytest.mark.parametrize("source, expected_documents", DOCUMENTS_TESTS)
+def test_documents(source, expected_documents):
+    """
+    GIVEN stream and the expected index, pointer, start and end of each document
+    WHEN loader is created and documents is called with the loader
+    THEN the marks of each document are returned.
+    """
+    loader = yaml.Loader(source)
+    loader.get_token()
+
+    returned_documents = [
+        [
+            (index, pointer, value_start.index, value_end.index)
+            for index, pointer, value_start, value_end, *_ in marks
+        ]
+        for marks, _ in documents(loader=loader)
+    ]
+
+    assert returned_documents == expected_documents
+
+
+def test_documents_selection():
+    """
+    GIVEN stream with an empty document and a selection
+    WHEN loader is created and documents is called with the loader and selection
+    THEN only the selected values of each document are returned.
+    """
+    loader = yaml.Loader("---\n---\na: [1]\nb: 2\n")
+    loader.get_token()
+
+    returned_documents = [
+        [pointer for _, pointer, *_ in marks]
+        for marks, _ in documents(loader=loader, selection=Selection(["/a/*"]))
+    ]
+
+    assert returned_documents == [[], ["/a/0"]]
+
+
+VALUE_ERROR_TESTS = [pytest.param("", id="not value")]
+
+
+@pytest.mark.parametrize(
+    "source",
+    VALUE_ERROR_TESTS,
+)
+def test_value_error(source):
+    """
+    GIVEN source
+    WHEN loader is created and value is called with the loader
+    THEN InvalidYamlError is raised.
+    """
+    loader = yaml.Loader(source)
+    loader.get_token()
+
+    with pytest.raises(InvalidYamlError):
+        value(loader=loader)
+
+
+@pytest.mark.parametrize(
+    "start, end, key",
+    [
+        pytest.param("[", "]", "0", id="sequence"),
+        pytest.param("{key: ", "}", "key", id="mapping"),
+    ],
+)
+def test_value_deep(start, end, key):
+    """
+    GIVEN source nested deeper than the recursion limit
+    WHEN loader is created and value is called with the loader
+    THEN an entry for each nested value is returned.
+    """
+    depth = sys.getrecursionlimit() + 100
+    loader = yaml.Loader(start * depth + "0" + end * depth)
+    loader.get_token()
+
+    returned_entries = value(loader=loader)
+
+    assert len(returned_entries) == depth + 1
+    assert returned_entries[-1][0] == f"/{key}" * depth
+
+
 MAPPING_TESTS = [
     pytest.param(
         "{}",
@@ -747,3 +893,48 @@ def test_primitive_error(source):
 
     with pytest.raises(InvalidYamlError):
         primitive(loader=loader)
+
+
+def _count_calls(source):
+    """Count the function calls made while calculating the entries of the source."""
+    loader = yaml.Loader(source)
+    loader.get_token()
+    calls = 0
+
+    def profile(_frame, event, _arg):
+        nonlocal calls
+        if event in {"call", "c_call"}:
+            calls += 1
+
+    sys.setprofile(profile)
+    try:
+        value(loader=loader)
+    finally:
+        sys.setprofile(None)
+    return calls
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        pytest.param("{{key: 0, nested: {}}}", id="mapping"),
+        pytest.param("[0, {}]", id="sequence"),
+    ],
+)
+def test_value_scaling(template):
+    """
+    GIVEN nested source and nested source with double the depth
+    WHEN the function calls while calculating the entries are counted
+    THEN the calls for double the depth are about double the calls.
+    """
+    source = "0"
+    for _ in range(100):
+        source = template.format(source)
+    double_source = source
+    for _ in range(100):
+        double_source = template.format(double_source)
+
+    calls = _count_calls(source)
+    double_calls = _count_calls(double_source)
+
+    assert double_calls < 2.2 * calls
@@ -0,0 +1,217 @@
+"""Tests for recalculating the source map after an edit."""
+
+import pytest
+
+from yaml_source_map import SourceMap, calculate, errors, incremental, recalculate
+
+SOURCE = """\
+openapi: 3.0.0
+paths:
+  /pets:
+    get:
+      summary: List pets
+      tags: [pets, read]
+      parameters:
+        - name: id
+          in: query
+        - {name: limit, in: query}
+    post:
+      summary: Create
+components:
+  schemas:
+    Pet: {type: object}
+"""
+
+
+def _position(text, offset=0):
+    """Find the position of text in the source."""
+    return SOURCE.index(text) + offset
+
+
+RECALCULATE_TESTS = [
+    pytest.param((_position("List pets", 4), 0, "all "), True, id="insert in scalar"),
+    pytest.param((_position("pets, read"), 4, "dogs"), True, id="replace in flow"),
+    pytest.param((_position("limit"), 5, "offset"), True, id="replace longer"),
+    pytest.param((_position("Create"), 6, "C"), True, id="delete"),
+    pytest.param((_position("        - {name"), 0, "  # c\n"), True, id="comment line"),
+    pytest.param(
+        (_position("      tags"), 0, "      operationId: list\n"), True, id="add key"
+    ),
+    pytest.param((_position("summary: Create"), 7, "title"), True, id="rename key"),
+    pytest.param(
+        (_position("\n    post"), 0, "\n    put: {}"), False, id="dedented key"
+    ),
+    pytest.param((_position("    post"), 4, ""), False, id="dedent"),
+    pytest.param((_position("  /pets"), 2, ""), False, id="first key"),
+    pytest.param((_position("openapi", 1), 1, "P"), False, id="document"),
+    pytest.param((_position("object"), 6, "string"), True, id="in flow mapping"),
+    pytest.param((_position("components"), 0, "# "), False, id="outside"),
+    pytest.param((_position(": query\n        -", 7), 2, ""), False, id="indentation"),
+    pytest.param((_position("List pets"), 0, "'"), False, id="structure changed"),
+    pytest.param((_position(": Create"), 1, ""), False, id="mapping to scalar"),
+    pytest.param((0, 0, "# c\n"), False, id="before document"),
+]
+
+
+@pytest.mark.parametrize("engine", ["python", "auto"])
+@pytest.mark.parametrize("edit, expected_spliced", RECALCULATE_TESTS)
+def test_recalculate(edit, expected_spliced, engine, monkeypatch):
+    """
+    GIVEN source map, source and edit
+    WHEN recalculate is called with the source map, source and edit
+    THEN the source map of the edited source is returned.
+    """
+    start, length, text = edit
+    spliced = []
+    splice = incremental._splice  # pylint: disable=protected-access
+
+    def spy(*args, **kwargs):
+        """Record whether the source map was recalculated only for a value."""
+        source_map = splice(*args, **kwargs)
+        spliced.append(source_map is not None)
+        return source_map
+
+    monkeypatch.setattr(incremental, "_splice", spy)
+    source_map = calculate(SOURCE, engine=engine, compact=True)
+    end = start + length
+    new_source = SOURCE[:start] + text + SOURCE[end:]
+
+    try:
+        expected_source_map = calculate(new_source, engine=engine, compact=True)
+    except errors.BaseError:
+        with pytest.raises(errors.BaseError):
+            recalculate(source_map, SOURCE, start=start, end=end, text=text)
+        return
+    returned_source_map = recalculate(
+        source_map, SOURCE, start=start, end=end, text=text, engine=engine
+    )
+
+    assert isinstance(returned_source_map, SourceMap)
+    assert list(returned_source_map) == list(expected_source_map)
+    assert returned_source_map == expected_source_map
+    assert list(returned_source_map.lines.line_starts) == list(
+        expected_source_map.lines.line_starts
+    )
+    assert any(spliced) == expected_spliced
+
+
+def test_recalculate_many():
+    """
+    GIVEN source map and source
+    WHEN recalculate is called for many edits in turn
+    THEN the source map of the edited source is returned after each edit.
+    """
+    source = SOURCE
+    source_map = calculate(source, compact=True)
+    position = _position("List pets", 4)
+
+    for text in ("a", "l", "l", " ", "\n        more"):
+        source_map = recalculate(
+            source_map, source, start=position, end=position, text=text
+        )
+        source = source[:position] + text + source[position:]
+        position += len(text)
+
+        assert source_map == calculate(source, compact=True)
+
+
+def test_recalculate_byte_order_mark():
+    """
+    GIVEN source with a byte order mark
+    WHEN recalculate is called with an edit
+    THEN the source map of the edited source is returned.
+    """
+    source = "key:\n  nested: \ufeffvalue\n  other: 1\n"
+    source_map = calculate(source, compact=True)
+    position = source.index("value")
+    new_source = source[:position] + "new " + source[position:]
+
+    returned_source_map = recalculate(
+        source_map, source, start=position, end=position, text="new "
+    )
+
+    assert returned_source_map == calculate(new_source, compact=True)
+
+
+@pytest.mark.parametrize(
+    "source, text",
+    [
+        pytest.param("key:\n  nested: &x value\n  other: *x\n", "new ", id="aliases"),
+        pytest.param(
+            "key:\n  nested: &x value\n  other: 1\n", "*x\n  more: ", id="new alias"
+        ),
+    ],
+)
+def test_recalculate_aliases(source, text, monkeypatch):
+    """
+    GIVEN source map, source and edit of a value with an alias in the source or text
+    WHEN recalculate is called with the edit
+    THEN the source map of the whole edited source is calculated.
+    """
+    spliced = []
+    splice = incremental._splice  # pylint: disable=protected-access
+
+    def spy(*args, **kwargs):
+        """Record whether the source map was recalculated only for a value."""
+        source_map = splice(*args, **kwargs)
+        spliced.append(source_map is not None)
+        return source_map
+
+    monkeypatch.setattr(incremental, "_splice", spy)
+    source_map = calculate(source, compact=True)
+    position = source.index("1") if "1" in source else source.index("value")
+    new_source = source[:position] + text + source[position:]
+
+    returned_source_map = recalculate(
+        source_map, source, start=position, end=position, text=text
+    )
+
+    assert returned_source_map == calculate(new_source, compact=True)
+    assert returned_source_map.aliases == calculate(new_source, compact=True).aliases
+    assert not any(spliced)
+
+
+@pytest.mark.parametrize(
+    "source_map, source, start, end, text",
+    [
+        pytest.param({}, "key: 0", 0, 0, "", id="not source map"),
+        pytest.param(None, b"key: 0", 0, 0, "", id="source not string"),
+        pytest.param(None, "key: 0", 0, 0, b"", id="text not string"),
+        pytest.param(None, "key: 0", -1, 0, "", id="start negative"),
+        pytest.param(None, "key: 0", 2, 1, "", id="end before start"),
+        pytest.param(None, "key: 0", 0, 7, "", id="end after source"),
+        pytest.param(None, "key: 0", 0, 6, "", id="empty"),
+        pytest.param(None, "key: 0", 5, 5, "[", id="invalid"),
+    ],
+)
+def test_recalculate_error(source_map, source, start, end, text):
+    """
+    GIVEN invalid arguments
+    WHEN recalculate is called
+    THEN InvalidInputError is raised.
+    """
+    if source_map is None:
+        source_map = calculate("key: 0", compact=True)
+
+    with pytest.raises(errors.InvalidInputError):
+        recalculate(source_map, source, start=start, end=end, text=text)
+
+
+@pytest.mark.parametrize("engine", ["python", "auto"])
+def test_recalculate_invalid_character(engine):
+    """
+    GIVEN replacement with a control character and engine
+    WHEN recalculate is called with the engine
+    THEN InvalidYamlError is raised rather than the error of the PyYAML reader.
+    """
+    source = "key: 0"
+
+    with pytest.raises(errors.InvalidYamlError):
+        recalculate(
+            calculate(source, compact=True),
+            source,
+            start=5,
+            end=6,
+            text="\x07",
+            engine=engine,
+        )
@@ -0,0 +1,218 @@
+"""Tests for finding the values at a position."""
+
+import pytest
+
+from yaml_source_map import PositionIndex, calculate, errors
+
+LOOKUP_TESTS = [
+    pytest.param("0", [(0, ""), (1, None)], id="primitive"),
+    pytest.param(
+        "key: value",
+        [(0, "/key"), (3, "/key"), (5, "/key"), (9, "/key"), (10, None)],
+        id="mapping",
+    ),
+    pytest.param(
+        "[0, [1]]",
+        [(0, ""), (1, "/0"), (2, ""), (4, "/1"), (5, "/1/0"), (6, "/1"), (7, "")],
+        id="flow sequence",
+    ),
+    pytest.param(
+        "key:\n  nested: 0\nother: 1\n",
+        [(0, "/key"), (6, "/key"), (7, "/key/nested"), (17, "/other"), (26, None)],
+        id="nested mapping",
+    ),
+    pytest.param(
+        "- a: 1\n  b: [1, 2]\n- 3\n",
+        [(0, ""), (2, "/0/a"), (13, "/0/b/0"), (14, "/0/b"), (21, "/1"), (22, "")],
+        id="mapping in sequence",
+    ),
+    pytest.param("key: 0\n\n", [(-1, None), (7, ""), (8, None), (100, None)], id="out"),
+]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("source, expected_lookups", LOOKUP_TESTS)
+def test_lookup(source, expected_lookups, compact):
+    """
+    GIVEN source map for source and positions
+    WHEN lookup and lookup_many are called with the positions
+    THEN the expected JSON pointers are returned.
+    """
+    index = PositionIndex(calculate(source, compact=compact))
+    positions = [position for position, _ in expected_lookups]
+    expected_pointers = [pointer for _, pointer in expected_lookups]
+
+    assert [index.lookup(position) for position in positions] == expected_pointers
+    assert index.lookup_many(positions) == expected_pointers
+    assert index.lookup_many(reversed(positions)) == expected_pointers[::-1]
+
+
+def test_lookup_many_large():
+    """
+    GIVEN index of a large source map and few positions
+    WHEN lookup_many is called with the positions
+    THEN the same JSON pointers as lookup are returned.
+    """
+    source = "".join(f"key{number}: [{number}, {{a: b}}]\n" for number in range(10000))
+    index = PositionIndex(calculate(source, compact=True))
+    positions = [len(source) - 3, 5, len(source) // 2, 5, len(source)]
+
+    returned_pointers = index.lookup_many(positions)
+
+    assert returned_pointers == [index.lookup(position) for position in positions]
+    assert returned_pointers[:2] == ["/key9999/1", "/key0"]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize(
+    "source",
+    [
+        pytest.param("key: 0\nother:\n  - [1, {a: b}]\n  - c\n", id="nested"),
+        pytest.param("a:\n  b:\n    c: 1\n# comment\nd: 2   \n", id="comment"),
+        pytest.param("{a: [1, 2], b: {c: d}}", id="flow"),
+    ],
+)
+def test_lookup_innermost(source, compact):
+    """
+    GIVEN source map for source
+    WHEN lookup is called with every position
+    THEN the JSON pointer of the shortest span that contains the position is returned.
+    """
+    source_map = calculate(source, compact=compact)
+    spans = [
+        (
+            pointer,
+            (
+                entry.value_start.position
+                if entry.key_start is None
+                else entry.key_start.position
+            ),
+            entry.value_end.position,
+        )
+        for pointer, entry in source_map.items()
+    ]
+    index = PositionIndex(source_map)
+
+    for position in range(len(source) + 1):
+        containing = [span for span in spans if span[1] <= position < span[2]]
+        expected_pointer = (
+            min(containing, key=lambda span: (span[2] - span[1], -len(span[0])))[0]
+            if containing
+            else None
+        )
+
+        assert index.lookup(position) == expected_pointer
+
+
+def test_lookup_unordered():
+    """
+    GIVEN source map whose entries are not in document order
+    WHEN lookup is called
+    THEN the innermost JSON pointer is returned.
+    """
+    source_map = calculate("key:\n  nested: 0\n")
+    index = PositionIndex(dict(reversed(list(source_map.items()))))
+
+    assert index.lookup(0) == "/key"
+    assert index.lookup(7) == "/key/nested"
+
+
+@pytest.mark.parametrize(
+    "position, expected_pointers",
+    [
+        pytest.param(-1, [], id="before"),
+        pytest.param(0, ["", "/key"], id="key"),
+        pytest.param(9, ["", "/key", "/key/0"], id="nested"),
+        pytest.param(18, ["", "/key", "/key/1", "/key/1/a"], id="innermost"),
+        pytest.param(27, ["", "/other"], id="other"),
+    ],
+)
+def test_ancestors(position, expected_pointers):
+    """
+    GIVEN source map and position
+    WHEN ancestors is called with the position
+    THEN the JSON pointers of the values at the position are returned outermost first.
+    """
+    index = PositionIndex(calculate("key:\n  - 0\n  - a: 1\nother: 2"))
+
+    assert index.ancestors(position) == expected_pointers
+
+
+def test_empty():
+    """
+    GIVEN empty source map
+    WHEN lookup, ancestors and lookup_many are called
+    THEN no JSON pointers are returned.
+    """
+    index = PositionIndex({})
+
+    assert index.lookup(0) is None
+    assert index.ancestors(0) == []
+    assert index.lookup_many([0, 1]) == [None, None]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize(
+    "source",
+    [
+        pytest.param("0", id="primitive"),
+        pytest.param("key: 0\nother:\n  - [1, {a: b}]\n  - c\n", id="nested"),
+        pytest.param("a:\n  b:\n    c: 1\n# comment\nd: 2   \n", id="comment"),
+    ],
+)
+def test_overlapping(source, compact):
+    """
+    GIVEN source map for source
+    WHEN overlapping is called with every range
+    THEN the JSON pointers of the spans that overlap the range are returned in order.
+    """
+    source_map = calculate(source, compact=compact)
+    index = PositionIndex(source_map)
+    spans = sorted(
+        (
+            (
+                entry.value_start.position
+                if entry.key_start is None
+                else entry.key_start.position
+            ),
+            -entry.value_end.position,
+            len(pointer),
+            pointer,
+        )
+        for pointer, entry in source_map.items()
+    )
+
+    for start in range(len(source) + 2):
+        assert index.overlapping(start, start) == []
+        for end in range(start + 1, len(source) + 2):
+            expected_pointers = [
+                pointer
+                for span_start, negative_end, _, pointer in spans
+                if span_start < end and -negative_end > start
+            ]
+
+            assert index.overlapping(start, end) == expected_pointers
+
+
+def test_overlapping_lines():
+    """
+    GIVEN source map and a range of lines
+    WHEN overlapping is called with the span of the lines
+    THEN the JSON pointers of the values on the lines are returned.
+    """
+    source_map = calculate("a: 0\nb:\n  c: 1\n  d: 2\ne: 3\n", compact=True)
+    index = PositionIndex(source_map)
+
+    assert index.overlapping(*source_map.lines.span(2, 2)) == ["", "/b", "/b/c"]
+
+
+def test_overlapping_error():
+    """
+    GIVEN source map
+    WHEN overlapping is called with an end before the start
+    THEN InvalidInputError is raised.
+    """
+    index = PositionIndex(calculate("key: 0"))
+
+    with pytest.raises(errors.InvalidInputError):
+        index.overlapping(1, 0)
@@ -0,0 +1,173 @@
+"""Tests for converting between positions and lines and columns."""
+
+import pytest
+from yaml import reader
+
+from yaml_source_map import LineIndex, errors
+
+LINE_INDEX_TESTS = [
+    pytest.param("0", id="single line"),
+    pytest.param("key: 0\nother: 1\n", id="line feed"),
+    pytest.param("key: 0\r\nother: 1\r\n", id="carriage return line feed"),
+    pytest.param("key: 0\rother: 1", id="carriage return"),
+    pytest.param("key: 0\x85other: 1\u2028last\u2029", id="unicode line breaks"),
+    pytest.param("\n\n\r\n\n", id="empty lines"),
+    pytest.param("\ufeffkey: \ufeff0\n\ufeff", id="byte order marks"),
+]
+
+
+@pytest.mark.parametrize("source", LINE_INDEX_TESTS)
+def test_location(source):
+    """
+    GIVEN source
+    WHEN the location of each position is calculated
+    THEN the location matches the mark of the PyYAML reader.
+    """
+    lines = LineIndex.from_source(source)
+    source_reader = reader.Reader(source)
+
+    for position in range(len(source) + 1):
+        mark = source_reader.get_mark()
+        location = lines.location(position)
+
+        assert (location.line, location.column, location.position) == (
+            mark.line,
+            mark.column,
+            mark.index,
+        )
+        source_reader.forward()
+
+
+@pytest.mark.parametrize("source", LINE_INDEX_TESTS)
+def test_position(source):
+    """
+    GIVEN source
+    WHEN the position of the location of each position is calculated
+    THEN the position is returned unless it is a byte order mark.
+    """
+    lines = LineIndex.from_source(source)
+
+    for position in range(len(source) + 1):
+        if source[position : position + 1] == "\ufeff":
+            continue
+        location = lines.location(position)
+
+        assert lines.position(location.line, location.column) == position
+
+
+def test_len():
+    """
+    GIVEN source
+    WHEN the line index is calculated
+    THEN the number of lines and their start are returned.
+    """
+    lines = LineIndex.from_source("key: 0\r\nother: 1\n")
+
+    assert len(lines) == 3
+    assert list(lines.line_starts) == [0, 8, 17]
+
+
+@pytest.mark.parametrize(
+    "position", [pytest.param(-1, id="negative"), pytest.param(7, id="after end")]
+)
+def test_location_error(position):
+    """
+    GIVEN position outside of the source
+    WHEN the location is calculated
+    THEN InvalidInputError is raised.
+    """
+    lines = LineIndex.from_source("key: 0")
+
+    with pytest.raises(errors.InvalidInputError):
+        lines.location(position)
+
+
+@pytest.mark.parametrize(
+    "line, column",
+    [
+        pytest.param(-1, 0, id="negative line"),
+        pytest.param(2, 0, id="line after end"),
+        pytest.param(0, -1, id="negative column"),
+        pytest.param(0, 8, id="column after line end"),
+        pytest.param(1, 9, id="column after end"),
+    ],
+)
+def test_position_error(line, column):
+    """
+    GIVEN line and column outside of the source
+    WHEN the position is calculated
+    THEN InvalidInputError is raised.
+    """
+    lines = LineIndex.from_source("key: 0\nother: 1")
+
+    with pytest.raises(errors.InvalidInputError):
+        lines.position(line, column)
+
+
+@pytest.mark.parametrize(
+    "first_line, last_line, expected_span",
+    [
+        pytest.param(0, 0, (0, 8), id="first line"),
+        pytest.param(1, 2, (8, 21), id="many lines"),
+        pytest.param(3, 3, (21, 24), id="last line"),
+    ],
+)
+def test_span(first_line, last_line, expected_span):
+    """
+    GIVEN first and last line
+    WHEN the span is calculated
+    THEN the positions at the start and after the end of the lines are returned.
+    """
+    lines = LineIndex.from_source("key: 0\r\nother:\n  - 1\nend")
+
+    assert lines.span(first_line, last_line) == expected_span
+
+
+@pytest.mark.parametrize(
+    "first_line, last_line",
+    [
+        pytest.param(-1, 0, id="negative"),
+        pytest.param(1, 0, id="not in order"),
+        pytest.param(0, 2, id="after end"),
+    ],
+)
+def test_span_error(first_line, last_line):
+    """
+    GIVEN lines outside of the source or not in order
+    WHEN the span is calculated
+    THEN InvalidInputError is raised.
+    """
+    lines = LineIndex.from_source("key: 0\nother: 1")
+
+    with pytest.raises(errors.InvalidInputError):
+        lines.span(first_line, last_line)
+
+
+@pytest.mark.parametrize(
+    "source, start, end, text",
+    [
+        pytest.param("a\nb\nc", 2, 2, "x\ny\n", id="insert lines"),
+        pytest.param("a\nb\nc\nd", 1, 5, "", id="delete lines"),
+        pytest.param("a\r\nb", 1, 2, "", id="carriage return line feed split"),
+        pytest.param("a\rb", 2, 2, "\n", id="carriage return line feed joined"),
+        pytest.param("a\nb", 3, 3, "\r", id="end"),
+        pytest.param("a\nb", 1, 1, "﻿", id="byte order mark inserted"),
+        pytest.param("﻿a\nb", 3, 3, "\n", id="byte order mark in source"),
+    ],
+)
+def test_edit(source, start, end, text):
+    """
+    GIVEN line index of source and an edit
+    WHEN edit is called with the edited source and the edit
+    THEN the line index of the edited source is returned.
+    """
+    new_source = source[:start] + text + source[end:]
+    expected_lines = LineIndex.from_source(new_source)
+
+    returned_lines = LineIndex.from_source(source).edit(
+        new_source, start, end, len(text)
+    )
+
+    assert list(returned_lines.line_starts) == list(expected_lines.line_starts)
+    for position in range(len(new_source) + 1):
+        assert returned_lines.location(position) == expected_lines.location(position)
@@ -0,0 +1,244 @@
+"""Tests for the sources of YAML tokens."""
+
+import io
+
+import pytest
+import yaml
+from yaml import parser, reader, scanner
+
+from yaml_source_map import loader
+from yaml_source_map.errors import InvalidInputError, InvalidYamlError
+from yaml_source_map.lines import LineIndex
+
+PYTHON_LOADER_TESTS = [
+    pytest.param("0", id="primitive"),
+    pytest.param("[0, {key: 1}]", id="flow"),
+    pytest.param("key:\n  - 0\n  - key: 1\n", id="block"),
+    pytest.param("0\n...\n", id="document end"),
+    pytest.param("0\n---\n1", id="multiple documents"),
+]
+
+
+@pytest.mark.parametrize("source", PYTHON_LOADER_TESTS)
+def test_python_loader(source):
+    """
+    GIVEN source
+    WHEN tokens are retrieved from the python loader until the end of the stream
+    THEN the same tokens and marks as for the PyYAML loader are returned.
+    """
+    expected_loader = yaml.Loader(source)
+    token_loader = loader.PythonLoader(source)
+
+    while True:
+        expected_token = expected_loader.get_token()
+        assert repr(token_loader.peek_token()) == repr(expected_token)
+        returned_token = token_loader.get_token()
+
+        assert repr(returned_token) == repr(expected_token)
+        assert returned_token.start_mark.index == expected_token.start_mark.index
+        assert returned_token.end_mark.index == expected_token.end_mark.index
+        if isinstance(expected_token, yaml.StreamEndToken):
+            break
+
+
+def test_python_loader_end():
+    """
+    GIVEN python loader with all tokens consumed
+    WHEN get_token is called
+    THEN InvalidYamlError is raised.
+    """
+    token_loader = loader.PythonLoader("0")
+    while not isinstance(token_loader.get_token(), yaml.StreamEndToken):
+        pass
+
+    with pytest.raises(InvalidYamlError):
+        token_loader.get_token()
+
+
+PYTHON_LOADER_ERROR_TESTS = [
+    pytest.param("[0", 3, parser.ParserError, id="parser"),
+    pytest.param("key: value: 0", 6, scanner.ScannerError, id="scanner"),
+]
+
+
+@pytest.mark.parametrize(
+    "source, valid_token_count, expected_error", PYTHON_LOADER_ERROR_TESTS
+)
+def test_python_loader_error(source, valid_token_count, expected_error):
+    """
+    GIVEN invalid source and the number of tokens before the error
+    WHEN the valid tokens are retrieved from the python loader followed by the next token
+    THEN the error is raised.
+    """
+    token_loader = loader.PythonLoader(source)
+    for _ in range(valid_token_count):
+        token_loader.get_token()
+
+    with pytest.raises(expected_error):
+        token_loader.get_token()
+
+
+CONFORMANCE_SOURCES = [
+    pytest.param("0", id="primitive"),
+    pytest.param("0\n", id="primitive line break"),
+    pytest.param("# comment\n0  # comment", id="comments"),
+    pytest.param("key: 0", id="mapping"),
+    pytest.param("key: 0\n", id="mapping line break"),
+    pytest.param("key: 0\r\nother: 1", id="mapping carriage return"),
+    pytest.param("key: 0\u2028other: 1", id="mapping line separator"),
+    pytest.param("- 0\n-  1   ", id="sequence trailing whitespace"),
+    pytest.param("foo:\n  bar:\n    - fooBar\n    - 1", id="nested"),
+    pytest.param("- - 0\n- key: 0\n  other: 'ü€𝄞'", id="nested unicode"),
+    pytest.param("{a: 1, b: [x, y], }", id="flow"),
+    pytest.param("key: |\n  literal\n  text\nother: >-\n  folded", id="block scalar"),
+    pytest.param('key: "double\n  quoted"\n', id="multi line quoted"),
+    pytest.param("0\n...\n---\n1", id="multiple documents"),
+]
+
+
+@pytest.mark.skipif(not yaml.__with_libyaml__, reason="libyaml is not available")
+@pytest.mark.parametrize("source", CONFORMANCE_SOURCES)
+def test_libyaml_loader_conformance(source):
+    """
+    GIVEN source
+    WHEN tokens are retrieved from the libyaml and python loaders
+    THEN the same tokens with the same marks are returned.
+    """
+    python_loader = loader.PythonLoader(source)
+    libyaml_loader = loader.LibyamlLoader(source)
+
+    while True:
+        expected_token = python_loader.get_token()
+        assert type(libyaml_loader.peek_token()) == type(expected_token)
+        returned_token = libyaml_loader.get_token()
+
+        assert type(returned_token) == type(expected_token)
+        assert getattr(returned_token, "value", None) == getattr(
+            expected_token, "value", None
+        )
+        for mark in ("start_mark", "end_mark"):
+            returned_mark = getattr(returned_token, mark)
+            expected_mark = getattr(expected_token, mark)
+            assert (returned_mark.line, returned_mark.column, returned_mark.index) == (
+                expected_mark.line,
+                expected_mark.column,
+                expected_mark.index,
+            )
+        if isinstance(expected_token, yaml.StreamEndToken):
+            break
+
+
+@pytest.mark.skipif(not yaml.__with_libyaml__, reason="libyaml is not available")
+@pytest.mark.parametrize("source", CONFORMANCE_SOURCES)
+def test_libyaml_loader_stream_conformance(source):
+    """
+    GIVEN source
+    WHEN tokens are retrieved from the libyaml loader reading a stream of the source
+        with its line index and the python loader reading the source
+    THEN the same tokens with the same marks are returned.
+    """
+    python_loader = loader.PythonLoader(source)
+    libyaml_loader = loader.LibyamlLoader(
+        io.StringIO(source, newline=""), lines=LineIndex.from_source(source)
+    )
+
+    while True:
+        expected_token = python_loader.get_token()
+        returned_token = libyaml_loader.get_token()
+
+        assert type(returned_token) == type(expected_token)
+        for mark in ("start_mark", "end_mark"):
+            returned_mark = getattr(returned_token, mark)
+            expected_mark = getattr(expected_token, mark)
+            assert (returned_mark.line, returned_mark.column, returned_mark.index) == (
+                expected_mark.line,
+                expected_mark.column,
+                expected_mark.index,
+            )
+        if isinstance(expected_token, yaml.StreamEndToken):
+            break
+
+
+def test_libyaml_loader_stream_without_lines():
+    """
+    GIVEN stream of a source
+    WHEN the libyaml loader is constructed with the stream without the line index
+    THEN InvalidInputError is raised.
+    """
+    with pytest.raises(InvalidInputError):
+        loader.LibyamlLoader(io.StringIO("0"))
+
+
+@pytest.mark.skipif(not yaml.__with_libyaml__, reason="libyaml is not available")
+@pytest.mark.parametrize(
+    "source, expected_error",
+    [
+        pytest.param("[0", parser.ParserError, id="parser"),
+        pytest.param("key: value: 0", scanner.ScannerError, id="scanner"),
+        pytest.param("key: \x07", reader.ReaderError, id="reader"),
+        pytest.param("key: \ud800", reader.ReaderError, id="lone surrogate"),
+    ],
+)
+def test_libyaml_loader_error(source, expected_error):
+    """
+    GIVEN invalid source
+    WHEN the libyaml loader is created
+    THEN the error is raised.
+    """
+    with pytest.raises(expected_error):
+        loader.LibyamlLoader(source)
+
+
+CREATE_TESTS = [
+    pytest.param("python", True, loader.PythonLoader, id="python"),
+    pytest.param("python", False, loader.PythonLoader, id="python no libyaml"),
+    pytest.param("libyaml", True, loader.LibyamlLoader, id="libyaml"),
+    pytest.param("auto", True, loader.LibyamlLoader, id="auto"),
+    pytest.param("auto", False, loader.PythonLoader, id="auto no libyaml"),
+]
+
+
+@pytest.mark.skipif(not yaml.__with_libyaml__, reason="libyaml is not available")
+@pytest.mark.parametrize("engine, with_libyaml, expected_type", CREATE_TESTS)
+def test_create(monkeypatch, engine, with_libyaml, expected_type):
+    """
+    GIVEN engine and whether libyaml is available
+    WHEN create is called with the engine
+    THEN a loader of the expected type is returned.
+    """
+    monkeypatch.setattr(yaml, "__with_libyaml__", with_libyaml)
+
+    returned_loader = loader.create("0", engine=engine)
+
+    assert isinstance(returned_loader, expected_type)
+
+
+@pytest.mark.skipif(not yaml.__with_libyaml__, reason="libyaml is not available")
+def test_create_byte_order_mark():
+    """
+    GIVEN source with a byte order mark
+    WHEN create is called with the source and the libyaml engine
+    THEN the python loader is returned.
+    """
+    returned_loader = loader.create("\ufeff0", engine="libyaml")
+
+    assert isinstance(returned_loader, loader.PythonLoader)
+
+
+CREATE_ERROR_TESTS = [
+    pytest.param("libyaml", False, id="libyaml not available"),
+    pytest.param("invalid", True, id="invalid engine"),
+]
+
+
+@pytest.mark.parametrize("engine, with_libyaml", CREATE_ERROR_TESTS)
+def test_create_error(monkeypatch, engine, with_libyaml):
+    """
+    GIVEN engine and whether libyaml is available
+    WHEN create is called with the engine
+    THEN InvalidInputError is raised.
+    """
+    monkeypatch.setattr(yaml, "__with_libyaml__", with_libyaml)
+
+    with pytest.raises(InvalidInputError):
+        loader.create("0", engine=engine)
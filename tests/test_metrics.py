@@ -0,0 +1,157 @@
+"""Tests for metrics."""
+
+import time
+
+import pytest
+import yaml
+
+from yaml_source_map import (
+    Cache,
+    DiskCache,
+    Metrics,
+    calculate,
+    collect_metrics,
+    errors,
+    loader,
+    metrics,
+)
+
+COLLECT_METRICS_TESTS = [
+    pytest.param("0", 0, id="scalar"),
+    pytest.param("a: [1, {b: 2}]", 3, id="flow"),
+    pytest.param("a:\n  - b: 1\n  - c\n", 3, id="block"),
+    pytest.param("a: é", 1, id="multi byte"),
+    pytest.param("a: &x [1]\nb: *x\n", 2, id="aliases"),
+]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("source, expected_max_depth", COLLECT_METRICS_TESTS)
+def test_collect_metrics(source, expected_max_depth, compact):
+    """
+    GIVEN source
+    WHEN calculate is called within collect_metrics
+    THEN the metrics of the source map are collected.
+    """
+    start = time.perf_counter()
+    with collect_metrics() as collected:
+        source_map = calculate(source, compact=compact)
+    elapsed = time.perf_counter() - start
+
+    assert len(collected) == 1
+    returned_metrics = collected[0]
+    assert returned_metrics.tokens == len(list(yaml.scan(source)))
+    assert returned_metrics.entries == len(source_map)
+    assert returned_metrics.max_depth == expected_max_depth
+    assert returned_metrics.bytes == len(source.encode("utf-8"))
+    phases = (
+        returned_metrics.validate,
+        returned_metrics.tokenize,
+        returned_metrics.walk,
+        returned_metrics.build,
+    )
+    assert all(seconds >= 0 for seconds in phases)
+    assert sum(phases) <= elapsed
+
+
+@pytest.mark.skipif(not yaml.__with_libyaml__, reason="libyaml is not available")
+def test_collect_metrics_libyaml_validate(monkeypatch):
+    """
+    GIVEN libyaml validation that takes a while
+    WHEN calculate is called with the libyaml engine within collect_metrics
+    THEN the time of the validation is reported as validate rather than tokenize.
+    """
+    validate = loader._validate  # pylint: disable=protected-access
+
+    def slow_validate(source):
+        time.sleep(0.05)
+        validate(source)
+
+    monkeypatch.setattr(loader, "_validate", slow_validate)
+
+    with collect_metrics() as collected:
+        calculate("a: [1, {b: 2}]", engine="libyaml")
+
+    returned_metrics = collected[0]
+    assert returned_metrics.validate >= 0.05
+    assert returned_metrics.tokenize < 0.05
+
+
+def test_collect_metrics_callback():
+    """
+    GIVEN callback
+    WHEN calculate is called within collect_metrics with the callback
+    THEN the callback is called with the metrics of each source map.
+    """
+    received = []
+
+    with collect_metrics(received.append) as collected:
+        calculate("a: 1")
+        calculate("b: 2")
+
+    assert len(received) == 2
+    assert received == collected
+    assert all(isinstance(item, Metrics) for item in received)
+
+
+def test_collect_metrics_nested():
+    """
+    GIVEN collect_metrics within collect_metrics
+    WHEN calculate is called in the inner and outer context
+    THEN the outer collector receives the metrics of both and the inner of one.
+    """
+    with collect_metrics() as outer:
+        calculate("a: 1")
+        with collect_metrics() as inner:
+            calculate("b: 2")
+
+    assert len(inner) == 1
+    assert outer == [outer[0], inner[0]]
+
+
+def test_collect_metrics_disabled():
+    """
+    GIVEN no collect_metrics
+    WHEN calculate is called
+    THEN no metrics are recorded.
+    """
+    with collect_metrics() as collected:
+        pass
+
+    calculate("a: 1")
+
+    assert not collected
+    assert metrics.record("a: 1") is None
+
+
+@pytest.mark.parametrize("disk", [False, True])
+def test_collect_metrics_cache(tmp_path, disk):
+    """
+    GIVEN cache
+    WHEN calculate is called twice with the cache within collect_metrics
+    THEN only the metrics of the source map that was calculated are collected and
+        the cache hit is not reported.
+    """
+    cache = DiskCache(tmp_path) if disk else Cache()
+
+    with collect_metrics() as collected:
+        first_source_map = calculate("a: 1", cache=cache)
+        second_source_map = calculate("a: 1", cache=cache)
+
+    assert second_source_map == first_source_map
+    assert cache.statistics.hits == 1
+    assert len(collected) == 1
+    assert collected[0].entries == 2
+
+
+def test_collect_metrics_invalid():
+    """
+    GIVEN invalid source
+    WHEN calculate is called within collect_metrics
+    THEN InvalidInputError is raised and no metrics are collected.
+    """
+    with collect_metrics() as collected:
+        with pytest.raises(errors.InvalidInputError):
+            calculate("a: [1")
+
+    assert not collected
@@ -0,0 +1,36 @@
+"""Tests for selecting the values to calculate the source map for."""
+
+import pytest
+
+from yaml_source_map.selection import Selection
+
+SELECTION_TESTS = [
+    pytest.param([], "", False, False, id="empty"),
+    pytest.param(["/a/b"], "/a/b", True, True, id="pointer"),
+    pytest.param(["/a/b"], "", False, True, id="pointer root ancestor"),
+    pytest.param(["/a/b"], "/a", False, True, id="pointer ancestor"),
+    pytest.param(["/a/b"], "/a/b/c", False, False, id="pointer descendant"),
+    pytest.param(["/a/b"], "/ab", False, False, id="pointer sibling"),
+    pytest.param(["/a//b/c"], "/a//b", False, True, id="pointer key with slash"),
+    pytest.param(["/a/*"], "/a/b/c", True, True, id="glob"),
+    pytest.param(["/a/*"], "/a", False, True, id="glob ancestor"),
+    pytest.param(["/a/*"], "/b", False, False, id="glob other"),
+    pytest.param(["/a/?/c"], "/a/b/c", True, True, id="glob single character"),
+    pytest.param(["/a/[bc]"], "/a/d", False, True, id="glob character set"),
+    pytest.param(["/x", "/a/*/c"], "/a/b/c", True, True, id="many"),
+]
+
+
+@pytest.mark.parametrize(
+    "patterns, pointer, expected_match, expected_may_contain", SELECTION_TESTS
+)
+def test_selection(patterns, pointer, expected_match, expected_may_contain):
+    """
+    GIVEN JSON pointers and glob patterns and pointer
+    WHEN match and may_contain are called with the pointer
+    THEN the expected results are returned.
+    """
+    selection = Selection(patterns)
+
+    assert selection.match(pointer) == expected_match
+    assert selection.may_contain(pointer) == expected_may_contain
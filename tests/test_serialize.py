@@ -0,0 +1,261 @@
+"""Tests for converting compact source maps to and from bytes."""
+
+import io
+import pickle
+import struct
+
+import pytest
+
+from yaml_source_map import (
+    PositionIndex,
+    calculate,
+    dump,
+    dumps,
+    errors,
+    load,
+    loads,
+    recalculate,
+    serialize,
+)
+
+SERIALIZE_TESTS = [
+    pytest.param("key: value", id="mapping"),
+    pytest.param("- 1\n- [2, {a: 3}]\n", id="nested"),
+    pytest.param('"a/b\\0\\u00e9": 1\r\nc: 2\nb: {"": 3}', id="special characters"),
+    pytest.param("\ufeffkey: value", id="byte order mark"),
+    pytest.param("value", id="scalar"),
+    pytest.param("a: &x [1]\nb: *x\n\u00e9: [*x]\n", id="aliases"),
+]
+
+
+@pytest.mark.parametrize("source", SERIALIZE_TESTS)
+def test_round_trip(source):
+    """
+    GIVEN compact source map
+    WHEN dumps and then loads is called
+    THEN an equal source map with the same line index is returned.
+    """
+    source_map = calculate(source, compact=True)
+
+    returned_source_map = loads(dumps(source_map))
+
+    assert dict(returned_source_map) == dict(source_map)
+    assert list(returned_source_map) == list(source_map)
+    assert list(returned_source_map.spans()) == list(source_map.spans())
+    assert list(returned_source_map.lines.line_starts) == list(
+        source_map.lines.line_starts
+    )
+    assert returned_source_map.lines.length == len(source)
+    assert returned_source_map.aliases == source_map.aliases
+    for pointer in source_map:
+        assert pointer in returned_source_map
+        assert returned_source_map[pointer] == source_map[pointer]
+
+
+def test_pointers():
+    """
+    GIVEN compact source map that has been loaded
+    WHEN its JSON pointers and indexes are retrieved
+    THEN they are decoded like those of the original source map.
+    """
+    source_map = calculate("b: 1\na: [2, 3]", compact=True)
+
+    returned_source_map = loads(dumps(source_map))
+
+    pointers = returned_source_map.pointers
+    assert pointers[-1] == source_map.pointers[-1]
+    assert pointers[1:3] == list(source_map.pointers[1:3])
+    assert dict(returned_source_map.indexes.items()) == source_map.indexes
+    assert "/c" not in returned_source_map
+    assert "/a/0/x" not in returned_source_map
+    assert 1 not in returned_source_map.indexes
+
+
+def test_repeated_key():
+    """
+    GIVEN compact source map of a mapping with a repeated key
+    WHEN dumps and then loads is called
+    THEN the last entry of the key is included once.
+    """
+    source_map = calculate("a: 1\nb: 2\na: 3", compact=True)
+
+    returned_source_map = loads(dumps(source_map))
+
+    assert list(returned_source_map) == list(source_map)
+    assert dict(returned_source_map) == dict(source_map)
+
+
+def test_loaded_source_map_usage():
+    """
+    GIVEN compact source map that has been loaded
+    WHEN it is recalculated and indexed by position
+    THEN the results match those of the original source map.
+    """
+    source = "a:\n  b: 1\n  c: 2\nd: 3\n"
+    source_map = calculate(source, compact=True)
+    loaded_source_map = loads(dumps(source_map))
+
+    returned_source_map = recalculate(
+        loaded_source_map, source, start=8, end=9, text="10"
+    )
+
+    assert dict(returned_source_map) == dict(
+        recalculate(source_map, source, start=8, end=9, text="10")
+    )
+    assert PositionIndex(loaded_source_map).ancestors(8) == ["", "/a", "/a/b"]
+
+
+def test_round_trip_recalculated():
+    """
+    GIVEN compact source map that has been recalculated after an edit
+    WHEN dumps and then loads is called
+    THEN an equal source map is returned.
+    """
+    source = "a:\n  b: 1\n  c: 2\nd: 3\n"
+    source_map = recalculate(
+        calculate(source, compact=True), source, start=8, end=9, text="10"
+    )
+
+    returned_source_map = loads(dumps(source_map))
+
+    assert dict(returned_source_map) == dict(source_map)
+
+
+def test_dump_load_file(tmp_path):
+    """
+    GIVEN compact source map
+    WHEN dump is called with a file on disk and load with the same file
+    THEN an equal source map is returned.
+    """
+    source_map = calculate("key: [1, 2]", compact=True)
+    path = tmp_path / "source_map.ysm"
+    with path.open("wb") as file:
+        dump(source_map, file)
+
+    with path.open("rb") as file:
+        returned_source_map = load(file)
+
+    assert dict(returned_source_map) == dict(source_map)
+
+
+def test_dump_load_stream():
+    """
+    GIVEN compact source map
+    WHEN dump is called with an in-memory stream and load with the same stream
+    THEN an equal source map is returned.
+    """
+    source_map = calculate("key: [1, 2]", compact=True)
+    stream = io.BytesIO()
+    dump(source_map, stream)
+    stream.seek(0)
+
+    returned_source_map = load(stream)
+
+    assert dict(returned_source_map) == dict(source_map)
+
+
+@pytest.mark.parametrize("protocol", [3, pickle.HIGHEST_PROTOCOL])
+def test_pickle(protocol):
+    """
+    GIVEN compact source map and one that has been loaded
+    WHEN they are pickled and unpickled
+    THEN they are pickled using the binary format and equal source maps are returned.
+    """
+    source_map = calculate("key: [1, 2]", compact=True)
+    loaded_source_map = loads(dumps(source_map))
+
+    data = pickle.dumps(source_map, protocol=protocol)
+
+    assert dumps(source_map) in data
+    assert dict(pickle.loads(data)) == dict(source_map)
+    assert dict(
+        pickle.loads(pickle.dumps(loaded_source_map, protocol=protocol))
+    ) == dict(source_map)
+
+
+def _header(**kwargs):
+    """Create the bytes of an empty source map."""
+    values = {
+        "magic": b"YSMP",
+        "format_version": serialize.FORMAT_VERSION,
+        "line_count": 1,
+        "alias_count": 0,
+        "pointer_end": 0,
+        "alias_end": 0,
+    }
+    values.update(kwargs)
+    return struct.pack(
+        "<4sHxxqqqqqqqqqq",
+        values["magic"],
+        values["format_version"],
+        0,
+        0,
+        values["line_count"],
+        0,
+        0,
+        values["alias_count"],
+        0,
+        values["pointer_end"],
+        0,
+        values["alias_end"],
+    )
+
+
+def test_loads_empty():
+    """
+    GIVEN bytes of an empty source map
+    WHEN loads is called
+    THEN an empty source map is returned.
+    """
+    assert not loads(_header())
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        pytest.param(b"", id="empty"),
+        pytest.param(b"YSMP", id="short"),
+        pytest.param(_header(magic=b"JSON"), id="magic"),
+        pytest.param(_header(format_version=1), id="format version"),
+        pytest.param(_header()[:-1], id="truncated"),
+        pytest.param(_header() + b"\0", id="trailing"),
+        pytest.param(_header(line_count=3, alias_count=-1), id="negative count"),
+        pytest.param(_header(pointer_end=1), id="pointer offsets"),
+        pytest.param(_header(alias_end=1), id="alias offsets"),
+        pytest.param(
+            dumps(calculate("a: &x 1\nb: *x\n", compact=True))[:-1] + b"\xff",
+            id="alias not utf-8",
+        ),
+    ],
+)
+def test_loads_error(data):
+    """
+    GIVEN bytes that are not a serialized source map
+    WHEN loads is called
+    THEN InvalidInputError is raised.
+    """
+    with pytest.raises(errors.InvalidInputError):
+        loads(data)
+
+
+def test_load_empty_file_error(tmp_path):
+    """
+    GIVEN empty file
+    WHEN load is called
+    THEN InvalidInputError is raised.
+    """
+    path = tmp_path / "empty.ysm"
+    path.write_bytes(b"")
+
+    with path.open("rb") as file, pytest.raises(errors.InvalidInputError):
+        load(file)
+
+
+def test_dumps_error():
+    """
+    GIVEN dictionary source map
+    WHEN dumps is called
+    THEN InvalidInputError is raised.
+    """
+    with pytest.raises(errors.InvalidInputError):
+        dumps(calculate("key: value"))  # type: ignore
@@ -0,0 +1,126 @@
+"""Tests for integers that are shifted lazily."""
+
+import array
+import sys
+
+import pytest
+
+from yaml_source_map.shifted import ShiftedArray
+
+
+def _reference(values, splice):
+    """Replace and shift a list of integers eagerly by the arguments of splice."""
+    start, stop, new_values, delta, changes = splice
+    values = list(values)
+    for index, value in changes.items():
+        values[index] = value
+    return (
+        values[:start]
+        + list(new_values)
+        + [value + delta if value >= 0 else value for value in values[stop:]]
+    )
+
+
+SPLICE_TESTS = [
+    pytest.param(0, 0, [], 0, {}, id="empty"),
+    pytest.param(2, 4, [20, 21], 3, {}, id="same length"),
+    pytest.param(2, 4, [20, 21, 22], 5, {1: 9}, id="longer with change"),
+    pytest.param(2, 6, [], -4, {0: 1}, id="shorter"),
+    pytest.param(0, 8, [1], 0, {}, id="all"),
+    pytest.param(8, 8, [100], 7, {}, id="end"),
+]
+
+
+@pytest.mark.parametrize("start, stop, new_values, delta, changes", SPLICE_TESTS)
+def test_splice(start, stop, new_values, delta, changes):
+    """
+    GIVEN shifted integers that have been spliced before
+    WHEN splice is called
+    THEN the integers are replaced and shifted and the original is not changed.
+    """
+    values = [0, 2, -1, 4, 6, -1, 8, 10]
+    shifted = ShiftedArray(array.array("q", values)).splice(3, 4, [5, 6], 2)
+    expected_before = _reference(values, (3, 4, [5, 6], 2, {}))
+
+    returned = shifted.splice(start, stop, new_values, delta, changes)
+
+    assert list(returned) == _reference(
+        expected_before, (start, stop, new_values, delta, changes)
+    )
+    assert len(returned) == len(expected_before) + len(new_values) - (stop - start)
+    assert list(shifted) == expected_before
+
+
+def test_splice_many():
+    """
+    GIVEN shifted integers
+    WHEN splice is called more often than the number of ranges that are kept
+    THEN the integers match replacing and shifting them eagerly.
+    """
+    values = list(range(0, 400, 2))
+    shifted = ShiftedArray.from_sequence(array.array("q", values))
+
+    for step in range(150):
+        start = (step * 37) % len(values)
+        stop = min(len(values), start + step % 3)
+        new_values = [values[start - 1] + 1] if start else [0]
+        delta = new_values[-1] + 1 - values[stop] if stop < len(values) else 0
+        values = _reference(values, (start, stop, new_values, delta, {}))
+        shifted = shifted.splice(start, stop, new_values, delta)
+
+        assert list(shifted) == values
+
+
+def test_splice_negative():
+    """
+    GIVEN shifted integers with a positive offset
+    WHEN splice is called with items smaller than the offset
+    THEN the offsets are added to the items so that the items are not negative.
+    """
+    shifted = ShiftedArray(array.array("q", [0, 1, 2, 3])).splice(0, 1, [10], 10)
+
+    returned = shifted.splice(2, 3, [1], -10, {1: 0})
+
+    assert list(returned) == [10, 0, 1, 3]
+
+
+@pytest.mark.parametrize(
+    "index, expected_value",
+    [
+        pytest.param(1, 12, id="positive"),
+        pytest.param(-1, -1, id="negative index and missing"),
+        pytest.param(slice(0, 2), [0, 12], id="slice"),
+    ],
+)
+def test_getitem(index, expected_value):
+    """
+    GIVEN shifted integers
+    WHEN an item or range is retrieved
+    THEN the items with their offset are returned.
+    """
+    shifted = ShiftedArray(array.array("q", [0, 1, -1]), [1], [11])
+
+    assert shifted[index] == expected_value
+
+
+def test_from_sequence():
+    """
+    GIVEN shifted integers
+    WHEN from_sequence is called with them
+    THEN they are returned.
+    """
+    shifted = ShiftedArray(array.array("q", [0]))
+
+    assert ShiftedArray.from_sequence(shifted) is shifted
+    assert list(ShiftedArray.from_sequence([1, 2])) == [1, 2]
+
+
+def test_sizeof():
+    """
+    GIVEN shifted integers
+    WHEN the size is retrieved
+    THEN it includes the typed array.
+    """
+    values = array.array("q", range(1000))
+
+    assert sys.getsizeof(ShiftedArray(values)) > sys.getsizeof(values)
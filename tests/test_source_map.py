@@ -0,0 +1,134 @@
+"""Tests for the compact source map."""
+
+import array
+import sys
+import tracemalloc
+
+import pytest
+
+from yaml_source_map import LineIndex, SourceMap, calculate, errors, types
+
+SOURCE_MAP_TESTS = [
+    pytest.param("0", id="primitive"),
+    pytest.param("[0, [1]]", id="sequence"),
+    pytest.param("key: 0\nother:\n  nested: [1]\n", id="mapping"),
+    pytest.param("{key: 0, key: 1}", id="duplicate key"),
+    pytest.param("key: 0\r\nother: [1,\n  2]\rlast: 3\u2028", id="line breaks"),
+    pytest.param("\ufeffkey: [0, \ufeff1]\n\ufeffother: 2", id="byte order marks"),
+    pytest.param("key: &x [0]\nother: *x\nlast: [*x]\n", id="aliases"),
+]
+
+
+@pytest.mark.parametrize("engine", ["python", "auto"])
+@pytest.mark.parametrize("source", SOURCE_MAP_TESTS)
+def test_source_map(source, engine):
+    """
+    GIVEN source and engine
+    WHEN calculate is called with the source, engine and compact
+    THEN a source map equal to the dictionary source map is returned.
+    """
+    expected_source_map = calculate(source, engine="python")
+
+    returned_source_map = calculate(source, engine=engine, compact=True)
+
+    assert isinstance(returned_source_map, SourceMap)
+    assert returned_source_map == expected_source_map
+    assert list(returned_source_map) == list(expected_source_map)
+    assert len(returned_source_map) == len(expected_source_map)
+    for pointer, entry in expected_source_map.items():
+        assert returned_source_map[pointer] == entry
+
+
+def test_source_map_missing():
+    """
+    GIVEN source map
+    WHEN a pointer that is not in the source map is retrieved
+    THEN KeyError is raised.
+    """
+    source_map = calculate("key: 0", compact=True)
+
+    with pytest.raises(KeyError):
+        source_map["/other"]  # pylint: disable=pointless-statement
+
+
+def test_source_map_init():
+    """
+    GIVEN pointers, positions and line index
+    WHEN the source map is constructed
+    THEN the entries are created from the positions and line index.
+    """
+    source_map = SourceMap(
+        ["", "/key"],
+        array.array("q", [0, 11, -1, -1, 9, 10, 4, 7]),
+        LineIndex.from_source("# c\n{key: 0}"),
+    )
+
+    assert dict(source_map) == {
+        "": types.Entry(
+            value_start=types.Location(0, 0, 0), value_end=types.Location(1, 7, 11)
+        ),
+        "/key": types.Entry(
+            value_start=types.Location(1, 5, 9),
+            value_end=types.Location(1, 6, 10),
+            key_start=types.Location(1, 0, 4),
+            key_end=types.Location(1, 3, 7),
+        ),
+    }
+
+
+def test_source_map_init_error():
+    """
+    GIVEN pointers and the wrong number of locations
+    WHEN the source map is constructed
+    THEN InvalidInputError is raised.
+    """
+    with pytest.raises(errors.InvalidInputError):
+        SourceMap([""], array.array("q", [0] * 2), LineIndex.from_source("0"))
+
+
+def test_source_map_lines():
+    """
+    GIVEN source map
+    WHEN lines is retrieved
+    THEN the line index of the source is returned.
+    """
+    source_map = calculate("key: 0\nother: 1", compact=True)
+
+    assert list(source_map.lines.line_starts) == [0, 7]
+
+
+def test_source_map_repr():
+    """
+    GIVEN source map
+    WHEN repr is called on the source map
+    THEN the entries are included.
+    """
+    source_map = calculate("0", compact=True)
+
+    assert repr(source_map) == f"SourceMap({calculate('0')!r})"
+
+
+def _retained_size(source, **kwargs):
+    """Measure the memory retained by the source map of the source."""
+    tracemalloc.start()
+    try:
+        source_map = calculate(source, **kwargs)
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert source_map
+    return size
+
+
+def test_source_map_sizeof():
+    """
+    GIVEN source with many values
+    WHEN the size of the compact source map is compared to the memory retained
+    THEN the size is about the retained memory and less than that of the dictionary.
+    """
+    source = "\n".join(f"key{index}: [0, 1]" for index in range(1000))
+
+    compact_size = sys.getsizeof(calculate(source, compact=True))
+
+    assert compact_size == pytest.approx(_retained_size(source, compact=True), rel=0.2)
+    assert compact_size < _retained_size(source) / 2
@@ -0,0 +1,191 @@
+"""Tests for split."""
+
+import functools
+
+import pytest
+import yaml
+
+from yaml_source_map import SourceMap, calculate_all, errors, loads, split
+from yaml_source_map.lines import LineIndex
+
+DOCUMENT_STARTS_TESTS = [
+    pytest.param("a: 1", [], id="single document"),
+    pytest.param("---\na: 1", [], id="first document"),
+    pytest.param("a: 1\n---\nb: 2\n--- c\n", [5, 14], id="start markers"),
+    pytest.param("a: 1\r---\r\nb: 2\x85---", [5, 15], id="line breaks"),
+    pytest.param(
+        "a: 1\n...\n%YAML 1.1\n%TAG ! tag:x,2000:\n---\nb",
+        [9],
+        id="directives",
+    ),
+    pytest.param("%YAML 1.1\n---\na", [], id="first document directives"),
+    pytest.param(
+        "a: 1\n... # end\n%YAML 1.1\n---\nb", [15], id="directives after end marker"
+    ),
+    pytest.param(
+        "--- |\n  text\n# c\n--- &a x\n%YAML 1.1\n---\nq: 1\n",
+        [17],
+        id="directives without end marker",
+    ),
+    pytest.param("a\n....\n%b\n---\nc", [], id="not end marker"),
+    pytest.param(
+        "a: |\n  ---\n---x: 1\n- --- \nb: '---'\n", [], id="not start markers"
+    ),
+]
+
+
+@pytest.mark.parametrize("source, expected_starts", DOCUMENT_STARTS_TESTS)
+def test_document_starts(source, expected_starts):
+    """
+    GIVEN stream and the expected starts of its documents
+    WHEN document_starts is called with the stream
+    THEN the position of each document after the first is returned.
+    """
+    returned_starts = split.document_starts(source, LineIndex.from_source(source))
+
+    assert returned_starts == expected_starts
+
+
+SPLIT_TESTS = [
+    pytest.param(1, [0], id="single chunk"),
+    pytest.param(2, [0, 18], id="two chunks"),
+    pytest.param(4, [0, 9, 18, 27], id="chunk per document"),
+    pytest.param(100, [0, 9, 18, 27], id="more chunks than documents"),
+]
+
+
+@pytest.mark.parametrize("count, expected_chunk_starts", SPLIT_TESTS)
+def test_split(count, expected_chunk_starts):
+    """
+    GIVEN stream of documents of the same size and the number of chunks
+    WHEN split is called with the stream and number of chunks
+    THEN the stream is split at the documents into chunks of about the same size.
+    """
+    source = "---\na: 1\n" * 4
+
+    returned_chunk_starts = split.split(source, LineIndex.from_source(source), count)
+
+    assert returned_chunk_starts == expected_chunk_starts
+
+
+_CALCULATE = functools.partial(calculate_all, compact=True)
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        pytest.param("a: 1\n---\nb: [1, 2]\n---\nc: {d: e}\n", id="documents"),
+        pytest.param(
+            "--- |\n  text\n# c\n--- &a x\n%YAML 1.1\n---\nq: 1\n",
+            id="plain scalar continued by %",
+        ),
+    ],
+)
+def test_calculate_all(source):
+    """
+    GIVEN stream of documents
+    WHEN calculate_all is called with the stream
+    THEN the source maps share the line index of the stream and have the positions
+        in the stream.
+    """
+    lines = LineIndex.from_source(source)
+
+    returned_source_maps = split.calculate_all(
+        source, calculate=_CALCULATE, lines=lines, workers=2
+    )
+
+    assert all(source_map.lines is lines for source_map in returned_source_maps)
+    assert [dict(source_map) for source_map in returned_source_maps] == (
+        calculate_all(source)
+    )
+
+
+def test_calculate_chunk():
+    """
+    GIVEN chunk of a stream
+    WHEN _calculate_chunk is called with the chunk, as in a worker process
+    THEN the serialized source map of each document of the chunk is returned without
+        the line index.
+    """
+    chunk = "---\na: 1\n---\nb: 2\n"
+    lines = LineIndex.from_source(chunk)
+
+    returned_data = split._calculate_chunk(  # pylint: disable=protected-access
+        _CALCULATE, chunk
+    )
+
+    source_maps = [loads(data) for data in returned_data]
+    assert all(source_map.lines.length == 0 for source_map in source_maps)
+    assert [
+        dict(SourceMap(source_map.pointers, source_map.positions, lines))
+        for source_map in source_maps
+    ] == calculate_all(chunk)
+
+
+def test_calculate_chunk_invalid():
+    """
+    GIVEN chunk of a stream with an invalid document
+    WHEN _calculate_chunk is called with the chunk, as in a worker process
+    THEN the error is raised together with the PyYAML error that caused it.
+    """
+    chunk = "---\n[0\n"
+
+    with pytest.raises(split._ChunkError) as raised:  # pylint: disable=protected-access
+        split._calculate_chunk(_CALCULATE, chunk)  # pylint: disable=protected-access
+
+    error, cause = raised.value.args
+    assert isinstance(error, errors.InvalidInputError)
+    assert isinstance(cause, yaml.parser.ParserError)
+    assert error.__cause__ is cause
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        pytest.param("a: 1\n---\n[0\n", id="parser"),
+        pytest.param("a: 1\n---\nb: 'c\n", id="scanner with context"),
+        pytest.param("a: 1\n---\nb: c: d\n", id="scanner"),
+        pytest.param("a: é\n---\nb: \x07\n", id="reader"),
+        pytest.param("a: 1\n---\nb: *c\n", id="structure"),
+    ],
+)
+@pytest.mark.parametrize("engine", ["python", "auto"])
+def test_calculate_all_invalid(source, engine):
+    """
+    GIVEN stream with an invalid document after the first chunk
+    WHEN calculate_all is called with the stream
+    THEN the error of calculating the stream as a whole is raised with the marks of
+        the PyYAML error in the whole stream.
+    """
+    calculate = functools.partial(calculate_all, engine=engine, compact=True)
+    with pytest.raises(errors.BaseError) as expected:
+        calculate(source)
+
+    with pytest.raises(type(expected.value)) as returned:
+        split.calculate_all(
+            source,
+            calculate=calculate,
+            lines=LineIndex.from_source(source),
+            workers=2,
+        )
+
+    assert str(returned.value) == str(expected.value)
+    assert str(returned.value.__cause__) == str(expected.value.__cause__)
+
+
+@pytest.mark.parametrize("workers", [0, 1.5, True])
+def test_calculate_all_workers_error(workers):
+    """
+    GIVEN invalid number of workers
+    WHEN calculate_all is called with the number of workers
+    THEN InvalidInputError is raised.
+    """
+    source = "a: 1"
+
+    with pytest.raises(errors.InvalidInputError):
+        split.calculate_all(
+            source,
+            calculate=_CALCULATE,
+            lines=LineIndex.from_source(source),
+            workers=workers,
+        )
@@ -0,0 +1,201 @@
+"""Tests for stream."""
+
+import codecs
+import io
+
+import pytest
+import yaml
+
+from yaml_source_map import loader, stream
+from yaml_source_map.errors import InvalidInputError
+from yaml_source_map.lines import LineIndex
+
+
+class _UnseekableStream(io.RawIOBase):
+    """Binary stream that can only be read."""
+
+    def __init__(self, data):
+        """Construct."""
+        self._stream = io.BytesIO(data)
+
+    def readable(self):
+        """Return whether the stream can be read."""
+        return True
+
+    def readinto(self, buffer):
+        """Read into the buffer."""
+        return self._stream.readinto(buffer)
+
+
+TEXT_READER_TESTS = [
+    pytest.param(b"key: 0\n", "key: 0\n", id="utf-8"),
+    pytest.param(b"\xef\xbb\xbfkey: 0", "﻿key: 0", id="utf-8 byte order mark"),
+    pytest.param(
+        codecs.BOM_UTF16_LE + "key: é\n".encode("utf-16-le"),
+        "﻿key: é\n",
+        id="utf-16 little endian",
+    ),
+    pytest.param(
+        codecs.BOM_UTF16_BE + "key: é\n".encode("utf-16-be"),
+        "﻿key: é\n",
+        id="utf-16 big endian",
+    ),
+    pytest.param("ü€𝄞\r\n".encode(), "ü€𝄞\r\n", id="multi byte characters"),
+    pytest.param(b"a\r\nb\rc\r", "a\r\nb\rc\r", id="carriage returns"),
+    pytest.param(b"\r\r\r\n", "\r\r\r\n", id="only carriage returns"),
+    pytest.param(b"0", "0", id="single byte"),
+    pytest.param(b"", "", id="empty"),
+]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4096])
+@pytest.mark.parametrize("data, expected_text", TEXT_READER_TESTS)
+def test_text_reader(data, expected_text, size):
+    """
+    GIVEN bytes, the expected text and the size of the chunks
+    WHEN the text reader reads a stream of the bytes in chunks of the size
+    THEN the text and its line index are returned and no line break is split between
+        chunks.
+    """
+    reader = stream.TextReader(io.BytesIO(data))
+
+    chunks = list(iter(lambda: reader.read(size), ""))
+
+    assert "".join(chunks) == expected_text
+    assert not any(
+        chunk.endswith("\r") and next_chunk.startswith("\n")
+        for chunk, next_chunk in zip(chunks, chunks[1:])
+    )
+    expected_lines = LineIndex.from_source(expected_text)
+    returned_lines = reader.lines()
+    assert list(returned_lines.line_starts) == list(expected_lines.line_starts)
+    assert returned_lines.length == expected_lines.length
+    assert list(returned_lines.byte_order_marks) == list(
+        expected_lines.byte_order_marks
+    )
+
+
+TEXT_READER_ERROR_TESTS = [
+    pytest.param(io.BytesIO(b"key: \xff"), id="invalid utf-8"),
+    pytest.param(io.BytesIO(b"key: \xc3"), id="truncated utf-8"),
+    pytest.param(io.BytesIO(codecs.BOM_UTF16_LE + b"k\x00e"), id="truncated utf-16"),
+    pytest.param(io.StringIO("key: 0"), id="text stream"),
+]
+
+
+@pytest.mark.parametrize("file", TEXT_READER_ERROR_TESTS)
+def test_text_reader_error(file):
+    """
+    GIVEN stream that cannot be decoded
+    WHEN the text reader reads the stream
+    THEN InvalidInputError is raised.
+    """
+    reader = stream.TextReader(file)
+
+    with pytest.raises(InvalidInputError):
+        list(iter(reader.read, ""))
+
+
+def test_text_reader_lines_not_recorded():
+    """
+    GIVEN text reader that does not record the line index
+    WHEN lines is called
+    THEN InvalidInputError is raised.
+    """
+    reader = stream.TextReader(io.BytesIO(b"0"), record_lines=False)
+    reader.read()
+
+    with pytest.raises(InvalidInputError):
+        reader.lines()
+
+
+def _scan(token_loader):
+    """Retrieve the tokens of a loader up to the end of the stream."""
+    tokens = [token_loader.get_token()]
+    while not isinstance(tokens[-1], yaml.StreamEndToken):
+        tokens.append(token_loader.get_token())
+    return tokens
+
+
+_LIBYAML = pytest.mark.skipif(
+    not yaml.__with_libyaml__, reason="libyaml is not available"
+)
+FILE_SOURCE_TESTS = [
+    pytest.param(io.BytesIO, b"key: 0", "python", id="python"),
+    pytest.param(io.BytesIO, b"key: 0", "libyaml", id="libyaml", marks=_LIBYAML),
+    pytest.param(
+        io.BytesIO,
+        b"\xef\xbb\xbfkey: 0",
+        "libyaml",
+        id="libyaml byte order mark",
+        marks=_LIBYAML,
+    ),
+    pytest.param(
+        _UnseekableStream, b"key: 0", "libyaml", id="libyaml unseekable", marks=_LIBYAML
+    ),
+]
+
+
+@pytest.mark.parametrize("file_type, data, engine", FILE_SOURCE_TESTS)
+def test_file_source(file_type, data, engine):
+    """
+    GIVEN stream of a source and engine
+    WHEN the tokens are retrieved from the loader created by a file source
+    THEN the tokens of the source are returned and its line index is available
+        afterwards.
+    """
+    text = data.decode("utf-8")
+    source = stream.FileSource(file_type(data))
+
+    returned_tokens = _scan(source.create(engine=engine))
+
+    expected_tokens = _scan(loader.PythonLoader(text))
+    assert [type(token) for token in returned_tokens] == [
+        type(token) for token in expected_tokens
+    ]
+    assert [token.start_mark.index for token in returned_tokens] == [
+        token.start_mark.index for token in expected_tokens
+    ]
+    assert source.lines().length == len(text)
+
+
+def test_file_source_lines_not_scanned():
+    """
+    GIVEN file source that has not been scanned
+    WHEN lines is called
+    THEN InvalidInputError is raised.
+    """
+    source = stream.FileSource(io.BytesIO(b"0"))
+
+    with pytest.raises(InvalidInputError):
+        source.lines()
+
+
+def test_open_file(tmp_path):
+    """
+    GIVEN path, bytes and stream of the same source
+    WHEN open_file is called with each
+    THEN file sources reading the source are returned and only the file opened for
+        the path is closed.
+    """
+    path = tmp_path / "source.yaml"
+    path.write_bytes(b"key: 0")
+    file = io.BytesIO(b"key: 0")
+
+    for opened in (path, str(path), path.read_bytes(), file):
+        with stream.open_file(opened) as source:
+            _scan(source.create(engine="python"))
+            assert source.lines().length == len("key: 0")
+
+    assert not file.closed
+
+
+def test_open_file_error():
+    """
+    GIVEN value that is not a path, bytes or stream
+    WHEN open_file is called with the value
+    THEN InvalidInputError is raised.
+    """
+    with pytest.raises(InvalidInputError):
+        with stream.open_file(1):
+            pass
@@ -0,0 +1,140 @@
+"""Tests for the types of the source map."""
+
+import copy
+import dataclasses
+import pickle
+
+import pytest
+
+from yaml_source_map.types import Entry, Location
+
+ENTRY = Entry(
+    value_start=Location(0, 6, 6),
+    value_end=Location(0, 7, 7),
+    key_start=Location(0, 1, 1),
+    key_end=Location(0, 4, 4),
+)
+
+
+@pytest.mark.parametrize(
+    "instance",
+    [pytest.param(Location(0, 1, 1), id="location"), pytest.param(ENTRY, id="entry")],
+)
+def test_slots(instance):
+    """
+    GIVEN instance
+    WHEN the instance is inspected
+    THEN it does not have a __dict__.
+    """
+    assert not hasattr(instance, "__dict__")
+
+
+@pytest.mark.parametrize(
+    "instance, field",
+    [
+        pytest.param(Location(0, 1, 1), "line", id="location"),
+        pytest.param(ENTRY, "key_start", id="entry"),
+    ],
+)
+def test_frozen(instance, field):
+    """
+    GIVEN instance and field
+    WHEN the field is set
+    THEN FrozenInstanceError is raised.
+    """
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        setattr(instance, field, None)
+
+
+@pytest.mark.parametrize(
+    "instance",
+    [pytest.param(Location(0, 1, 1), id="location"), pytest.param(ENTRY, id="entry")],
+)
+def test_frozen_unknown_attribute(instance):
+    """
+    GIVEN instance
+    WHEN an attribute that is not a field is set or a field is deleted
+    THEN FrozenInstanceError is raised.
+    """
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        instance.unknown = None
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        del instance.line
+
+
+def test_dataclass():
+    """
+    GIVEN entry
+    WHEN the dataclasses functions are called with the entry
+    THEN the fields are converted, listed and replaced like those of a dataclass.
+    """
+    assert dataclasses.is_dataclass(ENTRY)
+    assert [field.name for field in dataclasses.fields(ENTRY)] == [
+        "value_start",
+        "value_end",
+        "key_start",
+        "key_end",
+        "anchor",
+    ]
+    assert dataclasses.asdict(ENTRY) == {
+        "value_start": {"line": 0, "column": 6, "position": 6},
+        "value_end": {"line": 0, "column": 7, "position": 7},
+        "key_start": {"line": 0, "column": 1, "position": 1},
+        "key_end": {"line": 0, "column": 4, "position": 4},
+        "anchor": None,
+    }
+
+    returned_entry = dataclasses.replace(ENTRY, key_start=None, anchor="/a")
+
+    assert returned_entry == Entry(
+        value_start=Location(0, 6, 6),
+        value_end=Location(0, 7, 7),
+        key_end=Location(0, 4, 4),
+        anchor="/a",
+    )
+    assert not hasattr(returned_entry, "__dict__")
+
+
+def test_eq():
+    """
+    GIVEN locations and an entry
+    WHEN they are compared
+    THEN instances with the same class and fields are equal.
+    """
+    assert Location(0, 1, 1) == Location(0, 1, 1)
+    assert Location(0, 1, 1) != Location(0, 1, 2)
+    assert Location(0, 1, 1) != (0, 1, 1)
+    assert ENTRY != ENTRY.value_start
+
+
+def test_repr():
+    """
+    GIVEN entry
+    WHEN repr is called with the entry
+    THEN the fields are shown the same way as by a dataclass.
+    """
+    assert repr(Entry(Location(0, 1, 1), Location(0, 2, 2))) == (
+        "Entry(value_start=Location(line=0, column=1, position=1), "
+        "value_end=Location(line=0, column=2, position=2), key_start=None, "
+        "key_end=None, anchor=None)"
+    )
+
+
+@pytest.mark.parametrize(
+    "copy_function",
+    [
+        pytest.param(lambda value: pickle.loads(pickle.dumps(value)), id="pickle"),
+        pytest.param(copy.copy, id="copy"),
+        pytest.param(copy.deepcopy, id="deepcopy"),
+    ],
+)
+def test_copy(copy_function):
+    """
+    GIVEN entry
+    WHEN the entry is copied
+    THEN an equal entry with the same hash is returned.
+    """
+    returned_entry = copy_function(ENTRY)
+
+    assert returned_entry == ENTRY
+    assert hash(returned_entry) == hash(ENTRY)
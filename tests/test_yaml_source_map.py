@@ -1,8 +1,21 @@
 """Tests for JsonSourceMap."""
 
+import codecs
+import io
+
 import pytest
+import yaml
 
-from yaml_source_map import calculate, errors, types
+from yaml_source_map import (
+    SourceMap,
+    calculate,
+    calculate_all,
+    calculate_file,
+    errors,
+    iter_entries,
+    safe_load,
+    types,
+)
 
 CALCULATE_TESTS = [
     pytest.param(
@@ -24,6 +37,16 @@ CALCULATE_TESTS = [
         },
         id="primitive with comment",
     ),
+    pytest.param(
+        """0
+...""",
+        {
+            "": types.Entry(
+                value_start=types.Location(0, 0, 0), value_end=types.Location(0, 1, 1)
+            )
+        },
+        id="primitive with document end",
+    ),
     pytest.param(
         "[0]",
         {
@@ -54,14 +77,15 @@ CALCULATE_TESTS = [
 ]
 
 
+@pytest.mark.parametrize("engine", ["python", "auto"])
 @pytest.mark.parametrize("source, expected_source_map", CALCULATE_TESTS)
-def test_calculate(source, expected_source_map):
+def test_calculate(source, expected_source_map, engine):
     """
-    GIVEN source and expected source map
-    WHEN calculate is called with the source
+    GIVEN source, expected source map and engine
+    WHEN calculate is called with the source and engine
     THEN the source map is returned.
     """
-    returned_source_map = calculate(source)
+    returned_source_map = calculate(source, engine=engine)
 
     assert returned_source_map == expected_source_map
 
@@ -70,15 +94,757 @@ CALCULATE_ERROR_TESTS = [
     pytest.param(True, id="not string"),
     pytest.param("", id="empty string"),
     pytest.param("invalid: yaml: value", id="invalid YAML"),
+    pytest.param("[0", id="invalid YAML structure"),
+    pytest.param("[0] 1", id="invalid YAML after value"),
+    pytest.param("0\n---\n1", id="multiple documents"),
 ]
 
 
+@pytest.mark.parametrize("engine", ["python", "auto"])
 @pytest.mark.parametrize("source", CALCULATE_ERROR_TESTS)
-def test_calculate_source_not_string(source):
+def test_calculate_source_not_string(source, engine):
+    """
+    GIVEN source and engine
+    WHEN calculate is called with the source and engine
+    THEN InvalidInputError is raised.
+    """
+    with pytest.raises(errors.InvalidInputError):
+        calculate(source, engine=engine)
+
+
+INVALID_CHARACTER_FUNCTIONS = [
+    pytest.param(calculate, id="calculate"),
+    pytest.param(
+        lambda source, engine: calculate(source, engine=engine, compact=True),
+        id="calculate compact",
+    ),
+    pytest.param(
+        lambda source, engine: list(iter_entries(source, engine=engine)),
+        id="iter_entries",
+    ),
+    pytest.param(calculate_all, id="calculate_all"),
+    pytest.param(safe_load, id="safe_load"),
+]
+
+
+@pytest.mark.parametrize("engine", ["python", "auto"])
+@pytest.mark.parametrize(
+    "source", ["key: \x07", "key: \ud800"], ids=["control", "surrogate"]
+)
+@pytest.mark.parametrize("function", INVALID_CHARACTER_FUNCTIONS)
+def test_calculate_invalid_character(function, source, engine):
+    """
+    GIVEN source with a character that is not allowed and engine
+    WHEN the source map is calculated with the engine
+    THEN InvalidYamlError is raised rather than the error of the PyYAML reader.
+    """
+    with pytest.raises(errors.InvalidYamlError):
+        function(source, engine=engine)
+
+
+@pytest.mark.parametrize("engine", ["python", "auto"])
+def test_calculate_file_invalid_character(engine):
+    """
+    GIVEN file with a control character and engine
+    WHEN calculate_file is called with the file and engine
+    THEN InvalidYamlError is raised rather than the error of the PyYAML reader.
+    """
+    with pytest.raises(errors.InvalidYamlError):
+        calculate_file(b"key: \x07", engine=engine)
+
+
+CALCULATE_CONFORMANCE_TESTS = [
+    pytest.param("key: 0", id="mapping"),
+    pytest.param("- 0\n-  1   ", id="sequence trailing whitespace"),
+    pytest.param("foo:\n  bar:\n    - fooBar\n    - 1", id="nested"),
+    pytest.param("- - 0\n- key: 0\n  other: 'ü€𝄞'\n", id="nested unicode"),
+    pytest.param("{a: 1, b: [x, {y: z}], }", id="flow"),
+]
+
+
+@pytest.mark.skipif(not yaml.__with_libyaml__, reason="libyaml is not available")
+@pytest.mark.parametrize("source", CALCULATE_CONFORMANCE_TESTS)
+def test_calculate_libyaml_conformance(source):
     """
     GIVEN source
-    WHEN calculate is called with the source
+    WHEN calculate is called with the libyaml and python engines
+    THEN the same source map is returned.
+    """
+    assert calculate(source, engine="libyaml") == calculate(source, engine="python")
+
+
+CALCULATE_ERROR_CONFORMANCE_TESTS = [
+    *CALCULATE_ERROR_TESTS,
+    pytest.param("key: value: 0", id="mapping value not allowed"),
+    pytest.param("'unterminated", id="unterminated quoted"),
+    pytest.param("{a: 1", id="unterminated flow mapping"),
+    pytest.param("- 0\nkey: 1", id="mapping after sequence"),
+    pytest.param("key: *anchor", id="undefined alias"),
+    pytest.param("\tkey: 0", id="tab indentation"),
+    pytest.param("- \t0", id="tab after indicator"),
+    pytest.param("key: \x07", id="control character"),
+    pytest.param("key: \ud800", id="surrogate"),
+]
+
+
+@pytest.mark.skipif(not yaml.__with_libyaml__, reason="libyaml is not available")
+@pytest.mark.parametrize("source", CALCULATE_ERROR_CONFORMANCE_TESTS)
+def test_calculate_libyaml_error_conformance(source):
+    """
+    GIVEN invalid source
+    WHEN calculate is called with the libyaml and python engines
+    THEN the same error caused by the same kind of PyYAML error is raised.
+    """
+    with pytest.raises(errors.BaseError) as expected:
+        calculate(source, engine="python")
+
+    with pytest.raises(type(expected.value)) as returned:
+        calculate(source, engine="libyaml")
+
+    assert type(returned.value.__cause__) == type(expected.value.__cause__)
+
+
+CALCULATE_TAB_TESTS = [
+    pytest.param("b:\t2", id="after mapping indicator"),
+    pytest.param("[1,\t2]", id="after flow separator"),
+    pytest.param("a: b\tc", id="within plain scalar"),
+    pytest.param("a: 1\t# comment", id="before comment"),
+]
+
+
+@pytest.mark.skipif(not yaml.__with_libyaml__, reason="libyaml is not available")
+@pytest.mark.parametrize("source", CALCULATE_TAB_TESTS)
+def test_calculate_libyaml_tab(source):
+    """
+    GIVEN source with a tab separating tokens on a line
+    WHEN calculate is called with the libyaml and python engines
+    THEN libyaml accepts the tab as the YAML specification allows while the pure
+        Python scanner raises InvalidInputError, as documented in the README.
+    """
+    assert calculate(source, engine="libyaml")
+    with pytest.raises(errors.InvalidInputError):
+        calculate(source, engine="python")
+
+
+@pytest.mark.parametrize("engine", ["python", "auto"])
+@pytest.mark.parametrize("source, expected_source_map", CALCULATE_TESTS)
+def test_iter_entries(source, expected_source_map, engine):
+    """
+    GIVEN source, expected source map and engine
+    WHEN iter_entries is called with the source and engine
+    THEN the entries of the source map are returned.
+    """
+    returned_entries = list(iter_entries(source, engine=engine))
+
+    assert dict(returned_entries) == expected_source_map
+    assert len(returned_entries) == len(expected_source_map)
+
+
+def test_iter_entries_order():
+    """
+    GIVEN source with nested values
+    WHEN iter_entries is called with the source
+    THEN the entry of each value is returned after the entries of its values.
+    """
+    returned_entries = iter_entries("[0, {key: 1}]")
+
+    assert [pointer for pointer, _ in returned_entries] == [
+        "/0",
+        "/1/key",
+        "/1",
+        "",
+    ]
+
+
+@pytest.mark.parametrize("engine", ["python", "auto"])
+@pytest.mark.parametrize("source", CALCULATE_ERROR_TESTS)
+def test_iter_entries_error(source, engine):
+    """
+    GIVEN invalid source and engine
+    WHEN iter_entries is called with the source and engine and the entries retrieved
+    THEN InvalidInputError is raised.
+    """
+    with pytest.raises(errors.InvalidInputError):
+        list(iter_entries(source, engine=engine))
+
+
+INCLUDE_SOURCE = """\
+openapi: 3.0.0
+paths:
+  /pets:
+    get: {responses: {200: {description: ok}}}
+    post:
+      tags: [pets, write]
+components:
+  schemas:
+    Pet: {type: object}
+"""
+
+INCLUDE_TESTS = [
+    pytest.param([], [], id="empty"),
+    pytest.param([""], [""], id="root"),
+    pytest.param(["/openapi"], ["/openapi"], id="scalar"),
+    pytest.param(
+        ["/paths//pets/post/tags/1", "/components"],
+        ["/paths//pets/post/tags/1", "/components"],
+        id="pointers",
+    ),
+    pytest.param(["/missing", "/paths/x"], [], id="missing"),
+    pytest.param(
+        ["/paths//pets/*/responses"],
+        ["/paths//pets/get/responses"],
+        id="glob",
+    ),
+    pytest.param(
+        ["/components/*"],
+        [
+            "/components/schemas",
+            "/components/schemas/Pet",
+            "/components/schemas/Pet/type",
+        ],
+        id="prefix",
+    ),
+    pytest.param(
+        ("/paths//pets/post/tags/?", "/openapi"),
+        ["/openapi", "/paths//pets/post/tags/0", "/paths//pets/post/tags/1"],
+        id="pointer and glob",
+    ),
+]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("engine", ["python", "auto"])
+@pytest.mark.parametrize("include, expected_pointers", INCLUDE_TESTS)
+def test_calculate_include(include, expected_pointers, engine, compact):
+    """
+    GIVEN source, JSON pointers and glob patterns, engine and compact
+    WHEN calculate is called with the source, include, engine and compact
+    THEN the entries of the selected values of the full source map are returned.
+    """
+    full_source_map = calculate(INCLUDE_SOURCE, engine=engine)
+
+    returned_source_map = calculate(
+        INCLUDE_SOURCE, engine=engine, compact=compact, include=include
+    )
+
+    assert list(returned_source_map) == expected_pointers
+    for pointer in expected_pointers:
+        assert returned_source_map[pointer] == full_source_map[pointer]
+
+
+@pytest.mark.parametrize("include, expected_pointers", INCLUDE_TESTS)
+def test_iter_entries_include(include, expected_pointers):
+    """
+    GIVEN source and JSON pointers and glob patterns
+    WHEN iter_entries is called with the source and include
+    THEN the entries of the selected values of the full source map are yielded.
+    """
+    full_source_map = calculate(INCLUDE_SOURCE)
+
+    returned_entries = dict(iter_entries(INCLUDE_SOURCE, include=include))
+
+    assert sorted(returned_entries) == sorted(expected_pointers)
+    for pointer, entry in returned_entries.items():
+        assert entry == full_source_map[pointer]
+
+
+def test_calculate_include_error():
+    """
+    GIVEN source and a string as include
+    WHEN calculate is called with the source and include
+    THEN InvalidInputError is raised.
+    """
+    with pytest.raises(errors.InvalidInputError):
+        calculate("key: 0", include="/key")
+
+
+LIMIT_SOURCE = """\
+a: [1, [2, 3], {x: y}]
+b:
+  c:
+    - 1
+    - {d: e}
+f: {g: 1, h: 2}
+"""
+
+LIMIT_TESTS = [
+    pytest.param({}, None, id="no limits"),
+    pytest.param({"max_depth": 0}, [""], id="max depth document"),
+    pytest.param({"max_depth": 1}, ["", "/a", "/b", "/f"], id="max depth 1"),
+    pytest.param(
+        {"max_depth": 2},
+        ["", "/a", "/a/0", "/a/1", "/a/2", "/b", "/b/c", "/f", "/f/g", "/f/h"],
+        id="max depth 2",
+    ),
+    pytest.param({"max_items": 0}, [""], id="max items 0"),
+    pytest.param({"max_items": 1}, ["", "/a", "/a/0"], id="max items 1"),
+    pytest.param(
+        {"max_items": 2},
+        ["", "/a", "/a/0", "/a/1", "/a/1/0", "/a/1/1", "/b", "/b/c", "/b/c/0"]
+        + ["/b/c/1", "/b/c/1/d"],
+        id="max items 2",
+    ),
+    pytest.param(
+        {"max_depth": 2, "max_items": 2},
+        ["", "/a", "/a/0", "/a/1", "/b", "/b/c"],
+        id="max depth and items",
+    ),
+    pytest.param(
+        {"max_items": 1, "include": ["/a/*"]}, ["/a/0"], id="max items and include"
+    ),
+]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("engine", ["python", "auto"])
+@pytest.mark.parametrize("kwargs, expected_pointers", LIMIT_TESTS)
+def test_calculate_limits(kwargs, expected_pointers, engine, compact):
+    """
+    GIVEN source, limits, engine and compact
+    WHEN calculate is called with the source, limits, engine and compact
+    THEN the entries of the values within the limits of the full source map are
+        returned.
+    """
+    full_source_map = calculate(LIMIT_SOURCE, engine=engine)
+    if expected_pointers is None:
+        expected_pointers = list(full_source_map)
+
+    returned_source_map = calculate(
+        LIMIT_SOURCE, engine=engine, compact=compact, **kwargs
+    )
+
+    assert list(returned_source_map) == expected_pointers
+    for pointer in expected_pointers:
+        assert returned_source_map[pointer] == full_source_map[pointer]
+
+
+@pytest.mark.parametrize("kwargs, expected_pointers", LIMIT_TESTS)
+def test_iter_entries_limits(kwargs, expected_pointers):
+    """
+    GIVEN source and limits
+    WHEN iter_entries is called with the source and limits
+    THEN the entries of the values within the limits of the full source map are
+        yielded.
+    """
+    full_source_map = calculate(LIMIT_SOURCE)
+    if expected_pointers is None:
+        expected_pointers = list(full_source_map)
+
+    returned_entries = dict(iter_entries(LIMIT_SOURCE, **kwargs))
+
+    assert sorted(returned_entries) == sorted(expected_pointers)
+    for pointer, entry in returned_entries.items():
+        assert entry == full_source_map[pointer]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        pytest.param({"max_depth": -1}, id="negative max depth"),
+        pytest.param({"max_items": -1}, id="negative max items"),
+        pytest.param({"max_depth": 1.0}, id="float max depth"),
+        pytest.param({"max_items": True}, id="bool max items"),
+    ],
+)
+@pytest.mark.parametrize("function", [calculate, iter_entries])
+def test_limits_error(kwargs, function):
+    """
+    GIVEN source and invalid limits
+    WHEN calculate or iter_entries is called with the source and limits
+    THEN InvalidInputError is raised.
+    """
+    with pytest.raises(errors.InvalidInputError):
+        function("key: 0", **kwargs)
+
+
+CALCULATE_FILE_TESTS = [
+    pytest.param("key: 0", "utf-8", id="mapping"),
+    pytest.param("- - 0\n- key: 0\n  other: 'ü€𝄞'\n", "utf-8", id="nested unicode"),
+    pytest.param("a: 0\r\nb: [1, 2]\r\n", "utf-8", id="carriage return"),
+    pytest.param("\ufeffkey:\n  - 0", "utf-8", id="utf-8 byte order mark"),
+    pytest.param("\ufeffkey: 'é'\nother: 1", "utf-16-le", id="utf-16 little endian"),
+    pytest.param("\ufeffkey: 'é'\nother: 1", "utf-16-be", id="utf-16 big endian"),
+]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("engine", ["python", "auto"])
+@pytest.mark.parametrize("source, encoding", CALCULATE_FILE_TESTS)
+def test_calculate_file(tmp_path, source, encoding, engine, compact):
+    """
+    GIVEN source encoded with an encoding, engine and compact
+    WHEN calculate_file is called with the path, the bytes and a stream of the
+        encoded source
+    THEN the same source map as calculate with the source is returned.
+    """
+    data = source.encode(encoding)
+    path = tmp_path / "source.yaml"
+    path.write_bytes(data)
+    expected_source_map = calculate(source, engine=engine)
+
+    for file in (path, str(path), data, io.BytesIO(data)):
+        returned_source_map = calculate_file(file, engine=engine, compact=compact)
+
+        assert isinstance(returned_source_map, SourceMap) == compact
+        assert dict(returned_source_map) == expected_source_map
+
+
+def test_calculate_file_stream_position():
+    """
+    GIVEN stream after a header
+    WHEN calculate_file is called with the stream
+    THEN the source map of the source after the header is returned.
+    """
+    file = io.BytesIO(b"header\nkey: 0\n")
+    file.readline()
+
+    returned_source_map = calculate_file(file)
+
+    assert returned_source_map == calculate("key: 0\n")
+
+
+def test_calculate_file_options():
+    """
+    GIVEN bytes of a source and options
+    WHEN calculate_file is called with the bytes and options
+    THEN the same source map as calculate with the options is returned.
+    """
+    kwargs = {"include": ["/a/**"], "max_depth": 2, "max_items": 1}
+
+    returned_source_map = calculate_file(LIMIT_SOURCE.encode(), **kwargs)
+
+    assert returned_source_map == calculate(LIMIT_SOURCE, **kwargs)
+
+
+CALCULATE_FILE_ERROR_TESTS = [
+    pytest.param(b"invalid: yaml: value", {}, id="invalid YAML"),
+    pytest.param(b"0\n---\n1", {}, id="multiple documents"),
+    pytest.param(b"key: \xff", {}, id="invalid utf-8"),
+    pytest.param(codecs.BOM_UTF16_LE + b"k\x00e", {}, id="truncated utf-16"),
+    pytest.param(1, {}, id="not a file"),
+    pytest.param(b"key: 0", {"include": "/key"}, id="include string"),
+    pytest.param(b"key: 0", {"max_depth": -1}, id="negative max depth"),
+    pytest.param(b"key: 0", {"engine": "invalid"}, id="invalid engine"),
+]
+
+
+@pytest.mark.parametrize("engine", ["python", "auto"])
+@pytest.mark.parametrize("file, kwargs", CALCULATE_FILE_ERROR_TESTS)
+def test_calculate_file_error(file, kwargs, engine):
+    """
+    GIVEN file and arguments
+    WHEN calculate_file is called with the file and arguments
+    THEN InvalidInputError is raised.
+    """
+    with pytest.raises(errors.InvalidInputError):
+        calculate_file(file, **{"engine": engine, **kwargs})
+
+
+@pytest.mark.parametrize("engine", ["python", "auto"])
+@pytest.mark.parametrize(
+    "file",
+    [
+        pytest.param(b"", id="bytes"),
+        pytest.param(io.BytesIO(b""), id="stream"),
+    ],
+)
+def test_calculate_file_empty(file, engine):
+    """
+    GIVEN file without any text
+    WHEN calculate_file is called with the file
+    THEN InvalidInputError is raised the same way as for calculate with an empty
+        string.
+    """
+    with pytest.raises(errors.InvalidInputError, match="source must not be empty"):
+        calculate_file(file, engine=engine)
+
+
+CALCULATE_ALL_STREAMS = [
+    pytest.param("a: 1\n---\nb: [1, 2]\n", id="implicit first document"),
+    pytest.param("---\na: 1\n---\n---\nb: {c: d}\n...\n", id="empty document"),
+    pytest.param("%YAML 1.1\n---\nx\n...\n%YAML 1.1\n---\n- y\n", id="directives"),
+    pytest.param("--- |\n  text\n--- >\n folded\n---\n", id="block scalars"),
+    pytest.param("# comment\n", id="no documents"),
+    pytest.param(
+        "".join(
+            f"---\nkind: {index}\nspec: [{index}, {{x: y}}]\n" for index in range(50)
+        ),
+        id="many documents",
+    ),
+]
+
+
+def test_calculate_all():
+    """
+    GIVEN stream of documents
+    WHEN calculate_all is called with the stream
+    THEN the source map of each document is returned with the locations in the
+        stream.
+    """
+    returned_source_maps = calculate_all("a: 1\n---\n[2]\n---\n")
+
+    assert returned_source_maps == [
+        {
+            "": types.Entry(
+                value_start=types.Location(0, 0, 0), value_end=types.Location(1, 0, 5)
+            ),
+            "/a": types.Entry(
+                value_start=types.Location(0, 3, 3),
+                value_end=types.Location(0, 4, 4),
+                key_start=types.Location(0, 0, 0),
+                key_end=types.Location(0, 1, 1),
+            ),
+        },
+        {
+            "": types.Entry(
+                value_start=types.Location(2, 0, 9), value_end=types.Location(2, 3, 12)
+            ),
+            "/0": types.Entry(
+                value_start=types.Location(2, 1, 10),
+                value_end=types.Location(2, 2, 11),
+            ),
+        },
+        {
+            "": types.Entry(
+                value_start=types.Location(4, 0, 17), value_end=types.Location(4, 0, 17)
+            ),
+        },
+    ]
+
+
+@pytest.mark.parametrize("engine", ["python", "auto"])
+@pytest.mark.parametrize("source", CALCULATE_ALL_STREAMS)
+def test_calculate_all_modes(source, engine):
+    """
+    GIVEN stream of documents and engine
+    WHEN calculate_all is called with the stream with and without compact and
+        parallel
+    THEN the same source maps are returned, as many as PyYAML loads documents.
+    """
+    expected_source_maps = calculate_all(source, engine=engine)
+
+    compact_source_maps = calculate_all(source, engine=engine, compact=True)
+    parallel_source_maps = calculate_all(
+        source, engine=engine, compact=True, parallel=True, workers=2
+    )
+    parallel_dictionaries = calculate_all(
+        source, engine=engine, parallel=True, workers=2
+    )
+
+    assert len(expected_source_maps) == len(list(yaml.safe_load_all(source)))
+    for source_maps in (compact_source_maps, parallel_source_maps):
+        assert all(isinstance(source_map, SourceMap) for source_map in source_maps)
+        assert [dict(source_map) for source_map in source_maps] == expected_source_maps
+    assert parallel_dictionaries == expected_source_maps
+
+
+def test_calculate_all_single_document():
+    """
+    GIVEN source with a single document
+    WHEN calculate_all is called with the source
+    THEN the source map of calculate is returned.
+    """
+    assert calculate_all(LIMIT_SOURCE) == [calculate(LIMIT_SOURCE)]
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_calculate_all_options(parallel):
+    """
+    GIVEN stream of documents and options
+    WHEN calculate_all is called with the stream and options
+    THEN the options are applied to each document.
+    """
+    kwargs = {"include": ["/a/**"], "max_depth": 2, "max_items": 1}
+
+    returned_source_maps = calculate_all(
+        f"{LIMIT_SOURCE}---\n{LIMIT_SOURCE}", parallel=parallel, **kwargs
+    )
+
+    assert [list(source_map) for source_map in returned_source_maps] == [
+        list(calculate(LIMIT_SOURCE, **kwargs))
+    ] * 2
+
+
+CALCULATE_ALL_ERROR_TESTS = [
+    pytest.param(True, {}, id="not string"),
+    pytest.param("", {}, id="empty string"),
+    pytest.param("a: 1\n---\ninvalid: yaml: value\n", {}, id="invalid YAML"),
+    pytest.param("a: 1\n---\n[0\n---\nb: 2", {}, id="invalid YAML structure"),
+    pytest.param("a: 1\n---\nb: 2", {"include": "/a"}, id="include string"),
+    pytest.param("a: 1\n---\nb: 2", {"max_items": -1}, id="negative max items"),
+]
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+@pytest.mark.parametrize("source, kwargs", CALCULATE_ALL_ERROR_TESTS)
+def test_calculate_all_error(source, kwargs, parallel):
+    """
+    GIVEN stream and arguments
+    WHEN calculate_all is called with the stream and arguments
+    THEN InvalidInputError is raised.
+    """
+    with pytest.raises(errors.InvalidInputError):
+        calculate_all(source, parallel=parallel, **kwargs)
+
+
+SAFE_LOAD_SOURCES = [
+    pytest.param("a", id="scalar"),
+    pytest.param("a: [1, {b: 2001-01-01}]\nc: '3'\n1: yes\nd: ~\n", id="mapping"),
+    pytest.param("- 1.5\n- - x\n  - {y: 0x1f}\n- [true, 'no']\n", id="sequence"),
+    pytest.param("a: 1\n<<: {a: 2, b: 3}\n", id="merge key"),
+    pytest.param("a: |\n  text\nb: >\n  folded\n", id="block scalars"),
+]
+
+
+@pytest.mark.parametrize("engine", ["python", "auto"])
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("source", SAFE_LOAD_SOURCES)
+def test_safe_load(source, compact, engine):
+    """
+    GIVEN source, compact and engine
+    WHEN safe_load is called with the source, compact and engine
+    THEN the value of yaml.safe_load, the source map of calculate and the object of
+        each value are returned.
+    """
+    returned_result = safe_load(source, compact=compact, engine=engine)
+
+    assert returned_result.value == yaml.safe_load(source)
+    assert isinstance(returned_result.source_map, SourceMap) == compact
+    assert dict(returned_result.source_map) == calculate(source, engine=engine)
+    assert set(returned_result.objects) == set(returned_result.source_map)
+    assert returned_result.objects[""] is returned_result.value
+
+
+def test_safe_load_objects():
+    """
+    GIVEN source with nested values
+    WHEN safe_load is called with the source
+    THEN the object of each JSON pointer is the object nested in the value.
+    """
+    returned_result = safe_load("a: [1, {b: x}]\n2: [y]\n")
+
+    value = returned_result.value
+    assert returned_result.objects == {
+        "": value,
+        "/a": value["a"],
+        "/a/0": 1,
+        "/a/1": value["a"][1],
+        "/a/1/b": "x",
+        "/2": value[2],
+        "/2/0": "y",
+    }
+    assert returned_result.objects["/a"] is value["a"]
+    assert returned_result.objects["/a/1"] is value["a"][1]
+
+
+def test_safe_load_options():
+    """
+    GIVEN source and options
+    WHEN safe_load is called with the source and options
+    THEN the full value is returned with the source map and objects of the selected
+        values.
+    """
+    kwargs = {"include": ["/a/**"], "max_depth": 2, "max_items": 1}
+
+    returned_result = safe_load(LIMIT_SOURCE, **kwargs)
+
+    assert returned_result.value == yaml.safe_load(LIMIT_SOURCE)
+    assert returned_result.source_map == calculate(LIMIT_SOURCE, **kwargs)
+    assert set(returned_result.objects) == set(returned_result.source_map)
+
+
+SAFE_LOAD_ERROR_TESTS = [
+    pytest.param(True, {}, id="not string"),
+    pytest.param("", {}, id="empty string"),
+    pytest.param("invalid: yaml: value", {}, id="invalid YAML"),
+    pytest.param("0\n---\n1", {}, id="multiple documents"),
+    pytest.param("a: =", {}, id="no constructor"),
+    pytest.param("a: 2001-02-30", {}, id="invalid date"),
+    pytest.param("a: 1", {"include": "/a"}, id="include string"),
+    pytest.param("a: 1", {"max_depth": -1}, id="negative max depth"),
+]
+
+
+@pytest.mark.parametrize("source, kwargs", SAFE_LOAD_ERROR_TESTS)
+def test_safe_load_error(source, kwargs):
+    """
+    GIVEN source and arguments
+    WHEN safe_load is called with the source and arguments
     THEN InvalidInputError is raised.
     """
     with pytest.raises(errors.InvalidInputError):
-        calculate(source)
+        safe_load(source, **kwargs)
+
+
+ALIAS_SOURCE = "a: &x [1, {b: 2}]\nc: *x\nd: [*x]\n"
+
+
+@pytest.mark.parametrize("engine", ["python", "auto"])
+def test_calculate_aliases(engine):
+    """
+    GIVEN source with anchors and aliases and engine
+    WHEN the source map is calculated with each function
+    THEN the entry of each alias spans the alias and has the JSON pointer of the
+        anchored value.
+    """
+    expected_source_map = calculate(ALIAS_SOURCE, engine=engine)
+
+    compact_source_map = calculate(ALIAS_SOURCE, engine=engine, compact=True)
+    iterated_source_map = dict(iter_entries(ALIAS_SOURCE, engine=engine))
+    all_source_maps = calculate_all(
+        f"{ALIAS_SOURCE}---\n{ALIAS_SOURCE}", engine=engine, compact=True
+    )
+    parallel_source_maps = calculate_all(
+        f"{ALIAS_SOURCE}---\n{ALIAS_SOURCE}", engine=engine, parallel=True, workers=2
+    )
+    loaded_source_map = safe_load(ALIAS_SOURCE, engine=engine).source_map
+
+    assert list(expected_source_map) == ["", "/a", "/a/0", "/a/1", "/a/1/b", "/c"] + [
+        "/d",
+        "/d/0",
+    ]
+    assert expected_source_map["/c"].value_start == types.Location(1, 3, 21)
+    assert expected_source_map["/c"].value_end == types.Location(1, 5, 23)
+    assert expected_source_map["/c"].anchor == "/a"
+    assert expected_source_map["/d/0"].anchor == "/a"
+    assert expected_source_map["/a"].anchor is None
+    assert compact_source_map.aliases == {"/c": "/a", "/d/0": "/a"}
+    for source_map in (compact_source_map, iterated_source_map, loaded_source_map):
+        assert dict(source_map) == expected_source_map
+    assert [source_map["/c"].anchor for source_map in all_source_maps] == ["/a"] * 2
+    assert [source_map["/c"].anchor for source_map in parallel_source_maps] == [
+        "/a"
+    ] * 2
+
+
+def test_safe_load_aliases():
+    """
+    GIVEN source with anchors and aliases
+    WHEN safe_load is called with the source
+    THEN the value of yaml.safe_load is returned with the anchored value shared.
+    """
+    returned_result = safe_load(ALIAS_SOURCE)
+
+    assert returned_result.value == yaml.safe_load(ALIAS_SOURCE)
+    assert returned_result.value["c"] is returned_result.value["a"]
+    assert returned_result.objects["/d/0"] is returned_result.value["a"]
+
+
+def test_calculate_aliases_linear():
+    """
+    GIVEN source whose aliases expand to more than 10**20 values
+    WHEN calculate and safe_load are called with the source
+    THEN one entry is calculated for each anchor and alias in the source.
+    """
+    lines = ["a0: &a0 [x, x, x, x, x, x, x, x, x, x]"]
+    for index in range(1, 20):
+        aliases = ", ".join([f"*a{index - 1}"] * 10)
+        lines.append(f"a{index}: &a{index} [{aliases}]")
+    source = "\n".join(lines)
+
+    returned_source_map = calculate(source, compact=True)
+    returned_result = safe_load(source)
+
+    assert len(returned_source_map) == 1 + 20 * 11
+    assert len(returned_source_map.aliases) == 19 * 10
+    assert returned_result.value["a19"][0] is returned_result.value["a18"]
@@ -1,33 +1,843 @@
 """Calculate the YAML source map."""
 
-import yaml
-from yaml import parser, scanner
+import asyncio
+import concurrent.futures
+import functools
+import typing
+from types import MappingProxyType
 
-from . import errors, handle, types
+from yaml import constructor, parser, reader, scanner
 
+from . import (
+    asynchronous,
+    batch,
+    construct,
+    errors,
+    handle,
+    loader,
+    metrics,
+    split,
+    stream,
+    types,
+)
+from .alias import resolve_alias
+from .batch import BatchResult
+from .cache import Cache, CacheStatistics, DiskCache, TCachedSourceMap
+from .construct import LoadResult
+from .export import to_json_source_map, write_json
+from .incremental import recalculate
+from .index import PositionIndex
+from .lines import LineIndex
+from .metrics import Metrics, collect_metrics
+from .selection import Selection
+from .serialize import dump, dumps, load, loads
+from .source_map import SourceMap, collect
 
-def calculate(source: str) -> types.TSourceMap:
+
+def _check_source(source: str) -> None:
+    """Check that the source is a non-empty string."""
+    if not isinstance(source, str):
+        raise errors.InvalidInputError(f"source must be a string, got {type(source)}")
+    if not source:
+        raise errors.InvalidInputError("source must not be empty")
+
+
+def _patterns(
+    include: typing.Optional[typing.Iterable[str]],
+) -> typing.Optional[typing.Tuple[str, ...]]:
+    """Collect the JSON pointers and glob patterns of the values to include."""
+    if include is None:
+        return None
+    if isinstance(include, str):
+        raise errors.InvalidInputError(
+            "include must be an iterable of JSON pointers and glob patterns, got a string"
+        )
+    return tuple(include)
+
+
+def _selection(
+    include: typing.Optional[typing.Iterable[str]],
+) -> typing.Optional[Selection]:
+    """Create the selection of the values to calculate the source map for."""
+    patterns = _patterns(include)
+    if patterns is None:
+        return None
+    return Selection(patterns)
+
+
+def _check_limit(name: str, limit: typing.Optional[int]) -> None:
+    """Check that a limit is None or a non-negative integer."""
+    if limit is None:
+        return
+    if not isinstance(limit, int) or isinstance(limit, bool) or limit < 0:
+        raise errors.InvalidInputError(
+            f"{name} must be a non-negative integer, got {limit!r}"
+        )
+
+
+@typing.overload
+def calculate(  # pylint: disable=too-many-arguments
+    source: str,
+    *,
+    engine: types.TEngine = "auto",
+    compact: typing.Literal[False] = False,
+    include: typing.Optional[typing.Iterable[str]] = None,
+    max_depth: typing.Optional[int] = None,
+    max_items: typing.Optional[int] = None,
+    cache: None = None,
+) -> types.TSourceMap:
+    """Calculate the source map as a dictionary."""
+
+
+@typing.overload
+def calculate(  # pylint: disable=too-many-arguments
+    source: str,
+    *,
+    engine: types.TEngine = "auto",
+    compact: typing.Literal[False] = False,
+    include: typing.Optional[typing.Iterable[str]] = None,
+    max_depth: typing.Optional[int] = None,
+    max_items: typing.Optional[int] = None,
+    cache: typing.Union[Cache, DiskCache],
+) -> TCachedSourceMap:
+    """Calculate the source map as a read-only dictionary shared through a cache."""
+
+
+@typing.overload
+def calculate(  # pylint: disable=too-many-arguments
+    source: str,
+    *,
+    engine: types.TEngine = "auto",
+    compact: typing.Literal[True],
+    include: typing.Optional[typing.Iterable[str]] = None,
+    max_depth: typing.Optional[int] = None,
+    max_items: typing.Optional[int] = None,
+    cache: typing.Union[Cache, DiskCache, None] = None,
+) -> SourceMap:
+    """Calculate the source map as a SourceMap."""
+
+
+def calculate(  # pylint: disable=too-many-arguments
+    source: str,
+    *,
+    engine: types.TEngine = "auto",
+    compact: bool = False,
+    include: typing.Optional[typing.Iterable[str]] = None,
+    max_depth: typing.Optional[int] = None,
+    max_items: typing.Optional[int] = None,
+    cache: typing.Union[Cache, DiskCache, None] = None,
+) -> typing.Union[types.TSourceMap, TCachedSourceMap, SourceMap]:
     """
     Calculate the source map for a YAML document.
 
-    Assume that the source is valid YAML.
+    The source is validated while the source map is calculated rather than loaded
+    separately first. The pure Python scanner reads the source once, libyaml parses
+    it once more in C to validate it before its tokens are scanned.
 
     Args:
         source: The YAML document.
+        engine: The engine that scans the source. "libyaml" uses the libyaml bindings
+            of PyYAML, "python" uses the pure Python scanner and "auto" uses libyaml if
+            it is available and otherwise falls back to the pure Python scanner.
+        compact: Whether to return a SourceMap that only stores the positions in a
+            typed array and resolves lines and columns when an entry is retrieved
+            rather than a dictionary of entries.
+        include: The JSON pointers and glob patterns of the values to calculate the
+            source map for, all values if None. The source is still scanned in full
+            but no entries or JSON pointers are created for values that cannot
+            match.
+        max_depth: The depth of the most deeply nested values that are included with
+            0 being the document, all if None. Mappings and sequences at max_depth
+            keep their entry.
+        max_items: The number of values of each mapping and sequence that are
+            included, all if None. The entry of the mapping or sequence still spans
+            all its values.
+        cache: The Cache or DiskCache to retrieve the source map from if it was
+            calculated before with the same options and to store it in otherwise.
+            The dictionary of a source map in a Cache is read-only since it is
+            shared. A DiskCache stores compact source maps and the dictionary is
+            created from the cached source map.
 
     Returns:
         The source map.
 
     """
-    if not isinstance(source, str):
-        raise errors.InvalidInputError(f"source must be a string, got {type(source)}")
-    if not source:
-        raise errors.InvalidInputError("source must not be empty")
+    recorder = metrics.record(source)
+    _check_source(source)
+    patterns = _patterns(include)
+    _check_limit("max_depth", max_depth)
+    _check_limit("max_items", max_items)
+    if cache is not None and not isinstance(cache, (Cache, DiskCache)):
+        raise errors.InvalidInputError(
+            f"cache must be a Cache or DiskCache, got {type(cache)}"
+        )
+
+    if cache is None:
+        return _calculate(
+            source,
+            engine=engine,
+            compact=compact,
+            patterns=patterns,
+            max_depth=max_depth,
+            max_items=max_items,
+            recorder=recorder,
+        )
+
+    cached_compact = compact or isinstance(cache, DiskCache)
+    key = cache.key(
+        source,
+        {
+            "engine": engine,
+            "compact": cached_compact,
+            "include": None if patterns is None else sorted(set(patterns)),
+            "max_depth": max_depth,
+            "max_items": max_items,
+        },
+    )
+    cached = cache.get(key)
+    if cached is None:
+        source_map = _calculate(
+            source,
+            engine=engine,
+            compact=cached_compact,
+            patterns=patterns,
+            max_depth=max_depth,
+            max_items=max_items,
+            recorder=recorder,
+        )
+        cached = (
+            source_map.read_only()
+            if isinstance(source_map, SourceMap)
+            else MappingProxyType(source_map)
+        )
+        cache.put(key, cached)
+    if cached_compact and not compact:
+        return dict(cached)
+    return cached
+
+
+def _calculate(  # pylint: disable=too-many-arguments,too-many-locals
+    source: typing.Union[str, stream.FileSource],
+    *,
+    engine: types.TEngine,
+    compact: bool,
+    patterns: typing.Optional[typing.Tuple[str, ...]],
+    max_depth: typing.Optional[int],
+    max_items: typing.Optional[int],
+    recorder: typing.Optional[metrics.Recorder] = None,
+) -> typing.Union[types.TSourceMap, SourceMap]:
+    """Calculate the source map for a YAML document or a file read in chunks."""
+    selection = None if patterns is None else Selection(patterns)
+    try:
+        lines: typing.Callable[[], LineIndex]
+        if isinstance(source, str):
+            token_loader = loader.create(source, engine=engine)
+            lines = functools.partial(LineIndex.from_source, source)
+        else:
+            token_loader = source.create(engine=engine)
+            # The line index of a file is complete once it has been scanned
+            lines = source.lines
+        if recorder is not None:
+            # libyaml validates the source when the loader is created
+            recorder.lap("validate")
+            token_loader = recorder.loader(token_loader)
+        token_loader.get_token()
+        if recorder is not None:
+            recorder.lap("tokenize")
+        aliases: typing.Dict[str, str] = {}
+        marks = handle.walk(
+            loader=token_loader,
+            selection=selection,
+            max_depth=max_depth,
+            max_items=max_items,
+            aliases=aliases,
+        )
+        if recorder is not None:
+            marks = recorder.walk(marks)
+        source_map: typing.Union[types.TSourceMap, SourceMap]
+        if compact:
+            pointers, positions = collect(marks)
+            handle.document_end(loader=token_loader)
+            source_map = SourceMap(pointers, positions, lines(), aliases=aliases)
+        else:
+            source_map = dict(handle.entries(marks, aliases=aliases))
+            handle.document_end(loader=token_loader)
+    except reader.ReaderError as error:
+        raise errors.InvalidYamlError(f"YAML is not valid: {error.reason}") from error
+    except (scanner.ScannerError, parser.ParserError) as error:
+        raise errors.InvalidInputError("YAML is not valid") from error
+
+    if recorder is not None:
+        recorder.lap("build")
+        recorder.report(entries=len(source_map))
+    return source_map
+
+
+@typing.overload
+def calculate_file(  # pylint: disable=too-many-arguments
+    file: stream.TFile,
+    *,
+    engine: types.TEngine = "auto",
+    compact: typing.Literal[False] = False,
+    include: typing.Optional[typing.Iterable[str]] = None,
+    max_depth: typing.Optional[int] = None,
+    max_items: typing.Optional[int] = None,
+) -> types.TSourceMap:
+    """Calculate the source map of a file as a dictionary."""
+
+
+@typing.overload
+def calculate_file(  # pylint: disable=too-many-arguments
+    file: stream.TFile,
+    *,
+    engine: types.TEngine = "auto",
+    compact: typing.Literal[True],
+    include: typing.Optional[typing.Iterable[str]] = None,
+    max_depth: typing.Optional[int] = None,
+    max_items: typing.Optional[int] = None,
+) -> SourceMap:
+    """Calculate the source map of a file as a SourceMap."""
+
+
+def calculate_file(  # pylint: disable=too-many-arguments
+    file: stream.TFile,
+    *,
+    engine: types.TEngine = "auto",
+    compact: bool = False,
+    include: typing.Optional[typing.Iterable[str]] = None,
+    max_depth: typing.Optional[int] = None,
+    max_items: typing.Optional[int] = None,
+) -> typing.Union[types.TSourceMap, SourceMap]:
+    """
+    Calculate the source map for a YAML document in a file without reading it in full.
+
+    The file is read and decoded in chunks by the PyYAML reader, so only the source
+    map and its line index are held in memory. The encoding is detected the same way
+    as PyYAML does, UTF-16 if the file starts with its byte order mark and UTF-8
+    otherwise. libyaml reads the file twice, streams that cannot seek and files with a
+    byte order mark are therefore scanned by the pure Python scanner.
+
+    Args:
+        file: The path of the YAML document, its bytes or a stream opened for reading
+            bytes, which is read from its current position and not closed.
+        engine: The engine that scans the source, see calculate.
+        compact: Whether to return a SourceMap, see calculate.
+        include: The values to calculate the source map for, see calculate.
+        max_depth: The depth of the most deeply nested values, see calculate.
+        max_items: The number of values of each mapping and sequence, see calculate.
+
+    Returns:
+        The source map.
+
+    """
+    patterns = _patterns(include)
+    _check_limit("max_depth", max_depth)
+    _check_limit("max_items", max_items)
+    with stream.open_file(file) as source:
+        return _calculate(
+            source,
+            engine=engine,
+            compact=compact,
+            patterns=patterns,
+            max_depth=max_depth,
+            max_items=max_items,
+        )
+
+
+@typing.overload
+def calculate_all(  # pylint: disable=too-many-arguments
+    source: str,
+    *,
+    engine: types.TEngine = "auto",
+    compact: typing.Literal[False] = False,
+    include: typing.Optional[typing.Iterable[str]] = None,
+    max_depth: typing.Optional[int] = None,
+    max_items: typing.Optional[int] = None,
+    parallel: bool = False,
+    workers: typing.Optional[int] = None,
+) -> typing.List[types.TSourceMap]:
+    """Calculate the source map of each document as a dictionary."""
+
+
+@typing.overload
+def calculate_all(  # pylint: disable=too-many-arguments
+    source: str,
+    *,
+    engine: types.TEngine = "auto",
+    compact: typing.Literal[True],
+    include: typing.Optional[typing.Iterable[str]] = None,
+    max_depth: typing.Optional[int] = None,
+    max_items: typing.Optional[int] = None,
+    parallel: bool = False,
+    workers: typing.Optional[int] = None,
+) -> typing.List[SourceMap]:
+    """Calculate the source map of each document as a SourceMap."""
+
+
+def calculate_all(  # pylint: disable=too-many-arguments
+    source: str,
+    *,
+    engine: types.TEngine = "auto",
+    compact: bool = False,
+    include: typing.Optional[typing.Iterable[str]] = None,
+    max_depth: typing.Optional[int] = None,
+    max_items: typing.Optional[int] = None,
+    parallel: bool = False,
+    workers: typing.Optional[int] = None,
+) -> typing.Union[typing.List[types.TSourceMap], typing.List[SourceMap]]:
+    """
+    Calculate the source map for each document of a YAML stream.
+
+    The documents are separated by --- and the stream is scanned as a whole, see
+    calculate for how often each engine reads it. The positions,
+    lines and columns of all source maps are those of the whole stream and the
+    SourceMap instances share its line index. An empty document has a single entry
+    for its null value that spans no characters.
+
+    Args:
+        source: The YAML stream.
+        engine: The engine that scans the source, see calculate.
+        compact: Whether to return SourceMap instances, see calculate.
+        include: The values of each document to calculate the source map for, see
+            calculate.
+        max_depth: The depth of the most deeply nested values, see calculate.
+        max_items: The number of values of each mapping and sequence, see calculate.
+        parallel: Whether to split the stream at the start markers of its documents
+            and scan the parts in a pool of processes, which is worthwhile for
+            streams of many large documents. The dictionaries are created afterwards
+            unless compact is True.
+        workers: The number of processes if parallel is True, the number of
+            processors if None.
+
+    Returns:
+        The source map of each document in order.
+
+    """
+    _check_source(source)
+    patterns = _patterns(include)
+    if patterns is not None:
+        Selection(patterns)
+    _check_limit("max_depth", max_depth)
+    _check_limit("max_items", max_items)
+
+    if parallel:
+        lines = LineIndex.from_source(source)
+        source_maps = split.calculate_all(
+            source,
+            calculate=typing.cast(
+                typing.Callable[[str], typing.List[SourceMap]],
+                functools.partial(
+                    calculate_all,
+                    engine=engine,
+                    compact=True,
+                    include=patterns,
+                    max_depth=max_depth,
+                    max_items=max_items,
+                ),
+            ),
+            lines=lines,
+            workers=workers,
+        )
+        if compact:
+            return source_maps
+        return [dict(source_map) for source_map in source_maps]
+
+    return _calculate_all(
+        source,
+        engine=engine,
+        compact=compact,
+        patterns=patterns,
+        max_depth=max_depth,
+        max_items=max_items,
+    )
+
+
+def _calculate_all(  # pylint: disable=too-many-arguments
+    source: str,
+    *,
+    engine: types.TEngine,
+    compact: bool,
+    patterns: typing.Optional[typing.Tuple[str, ...]],
+    max_depth: typing.Optional[int],
+    max_items: typing.Optional[int],
+) -> typing.Union[typing.List[types.TSourceMap], typing.List[SourceMap]]:
+    """Calculate the source map for each document of a YAML stream in one scan."""
+    selection = None if patterns is None else Selection(patterns)
+    lines = LineIndex.from_source(source) if compact else None
+    source_maps: typing.List[typing.Any] = []
     try:
-        yaml.safe_load(source)
+        token_loader = loader.create(source, engine=engine)
+        token_loader.get_token()
+        for marks, aliases in handle.documents(
+            loader=token_loader,
+            selection=selection,
+            max_depth=max_depth,
+            max_items=max_items,
+        ):
+            if lines is None:
+                source_maps.append(dict(handle.entries(marks, aliases=aliases)))
+            else:
+                pointers, positions = collect(marks)
+                source_maps.append(
+                    SourceMap(pointers, positions, lines, aliases=aliases)
+                )
+    except reader.ReaderError as error:
+        raise errors.InvalidYamlError(f"YAML is not valid: {error.reason}") from error
     except (scanner.ScannerError, parser.ParserError) as error:
         raise errors.InvalidInputError("YAML is not valid") from error
 
-    loader = yaml.Loader(source)
-    loader.get_token()
-    return dict(handle.value(loader=loader))
+    return source_maps
+
+
+def safe_load(  # pylint: disable=too-many-arguments,too-many-locals
+    source: str,
+    *,
+    engine: types.TEngine = "auto",
+    compact: bool = False,
+    include: typing.Optional[typing.Iterable[str]] = None,
+    max_depth: typing.Optional[int] = None,
+    max_items: typing.Optional[int] = None,
+) -> LoadResult:
+    """
+    Load the value of a YAML document together with its source map.
+
+    The value is constructed the same way as by yaml.safe_load from the tokens that
+    the source map is calculated from, so the source is not scanned again for the
+    value. libyaml still parses the source once in C to validate it, see calculate.
+
+    Args:
+        source: The YAML document.
+        engine: The engine that scans the source, see calculate.
+        compact: Whether the source map is a SourceMap, see calculate.
+        include: The values to calculate the source map for, see calculate. The
+            value is always constructed in full but objects only contains the
+            included values.
+        max_depth: The depth of the most deeply nested values in the source map, see
+            calculate.
+        max_items: The number of values of each mapping and sequence in the source
+            map, see calculate.
+
+    Returns:
+        The value, the source map and the object of each value in the source map.
+
+    """
+    _check_source(source)
+    selection = _selection(include)
+    _check_limit("max_depth", max_depth)
+    _check_limit("max_items", max_items)
+    try:
+        builder = construct.Builder(loader.create(source, engine=engine))
+        builder.get_token()
+        aliases: typing.Dict[str, str] = {}
+        marks = builder.record(
+            handle.walk(
+                loader=builder,
+                selection=selection,
+                max_depth=max_depth,
+                max_items=max_items,
+                aliases=aliases,
+            )
+        )
+        source_map: typing.Union[types.TSourceMap, SourceMap]
+        if compact:
+            pointers, positions = collect(marks)
+            source_map = SourceMap(
+                pointers,
+                positions,
+                LineIndex.from_source(source),
+                aliases=aliases,
+            )
+        else:
+            source_map = dict(handle.entries(marks, aliases=aliases))
+        handle.document_end(loader=builder)
+        value, objects = builder.construct()
+    except reader.ReaderError as error:
+        raise errors.InvalidYamlError(f"YAML is not valid: {error.reason}") from error
+    except (scanner.ScannerError, parser.ParserError) as error:
+        raise errors.InvalidInputError("YAML is not valid") from error
+    except (constructor.ConstructorError, ValueError) as error:
+        raise errors.InvalidInputError("YAML value could not be constructed") from error
+
+    return LoadResult(value=value, source_map=source_map, objects=objects)
+
+
+def iter_entries(
+    source: str,
+    *,
+    engine: types.TEngine = "auto",
+    include: typing.Optional[typing.Iterable[str]] = None,
+    max_depth: typing.Optional[int] = None,
+    max_items: typing.Optional[int] = None,
+) -> types.TSourceMapIterator:
+    """
+    Calculate the source map for a YAML document one entry at a time.
+
+    Each entry is yielded as soon as the tokens of its value have been consumed so
+    that the source map is never held in memory. The entry of a mapping or sequence is
+    therefore yielded after the entries of its values. Invalid YAML raises
+    InvalidInputError once the iteration reaches the invalid part of the source.
+
+    Args:
+        source: The YAML document.
+        engine: The engine that scans the source, see calculate.
+        include: The values to calculate the source map for, see calculate.
+        max_depth: The depth of the most deeply nested values, see calculate.
+        max_items: The number of values of each mapping and sequence, see calculate.
+
+    Returns:
+        The JSON pointer and source map entry of each value.
+
+    """
+    _check_source(source)
+    selection = _selection(include)
+    _check_limit("max_depth", max_depth)
+    _check_limit("max_items", max_items)
+    return _iter_entries(
+        source,
+        engine=engine,
+        selection=selection,
+        max_depth=max_depth,
+        max_items=max_items,
+    )
+
+
+def _iter_entries(
+    source: str,
+    *,
+    engine: types.TEngine,
+    selection: typing.Optional[Selection],
+    max_depth: typing.Optional[int],
+    max_items: typing.Optional[int],
+) -> types.TSourceMapIterator:
+    """Calculate the source map for a YAML document one entry at a time."""
+    try:
+        token_loader = loader.create(source, engine=engine)
+        token_loader.get_token()
+        aliases: typing.Dict[str, str] = {}
+        for _, pointer, value_start, value_end, key_start, key_end in handle.walk(
+            loader=token_loader,
+            selection=selection,
+            max_depth=max_depth,
+            max_items=max_items,
+            aliases=aliases,
+        ):
+            yield pointer, handle.entry(
+                value_start, value_end, key_start, key_end, aliases.get(pointer)
+            )
+        handle.document_end(loader=token_loader)
+    except reader.ReaderError as error:
+        raise errors.InvalidYamlError(f"YAML is not valid: {error.reason}") from error
+    except (scanner.ScannerError, parser.ParserError) as error:
+        raise errors.InvalidInputError("YAML is not valid") from error
+
+
+def calculate_many(  # pylint: disable=too-many-arguments
+    sources: typing.Iterable[batch.TSource],
+    *,
+    engine: types.TEngine = "auto",
+    compact: bool = False,
+    include: typing.Optional[typing.Iterable[str]] = None,
+    max_depth: typing.Optional[int] = None,
+    max_items: typing.Optional[int] = None,
+    workers: typing.Optional[int] = None,
+    chunk_size: int = 16,
+    ordered: bool = True,
+) -> typing.Iterator[BatchResult]:
+    """
+    Calculate the source maps of many YAML documents using a pool of processes.
+
+    Strings are YAML documents and paths are read as UTF-8 by the workers. The workers
+    send compact source maps back in the binary format, the dictionaries are created
+    afterwards unless compact is True. An error for one source is reported in its
+    result and does not stop the others.
+
+    Args:
+        sources: The YAML documents or paths to them.
+        engine: The engine that scans the sources, see calculate.
+        compact: Whether to return SourceMap instances, see calculate.
+        include: The values to calculate the source maps for, see calculate.
+        max_depth: The depth of the most deeply nested values, see calculate.
+        max_items: The number of values of each mapping and sequence, see calculate.
+        workers: The number of processes, the number of processors if None.
+        chunk_size: The number of sources sent to a process at once.
+        ordered: Whether to return the results in the order of the sources rather
+            than as soon as they are calculated.
+
+    Returns:
+        The index, the source map or the error of each source.
+
+    """
+    patterns = _patterns(include)
+    if patterns is not None:
+        Selection(patterns)
+    _check_limit("max_depth", max_depth)
+    _check_limit("max_items", max_items)
+    return batch.calculate_many(
+        sources,
+        calculate=typing.cast(
+            typing.Callable[[str], SourceMap],
+            functools.partial(
+                calculate,
+                engine=engine,
+                compact=True,
+                include=patterns,
+                max_depth=max_depth,
+                max_items=max_items,
+            ),
+        ),
+        compact=compact,
+        workers=workers,
+        chunk_size=chunk_size,
+        ordered=ordered,
+    )
+
+
+@typing.overload
+async def acalculate(  # pylint: disable=too-many-arguments
+    source: str,
+    *,
+    engine: types.TEngine = "auto",
+    compact: typing.Literal[False] = False,
+    include: typing.Optional[typing.Iterable[str]] = None,
+    max_depth: typing.Optional[int] = None,
+    max_items: typing.Optional[int] = None,
+    executor: typing.Optional[concurrent.futures.Executor] = None,
+    semaphore: typing.Optional[asyncio.Semaphore] = None,
+) -> types.TSourceMap:
+    """Calculate the source map as a dictionary in an executor."""
+
+
+@typing.overload
+async def acalculate(  # pylint: disable=too-many-arguments
+    source: str,
+    *,
+    engine: types.TEngine = "auto",
+    compact: typing.Literal[True],
+    include: typing.Optional[typing.Iterable[str]] = None,
+    max_depth: typing.Optional[int] = None,
+    max_items: typing.Optional[int] = None,
+    executor: typing.Optional[concurrent.futures.Executor] = None,
+    semaphore: typing.Optional[asyncio.Semaphore] = None,
+) -> SourceMap:
+    """Calculate the source map as a SourceMap in an executor."""
+
+
+async def acalculate(  # pylint: disable=too-many-arguments
+    source: str,
+    *,
+    engine: types.TEngine = "auto",
+    compact: bool = False,
+    include: typing.Optional[typing.Iterable[str]] = None,
+    max_depth: typing.Optional[int] = None,
+    max_items: typing.Optional[int] = None,
+    executor: typing.Optional[concurrent.futures.Executor] = None,
+    semaphore: typing.Optional[asyncio.Semaphore] = None,
+) -> typing.Union[types.TSourceMap, SourceMap]:
+    """
+    Calculate the source map for a YAML document without blocking the event loop.
+
+    The source map is calculated by calculate in the executor. A process executor
+    runs the calculation in parallel with the event loop, a thread executor still
+    shares the interpreter with it but the event loop keeps handling other tasks in
+    between. Cancelling the task cancels the calculation if it has not started yet, a
+    calculation that has already started runs to completion and its result is
+    discarded.
+
+    Args:
+        source: The YAML document.
+        engine: The engine that scans the source, see calculate.
+        compact: Whether to return a SourceMap, see calculate.
+        include: The values to calculate the source map for, see calculate.
+        max_depth: The depth of the most deeply nested values, see calculate.
+        max_items: The number of values of each mapping and sequence, see calculate.
+        executor: The thread or process executor, the default executor of the event
+            loop if None.
+        semaphore: Shared between calls to limit the number of source maps that are
+            calculated at the same time so that a burst of large sources does not
+            occupy the whole executor, no limit if None.
+
+    Returns:
+        The source map.
+
+    """
+    _check_source(source)
+    patterns = _patterns(include)
+    if patterns is not None:
+        Selection(patterns)
+    _check_limit("max_depth", max_depth)
+    _check_limit("max_items", max_items)
+    return await asynchronous.run(
+        functools.partial(
+            calculate,
+            source,
+            engine=engine,
+            compact=compact,
+            include=patterns,
+            max_depth=max_depth,
+            max_items=max_items,
+        ),
+        executor=executor,
+        semaphore=semaphore,
+    )
+
+
+def acalculate_many(  # pylint: disable=too-many-arguments
+    sources: typing.Iterable[batch.TSource],
+    *,
+    engine: types.TEngine = "auto",
+    compact: bool = False,
+    include: typing.Optional[typing.Iterable[str]] = None,
+    max_depth: typing.Optional[int] = None,
+    max_items: typing.Optional[int] = None,
+    executor: typing.Optional[concurrent.futures.Executor] = None,
+    semaphore: typing.Optional[asyncio.Semaphore] = None,
+    concurrency: int = 4,
+    ordered: bool = True,
+) -> typing.AsyncIterator[BatchResult]:
+    """
+    Calculate the source maps of many YAML documents without blocking the event loop.
+
+    Strings are YAML documents and paths are read as UTF-8 in the executor. At most
+    concurrency sources are calculated at once and the sources are consumed lazily.
+    An error for one source is reported in its result and does not stop the others.
+    Closing the iterator or cancelling the task that consumes it cancels the sources
+    that have not started yet.
+
+    Args:
+        sources: The YAML documents or paths to them.
+        engine: The engine that scans the sources, see calculate.
+        compact: Whether to return SourceMap instances, see calculate.
+        include: The values to calculate the source maps for, see calculate.
+        max_depth: The depth of the most deeply nested values, see calculate.
+        max_items: The number of values of each mapping and sequence, see calculate.
+        executor: The thread or process executor, see acalculate.
+        semaphore: Limits the number of source maps calculated at the same time
+            across calls, see acalculate.
+        concurrency: The number of sources of this batch calculated at once.
+        ordered: Whether to return the results in the order of the sources rather
+            than as soon as they are calculated.
+
+    Returns:
+        The index, the source map or the error of each source.
+
+    """
+    patterns = _patterns(include)
+    if patterns is not None:
+        Selection(patterns)
+    _check_limit("max_depth", max_depth)
+    _check_limit("max_items", max_items)
+    return asynchronous.calculate_many(
+        sources,
+        calculate=functools.partial(
+            calculate,
+            engine=engine,
+            compact=compact,
+            include=patterns,
+            max_depth=max_depth,
+            max_items=max_items,
+        ),
+        executor=executor,
+        semaphore=semaphore,
+        concurrency=concurrency,
+        ordered=ordered,
+    )
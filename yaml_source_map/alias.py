@@ -0,0 +1,52 @@
+"""Follow the aliases of a source map to the anchored values they refer to."""
+
+import typing
+
+from . import errors, types
+from .source_map import SourceMap
+
+
+def _anchor(
+    source_map: typing.Mapping[str, types.Entry], pointer: str
+) -> typing.Optional[str]:
+    """Retrieve the JSON pointer of the anchored value if a value is an alias."""
+    if isinstance(source_map, SourceMap):
+        return source_map.aliases.get(pointer)
+    entry = source_map.get(pointer)
+    return None if entry is None else entry.anchor
+
+
+def resolve_alias(source_map: typing.Mapping[str, types.Entry], pointer: str) -> str:
+    """
+    Find the value that a JSON pointer refers to when its aliases are followed.
+
+    Aliases are not expanded when the source map is calculated, the values of an
+    anchored value are only in the source map once. A JSON pointer through an alias,
+    for example /b/c where /b is an alias of the value at /a, is resolved to the JSON
+    pointer of the value in the source map, /a/c. At most one alias is followed for
+    each reference token of the JSON pointer, so the cost does not depend on how
+    often the aliases are nested.
+
+    Args:
+        source_map: The source map calculated by calculate, either a dictionary or a
+            SourceMap.
+        pointer: The JSON pointer that may pass through aliases.
+
+    Returns:
+        The JSON pointer of the value in the source map.
+
+    """
+    if not isinstance(pointer, str) or (pointer and not pointer.startswith("/")):
+        raise errors.InvalidInputError(
+            f"pointer must be a JSON pointer starting with /, got {pointer!r}"
+        )
+
+    resolved = ""
+    for token in pointer.split("/")[1:]:
+        resolved = f"{resolved}/{token}"
+        anchor = _anchor(source_map, resolved)
+        if anchor is not None:
+            resolved = anchor
+    if resolved not in source_map:
+        raise KeyError(pointer)
+    return resolved
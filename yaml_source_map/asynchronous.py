@@ -0,0 +1,158 @@
+"""Calculate source maps in an executor without blocking the asyncio event loop."""
+
+import asyncio
+import collections
+import concurrent.futures
+import functools
+import itertools
+import typing
+
+from . import batch, errors, types
+from .batch import BatchResult
+from .source_map import SourceMap
+
+_ResultT = typing.TypeVar("_ResultT")
+_TSourceMapResult = typing.Union[  # pylint: disable=invalid-name
+    types.TSourceMap, SourceMap
+]
+
+
+async def run(
+    function: typing.Callable[[], _ResultT],
+    *,
+    executor: typing.Optional[concurrent.futures.Executor],
+    semaphore: typing.Optional[asyncio.Semaphore],
+) -> _ResultT:
+    """
+    Run a function in an executor once the semaphore has been acquired.
+
+    Cancelling the task cancels the function if it has not started in the executor
+    yet, a function that has already started runs to completion and its result is
+    discarded. The semaphore is released as soon as the task is done or cancelled.
+
+    Args:
+        function: The function, must be picklable for a process executor.
+        executor: The executor, the default executor of the event loop if None.
+        semaphore: Limits the number of functions that run at the same time, no
+            limit if None.
+
+    Returns:
+        The return value of the function.
+
+    """
+    loop = asyncio.get_running_loop()
+    if semaphore is None:
+        return await loop.run_in_executor(executor, function)
+    async with semaphore:
+        return await loop.run_in_executor(executor, function)
+
+
+def _calculate_source(
+    calculate: typing.Callable[[str], _TSourceMapResult], source: batch.TSource
+) -> _TSourceMapResult:
+    """Read a source of a batch and calculate its source map in the executor."""
+    return calculate(batch.read(source))
+
+
+async def _result(
+    index: int,
+    function: typing.Callable[[], _TSourceMapResult],
+    *,
+    executor: typing.Optional[concurrent.futures.Executor],
+    semaphore: typing.Optional[asyncio.Semaphore],
+) -> BatchResult:
+    """Calculate the source map of a source of a batch and capture its error."""
+    try:
+        source_map = await run(function, executor=executor, semaphore=semaphore)
+    except (errors.BaseError, OSError, ValueError) as error:
+        return BatchResult(index=index, source_map=None, error=error)
+    return BatchResult(index=index, source_map=source_map)
+
+
+def calculate_many(  # pylint: disable=too-many-arguments
+    sources: typing.Iterable[batch.TSource],
+    *,
+    calculate: typing.Callable[[str], _TSourceMapResult],
+    executor: typing.Optional[concurrent.futures.Executor],
+    semaphore: typing.Optional[asyncio.Semaphore],
+    concurrency: int,
+    ordered: bool,
+) -> typing.AsyncIterator[BatchResult]:
+    """
+    Calculate the source maps of YAML documents in an executor.
+
+    At most concurrency sources are calculated at any time so that the sources are
+    consumed lazily. Closing the iterator or cancelling the task that consumes it
+    cancels the pending sources.
+
+    Args:
+        sources: The YAML documents or their paths.
+        calculate: Calculates the source map of a YAML document, must be picklable
+            for a process executor.
+        executor: The executor, the default executor of the event loop if None.
+        semaphore: Limits the number of sources calculated at the same time across
+            calls, no limit if None.
+        concurrency: The number of sources of this batch calculated at once.
+        ordered: Whether to return the results in the order of the sources rather
+            than as soon as they are calculated.
+
+    Returns:
+        The result of each source.
+
+    """
+    batch.check_positive("concurrency", concurrency)
+    return _calculate_many(
+        sources,
+        calculate=calculate,
+        executor=executor,
+        semaphore=semaphore,
+        concurrency=concurrency,
+        ordered=ordered,
+    )
+
+
+async def _calculate_many(  # pylint: disable=too-many-arguments
+    sources: typing.Iterable[batch.TSource],
+    *,
+    calculate: typing.Callable[[str], _TSourceMapResult],
+    executor: typing.Optional[concurrent.futures.Executor],
+    semaphore: typing.Optional[asyncio.Semaphore],
+    concurrency: int,
+    ordered: bool,
+) -> typing.AsyncIterator[BatchResult]:
+    """Calculate the source maps of YAML documents in an executor."""
+    indexed_sources = enumerate(sources)
+    pending: typing.Deque["asyncio.Future[BatchResult]"] = collections.deque()
+
+    def submit(count: int) -> None:
+        """Start calculating the next sources."""
+        for index, source in itertools.islice(indexed_sources, count):
+            pending.append(
+                asyncio.ensure_future(
+                    _result(
+                        index,
+                        functools.partial(_calculate_source, calculate, source),
+                        executor=executor,
+                        semaphore=semaphore,
+                    )
+                )
+            )
+
+    submit(concurrency)
+    try:
+        while pending:
+            if ordered:
+                task = pending.popleft()
+            else:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                task = done.pop()
+                pending.remove(task)
+            result = await task
+            submit(1)
+            yield result
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
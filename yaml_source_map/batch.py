@@ -0,0 +1,195 @@
+"""Calculate the source maps of many YAML documents using a pool of processes."""
+
+import collections
+import concurrent.futures
+import dataclasses
+import itertools
+import os
+import typing
+
+from . import errors, serialize, types
+from .source_map import SourceMap
+
+TSource = typing.Union[str, "os.PathLike[str]"]  # pylint: disable=invalid-name
+_TChunk = typing.List[typing.Tuple[int, TSource]]
+_TChunkResult = typing.List[
+    typing.Tuple[int, typing.Optional[bytes], typing.Optional[Exception]]
+]
+_TFuture = concurrent.futures.Future[_TChunkResult]
+
+
+@dataclasses.dataclass(frozen=True)
+class BatchResult:
+    """
+    The source map of a YAML document calculated by calculate_many.
+
+    Attrs:
+        index: The position of the YAML document in the sources.
+        source_map: The source map or None if it could not be calculated.
+        error: The error raised while reading the YAML document or calculating its
+            source map, None if the source map was calculated.
+
+    """
+
+    index: int
+    source_map: typing.Union[types.TSourceMap, SourceMap, None]
+    error: typing.Optional[Exception] = None
+
+
+def check_positive(name: str, value: typing.Optional[int]) -> None:
+    """
+    Check that a value is None or a positive integer.
+
+    Args:
+        name: The name of the argument.
+        value: The value of the argument.
+
+    """
+    if value is None:
+        return
+    if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+        raise errors.InvalidInputError(
+            f"{name} must be a positive integer, got {value!r}"
+        )
+
+
+def read(source: TSource) -> str:
+    """
+    Read the YAML document of a source of a batch.
+
+    Args:
+        source: The YAML document or its path, which is read as UTF-8 without
+            translating line breaks.
+
+    Returns:
+        The YAML document.
+
+    """
+    if isinstance(source, str):
+        return source
+    if not isinstance(source, os.PathLike):
+        raise errors.InvalidInputError(
+            f"source must be a string or a path, got {type(source)}"
+        )
+    with open(source, encoding="utf-8", newline="") as file:
+        return file.read()
+
+
+def _calculate_chunk(
+    calculate: typing.Callable[[str], SourceMap], chunk: _TChunk
+) -> _TChunkResult:
+    """
+    Calculate the source maps of a chunk of YAML documents in a worker process.
+
+    Args:
+        calculate: Calculates the compact source map of a YAML document.
+        chunk: The index and the YAML document or its path of each source.
+
+    Returns:
+        The index and the serialized source map or the error of each source.
+
+    """
+    results: _TChunkResult = []
+    for index, source in chunk:
+        try:
+            results.append((index, serialize.dumps(calculate(read(source))), None))
+        except (errors.BaseError, OSError, ValueError) as error:
+            results.append((index, None, error))
+    return results
+
+
+def _next_result(pending: typing.Deque[_TFuture], *, ordered: bool) -> _TFuture:
+    """Remove the first pending chunk or the first one that is calculated."""
+    if ordered:
+        return pending.popleft()
+    done, _ = concurrent.futures.wait(
+        pending, return_when=concurrent.futures.FIRST_COMPLETED
+    )
+    future = done.pop()
+    pending.remove(future)
+    return future
+
+
+def _results(
+    chunk_result: _TChunkResult, *, compact: bool
+) -> typing.Iterator[BatchResult]:
+    """Load the source maps of a chunk sent back by a worker."""
+    for index, data, error in chunk_result:
+        if data is None:
+            yield BatchResult(index=index, source_map=None, error=error)
+            continue
+        source_map = serialize.loads(data)
+        yield BatchResult(
+            index=index, source_map=source_map if compact else dict(source_map)
+        )
+
+
+def calculate_many(  # pylint: disable=too-many-arguments
+    sources: typing.Iterable[TSource],
+    *,
+    calculate: typing.Callable[[str], SourceMap],
+    compact: bool,
+    workers: typing.Optional[int],
+    chunk_size: int,
+    ordered: bool,
+) -> typing.Iterator[BatchResult]:
+    """
+    Calculate the source maps of YAML documents using a pool of processes.
+
+    The sources are sent to the workers in chunks and only a few chunks per worker
+    are pending at any time so that the sources are consumed lazily. The workers send
+    the source maps back in the binary format which is loaded without copying.
+
+    Args:
+        sources: The YAML documents or their paths.
+        calculate: Calculates the compact source map of a YAML document, must be
+            picklable.
+        compact: Whether to return the SourceMap rather than a dictionary.
+        workers: The number of processes, the number of processors if None.
+        chunk_size: The number of sources sent to a worker at once.
+        ordered: Whether to return the results in the order of the sources rather
+            than as soon as they are calculated.
+
+    Returns:
+        The result of each source.
+
+    """
+    check_positive("workers", workers)
+    check_positive("chunk_size", chunk_size)
+    return _calculate_many(
+        sources,
+        calculate=calculate,
+        compact=compact,
+        worker_count=workers or os.cpu_count() or 1,
+        chunk_size=chunk_size,
+        ordered=ordered,
+    )
+
+
+def _calculate_many(  # pylint: disable=too-many-arguments
+    sources: typing.Iterable[TSource],
+    *,
+    calculate: typing.Callable[[str], SourceMap],
+    compact: bool,
+    worker_count: int,
+    chunk_size: int,
+    ordered: bool,
+) -> typing.Iterator[BatchResult]:
+    """Calculate the source maps of YAML documents using a pool of processes."""
+    indexed_sources = enumerate(sources)
+    chunks = iter(lambda: list(itertools.islice(indexed_sources, chunk_size)), [])
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=worker_count) as executor:
+        pending: typing.Deque[_TFuture] = collections.deque(
+            executor.submit(_calculate_chunk, calculate, chunk)
+            for chunk in itertools.islice(chunks, 2 * worker_count)
+        )
+        try:
+            while pending:
+                future = _next_result(pending, ordered=ordered)
+                for chunk in itertools.islice(chunks, 1):
+                    pending.append(executor.submit(_calculate_chunk, calculate, chunk))
+                yield from _results(future.result(), compact=compact)
+        finally:
+            for future in pending:
+                future.cancel()
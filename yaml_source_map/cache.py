@@ -0,0 +1,401 @@
+"""Cache source maps by the contents of the source and the options."""
+
+import collections
+import dataclasses
+import hashlib
+import importlib.metadata
+import os
+import pathlib
+import struct
+import sys
+import tempfile
+import threading
+import typing
+import zlib
+
+import yaml
+
+from . import errors, serialize, types
+from .source_map import SourceMap
+
+TCachedSourceMap = typing.Mapping[str, types.Entry]
+# The file extension of source maps in a cache directory
+_SUFFIX = ".ysm"
+# The CRC-32 of the serialized source map at the end of each file in a cache
+# directory
+_CHECKSUM = struct.Struct("<I")
+
+
+@dataclasses.dataclass(frozen=True)
+class CacheStatistics:
+    """
+    The statistics of a cache.
+
+    Attrs:
+        hits: The number of source maps that were found in the cache.
+        misses: The number of source maps that were not found in the cache.
+        evictions: The number of source maps removed to make space for others.
+        entries: The number of source maps in the cache.
+        size: The number of bytes used by the source maps in the cache.
+
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size: int
+
+
+def _check_limit(name: str, limit: typing.Optional[int]) -> None:
+    """Check that a limit is None or a positive integer."""
+    if limit is None:
+        return
+    if not isinstance(limit, int) or isinstance(limit, bool) or limit < 1:
+        raise errors.InvalidInputError(
+            f"{name} must be a positive integer, got {limit!r}"
+        )
+
+
+def _checked(data: bytes) -> memoryview:
+    """Check the checksum at the end of a cached file and view the data before it."""
+    view = memoryview(data)
+    body = view[: len(view) - _CHECKSUM.size]
+    if len(view) < _CHECKSUM.size or _CHECKSUM.unpack_from(view, len(body))[
+        0
+    ] != zlib.crc32(body):
+        raise errors.InvalidInputError("cached file is corrupt")
+    return body
+
+
+def _version() -> str:
+    """Retrieve the version of the installed package."""
+    try:
+        return importlib.metadata.version("yaml_source_map")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _size(source_map: TCachedSourceMap) -> int:
+    """Calculate the number of bytes used by a source map including its entries."""
+    if isinstance(source_map, SourceMap):
+        return sys.getsizeof(source_map)
+    size = sys.getsizeof(source_map)
+    for pointer, entry in source_map.items():
+        size += sys.getsizeof(pointer) + sys.getsizeof(entry)
+        size += sum(
+            sys.getsizeof(location)
+            for location in (
+                entry.value_start,
+                entry.value_end,
+                entry.key_start,
+                entry.key_end,
+            )
+            if location is not None
+        )
+    return size
+
+
+class Cache:  # pylint: disable=too-many-instance-attributes
+    """
+    Least recently used cache of source maps keyed by a hash of the source.
+
+    The key is the SHA-256 hash of the source together with the options it was
+    calculated with, so the source itself is not kept alive by the cache. When the
+    number of source maps or the bytes they use exceed the limits, the least recently
+    used source maps are evicted. Source maps larger than the byte limit are not
+    cached. The cached source maps are read-only so that they can be shared between
+    callers and threads.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: typing.Optional[int] = 128,
+        max_bytes: typing.Optional[int] = None,
+    ) -> None:
+        """
+        Construct.
+
+        Args:
+            max_entries: The largest number of source maps in the cache, unlimited if
+                None.
+            max_bytes: The largest number of bytes used by the source maps in the
+                cache, unlimited if None.
+
+        """
+        _check_limit("max_entries", max_entries)
+        _check_limit("max_bytes", max_bytes)
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._source_maps: (
+            "collections.OrderedDict[str, typing.Tuple[TCachedSourceMap, int]]"
+        ) = collections.OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(source: str, options: typing.Mapping[str, typing.Any]) -> str:
+        """
+        Calculate the key of a source and the options it is calculated with.
+
+        Args:
+            source: The YAML document.
+            options: The arguments of calculate other than the source.
+
+        Returns:
+            The hexadecimal SHA-256 hash of the source and the options.
+
+        """
+        digest = hashlib.sha256(source.encode("utf-8", "surrogatepass"))
+        digest.update(repr(sorted(options.items())).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> typing.Optional[TCachedSourceMap]:
+        """
+        Retrieve a source map and mark it as the most recently used.
+
+        Args:
+            key: The key of the source map.
+
+        Returns:
+            The source map or None if it is not in the cache.
+
+        """
+        with self._lock:
+            cached = self._source_maps.get(key)
+            if cached is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._source_maps.move_to_end(key)
+            return cached[0]
+
+    def put(self, key: str, source_map: TCachedSourceMap) -> None:
+        """
+        Store a source map and evict the least recently used ones over the limits.
+
+        Args:
+            key: The key of the source map.
+            source_map: The read-only source map.
+
+        """
+        size = _size(source_map)
+        if self._max_bytes is not None and size > self._max_bytes:
+            return
+
+        with self._lock:
+            previous = self._source_maps.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._source_maps[key] = (source_map, size)
+            self._size += size
+            while (
+                self._max_entries is not None
+                and len(self._source_maps) > self._max_entries
+            ) or (self._max_bytes is not None and self._size > self._max_bytes):
+                _, (_, evicted_size) = self._source_maps.popitem(last=False)
+                self._size -= evicted_size
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """Remove all source maps, the statistics are kept."""
+        with self._lock:
+            self._source_maps.clear()
+            self._size = 0
+
+    @property
+    def statistics(self) -> CacheStatistics:
+        """The hits, misses and evictions so far and the current contents."""
+        with self._lock:
+            return CacheStatistics(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._source_maps),
+                size=self._size,
+            )
+
+    def __len__(self) -> int:
+        """Return the number of source maps in the cache."""
+        return len(self._source_maps)
+
+
+class DiskCache:
+    """
+    Cache of compact source maps stored as files in a directory.
+
+    The file name is the SHA-256 hash of the source, the options and the versions of
+    the package, PyYAML and the serialization format, so that the directory can be
+    shared across restarts and between processes. Each source map is written to a
+    temporary file which then replaces the cached file so that readers never see a
+    partially written file. A checksum of each file is checked when it is read, so
+    that corrupt files are calculated again rather than returned. When the files
+    exceed max_bytes, the least recently used ones are removed. Source maps are
+    stored in the compact format and dictionaries are created from them when they
+    are retrieved.
+
+    """
+
+    def __init__(
+        self,
+        directory: typing.Union[str, "os.PathLike[str]"],
+        *,
+        max_bytes: typing.Optional[int] = None,
+    ) -> None:
+        """
+        Construct.
+
+        Args:
+            directory: The directory of the cached files, created if it does not
+                exist.
+            max_bytes: The largest number of bytes used by the files in the
+                directory, unlimited if None.
+
+        """
+        _check_limit("max_bytes", max_bytes)
+        self._directory = pathlib.Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> pathlib.Path:
+        """The directory of the cached files."""
+        return self._directory
+
+    @staticmethod
+    def key(source: str, options: typing.Mapping[str, typing.Any]) -> str:
+        """
+        Calculate the key of a source and the options it is calculated with.
+
+        Args:
+            source: The YAML document.
+            options: The arguments of calculate other than the source.
+
+        Returns:
+            The hexadecimal SHA-256 hash of the source, the options and the versions.
+
+        """
+        return Cache.key(
+            source,
+            {
+                **options,
+                "versions": (_version(), yaml.__version__, serialize.FORMAT_VERSION),
+            },
+        )
+
+    def _path(self, key: str) -> pathlib.Path:
+        """Calculate the path of the file of a key."""
+        return self._directory / f"{key}{_SUFFIX}"
+
+    def _files(self) -> typing.List[typing.Tuple[float, int, pathlib.Path]]:
+        """List the modification time, size and path of each cached file."""
+        files = []
+        for path in self._directory.glob(f"*{_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def get(self, key: str) -> typing.Optional[SourceMap]:
+        """
+        Read a source map and mark it as the most recently used.
+
+        Args:
+            key: The key of the source map.
+
+        Returns:
+            The source map or None if it is not in the cache or cannot be read.
+
+        """
+        path = self._path(key)
+        try:
+            source_map = serialize.loads(_checked(path.read_bytes()))
+            os.utime(path)
+        except (OSError, errors.InvalidInputError):
+            with self._lock:
+                self._misses += 1
+            return None
+        with self._lock:
+            self._hits += 1
+        return source_map
+
+    def put(self, key: str, source_map: TCachedSourceMap) -> None:
+        """
+        Write a source map and remove the least recently used ones over the limit.
+
+        Args:
+            key: The key of the source map.
+            source_map: The compact source map.
+
+        """
+        if not isinstance(source_map, SourceMap):
+            raise errors.InvalidInputError(
+                f"source_map must be a SourceMap, got {type(source_map)}"
+            )
+        data = serialize.dumps(source_map)
+        data += _CHECKSUM.pack(zlib.crc32(data))
+        if self._max_bytes is not None and len(data) > self._max_bytes:
+            return
+
+        descriptor, temporary = tempfile.mkstemp(
+            dir=self._directory, prefix=".", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+            os.replace(temporary, self._path(key))
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+        if self._max_bytes is not None:
+            self._prune(self._max_bytes)
+
+    def _prune(self, max_bytes: int) -> None:
+        """Remove the least recently used files until they fit in max_bytes."""
+        files = sorted(self._files(), reverse=True)
+        size = sum(file_size for _, file_size, _ in files)
+        while files and size > max_bytes:
+            _, file_size, path = files.pop()
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                # Removed by another process
+                pass
+            else:
+                with self._lock:
+                    self._evictions += 1
+            size -= file_size
+
+    def clear(self) -> None:
+        """Remove all cached files, the statistics are kept."""
+        for _, _, path in self._files():
+            path.unlink(missing_ok=True)
+
+    @property
+    def statistics(self) -> CacheStatistics:
+        """The hits, misses and evictions of this instance and the files."""
+        files = self._files()
+        with self._lock:
+            return CacheStatistics(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(files),
+                size=sum(file_size for _, file_size, _ in files),
+            )
+
+    def __len__(self) -> int:
+        """Return the number of cached files."""
+        return len(self._files())
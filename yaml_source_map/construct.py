@@ -0,0 +1,220 @@
+"""Construct the value of a YAML document from the tokens of its source map."""
+
+import collections
+import dataclasses
+import typing
+
+import yaml
+from yaml import constructor, resolver
+
+from . import errors, types
+from .source_map import SourceMap
+
+_MAPPING_TAG = resolver.BaseResolver.DEFAULT_MAPPING_TAG
+_SEQUENCE_TAG = resolver.BaseResolver.DEFAULT_SEQUENCE_TAG
+# The node, tag and flow style of each token that starts a mapping or sequence
+_COLLECTION_START = {
+    yaml.BlockMappingStartToken: (yaml.MappingNode, _MAPPING_TAG, False),
+    yaml.FlowMappingStartToken: (yaml.MappingNode, _MAPPING_TAG, True),
+    yaml.BlockSequenceStartToken: (yaml.SequenceNode, _SEQUENCE_TAG, False),
+    yaml.FlowSequenceStartToken: (yaml.SequenceNode, _SEQUENCE_TAG, True),
+}
+_COLLECTION_END = frozenset(
+    (yaml.FlowMappingEndToken, yaml.FlowSequenceEndToken, yaml.BlockEndToken)
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class LoadResult:
+    """
+    The value of a YAML document and its source map calculated by safe_load.
+
+    Attrs:
+        value: The value constructed the same way as by yaml.safe_load.
+        source_map: The source map.
+        objects: The constructed object of each value in the source map by its JSON
+            pointer, the same objects that are nested in value.
+
+    """
+
+    value: typing.Any
+    source_map: typing.Union[types.TSourceMap, SourceMap]
+    objects: typing.Dict[str, typing.Any]
+
+
+_NodeT = typing.TypeVar("_NodeT", bound=yaml.Node)
+
+
+@dataclasses.dataclass
+class _Collection:
+    """
+    A mapping or sequence node whose end has not been reached yet.
+
+    Attrs:
+        node: The node of the mapping or sequence.
+        key: The key node of a mapping whose value has not been reached yet.
+
+    """
+
+    node: typing.Union[yaml.MappingNode, yaml.SequenceNode]
+    key: typing.Optional[yaml.Node] = None
+
+
+class Builder:  # pylint: disable=too-many-instance-attributes
+    """
+    Source of YAML tokens that composes the nodes of the document from its tokens.
+
+    The tokens are composed into the same nodes as the PyYAML composer creates, so
+    that the value is constructed by the PyYAML safe constructor without scanning the
+    source again. An alias is the node of its anchor, so the anchored value is
+    constructed once and shared rather than expanded.
+
+    """
+
+    def __init__(self, loader: types.TLoader) -> None:
+        """
+        Construct.
+
+        Args:
+            loader: Source of YAML tokens.
+
+        """
+        self._loader = loader
+        self._resolver = resolver.Resolver()
+        self._stack: typing.List[_Collection] = []
+        self._root: typing.Optional[yaml.Node] = None
+        self._last: typing.Optional[yaml.Node] = None
+        self._nodes: typing.Dict[str, yaml.Node] = {}
+        self._anchors: typing.Dict[str, yaml.Node] = {}
+        # The anchor of the next node
+        self._anchor: typing.Optional[yaml.AnchorToken] = None
+
+    def peek_token(self) -> yaml.Token:
+        """Retrieve the next token without consuming it."""
+        return self._loader.peek_token()
+
+    def get_token(self) -> yaml.Token:
+        """Retrieve and consume the next token and compose it."""
+        token = self._loader.get_token()
+        # Every token passes through here, so it is dispatched on its exact type
+        token_type = type(token)
+        if token_type is yaml.ScalarToken:
+            self._add(
+                self._anchored(
+                    yaml.ScalarNode(
+                        self._resolver.resolve(
+                            yaml.ScalarNode, token.value, (token.plain, not token.plain)
+                        ),
+                        token.value,
+                        token.start_mark,
+                        token.end_mark,
+                        token.style,
+                    )
+                )
+            )
+        elif token_type in _COLLECTION_START:
+            node_type, tag, flow_style = _COLLECTION_START[token_type]
+            self._stack.append(
+                _Collection(
+                    self._anchored(
+                        node_type(
+                            tag,
+                            [],
+                            token.start_mark,
+                            None,
+                            flow_style,
+                        )
+                    )
+                )
+            )
+        elif token_type in _COLLECTION_END:
+            node = self._stack.pop().node
+            node.end_mark = token.end_mark
+            self._add(node)
+        elif token_type is yaml.AnchorToken:
+            self._anchor = token
+        elif token_type is yaml.AliasToken:
+            if token.value not in self._anchors:
+                raise errors.InvalidYamlError(f"found undefined alias {token.value}")
+            self._add(self._anchors[token.value])
+        return token
+
+    def _anchored(self, node: _NodeT) -> _NodeT:
+        """Register a node that has just been started with its anchor, if any."""
+        if self._anchor is not None:
+            node.start_mark = self._anchor.start_mark
+            self._anchors[self._anchor.value] = node
+            self._anchor = None
+        return node
+
+    def _add(self, node: yaml.Node) -> None:
+        """Add a complete node to the mapping or sequence that contains it."""
+        self._last = node
+        if not self._stack:
+            self._root = node
+            return
+
+        collection = self._stack[-1]
+        if isinstance(collection.node, yaml.SequenceNode):
+            collection.node.value.append(node)
+        elif collection.key is None:
+            collection.key = node
+        else:
+            collection.node.value.append((collection.key, node))
+            collection.key = None
+
+    def record(self, marks: types.TIndexedMarks) -> types.TIndexedMarks:
+        """
+        Record the node of each value whose marks are retrieved.
+
+        The marks of a value are yielded right after its last token has been consumed,
+        so the node of the value is the last node that was completed.
+
+        Args:
+            marks: The marks of the values calculated from the tokens of the builder,
+                see handle.walk.
+
+        Returns:
+            The same marks.
+
+        """
+        for value_marks in marks:
+            self._nodes[value_marks[1]] = self._last
+            yield value_marks
+
+    def construct(self) -> typing.Tuple[typing.Any, typing.Dict[str, typing.Any]]:
+        """
+        Construct the value of the document once all its tokens have been consumed.
+
+        Returns:
+            The value and the constructed object of each recorded value by its JSON
+            pointer.
+
+        """
+        safe_constructor = constructor.SafeConstructor()
+        value = _construct(safe_constructor, self._root)
+        constructed = safe_constructor.constructed_objects
+        # Only the values merged into a mapping with << have not been constructed yet
+        objects = {
+            pointer: (
+                constructed[node]
+                if node in constructed
+                else _construct(safe_constructor, node)
+            )
+            for pointer, node in self._nodes.items()
+        }
+        return value, objects
+
+
+def _construct(
+    safe_constructor: constructor.SafeConstructor, node: yaml.Node
+) -> typing.Any:
+    """Construct the object of a node, reusing the objects constructed before."""
+    # Equivalent to construct_document without forgetting the constructed objects
+    data = safe_constructor.construct_object(node)
+    while safe_constructor.state_generators:
+        state_generators = safe_constructor.state_generators
+        safe_constructor.state_generators = []
+        for generator in state_generators:
+            collections.deque(generator, maxlen=0)
+    return data
@@ -0,0 +1,161 @@
+"""Export source maps in the shape of the json-source-map package."""
+
+import bisect
+import json
+import typing
+
+from . import types
+from .source_map import SourceMap
+
+_TLocationTuple = typing.Tuple[int, int, int]
+_TEntryTuple = typing.Tuple[
+    str,
+    _TLocationTuple,
+    _TLocationTuple,
+    typing.Optional[_TLocationTuple],
+    typing.Optional[_TLocationTuple],
+]
+# The position of the value start, value end, key start and key end
+_FIELDS = 4
+# The number of entries written to the file at once
+_CHUNK_SIZE = 1024
+_LOCATION_FORMAT = '{"line": %d, "column": %d, "pos": %d}'
+_VALUE_FORMAT = f'"value": {_LOCATION_FORMAT}, "valueEnd": {_LOCATION_FORMAT}'
+_ENTRY_FORMAT = f"{{{_VALUE_FORMAT}}}"
+_ENTRY_WITH_KEY_FORMAT = (
+    f'{{{_VALUE_FORMAT}, "key": {_LOCATION_FORMAT}, "keyEnd": {_LOCATION_FORMAT}}}'
+)
+
+
+def _location_tuple(
+    location: typing.Optional[types.Location],
+) -> typing.Optional[_TLocationTuple]:
+    """Convert a location to its line, column and position."""
+    if location is None:
+        return None
+    return location.line, location.column, location.position
+
+
+def _entry_tuples(
+    source_map: typing.Mapping[str, types.Entry],
+) -> typing.Iterator[_TEntryTuple]:
+    """
+    Iterate over the line, column and position of the locations of each entry.
+
+    The lines of a SourceMap are resolved directly from the positions and line starts
+    without creating its entries.
+
+    """
+    if not isinstance(source_map, SourceMap) or source_map.lines.byte_order_marks:
+        for pointer, entry in source_map.items():
+            yield (
+                pointer,
+                (
+                    entry.value_start.line,
+                    entry.value_start.column,
+                    entry.value_start.position,
+                ),
+                (
+                    entry.value_end.line,
+                    entry.value_end.column,
+                    entry.value_end.position,
+                ),
+                _location_tuple(entry.key_start),
+                _location_tuple(entry.key_end),
+            )
+        return
+
+    positions = source_map.positions
+    line_starts = source_map.lines.line_starts
+
+    def location(position: int) -> _TLocationTuple:
+        """Resolve the line and column of a position."""
+        line = bisect.bisect_right(line_starts, position) - 1
+        return line, position - line_starts[line], position
+
+    for pointer, index in source_map.indexes.items():
+        value_start, value_end, key_start, key_end = positions[
+            index * _FIELDS : (index + 1) * _FIELDS
+        ]
+        if key_start < 0:
+            yield pointer, location(value_start), location(value_end), None, None
+        else:
+            yield (
+                pointer,
+                location(value_start),
+                location(value_end),
+                location(key_start),
+                location(key_end),
+            )
+
+
+def _location_dict(location: _TLocationTuple) -> types.TLocationDict:
+    """Convert the line, column and position of a location to a dictionary."""
+    line, column, position = location
+    return {"line": line, "column": column, "pos": position}
+
+
+def to_json_source_map(
+    source_map: typing.Mapping[str, types.Entry],
+) -> typing.Dict[str, types.TEntryDict]:
+    """
+    Convert a source map to the dictionaries of the json-source-map package.
+
+    Args:
+        source_map: The source map returned by calculate.
+
+    Returns:
+        The value, valueEnd and, for values in a mapping, key and keyEnd locations
+        with their line, column and pos of each JSON pointer.
+
+    """
+    json_source_map: typing.Dict[str, types.TEntryDict] = {}
+    for pointer, value_start, value_end, key_start, key_end in _entry_tuples(
+        source_map
+    ):
+        entry: types.TEntryDict = {
+            "value": _location_dict(value_start),
+            "valueEnd": _location_dict(value_end),
+        }
+        if key_start is not None and key_end is not None:
+            entry["key"] = _location_dict(key_start)
+            entry["keyEnd"] = _location_dict(key_end)
+        json_source_map[pointer] = entry
+    return json_source_map
+
+
+def write_json(
+    source_map: typing.Mapping[str, types.Entry], file: typing.TextIO
+) -> None:
+    """
+    Write a source map as JSON in the shape of the json-source-map package.
+
+    The JSON is written in chunks of entries without creating the dictionaries of
+    to_json_source_map and is identical to passing them to json.dumps. To write to a
+    socket, use the file returned by its makefile method.
+
+    Args:
+        source_map: The source map returned by calculate.
+        file: The file opened for writing text.
+
+    """
+    chunk = []
+    separator = "{"
+    for pointer, value_start, value_end, key_start, key_end in _entry_tuples(
+        source_map
+    ):
+        if key_start is None or key_end is None:
+            entry = _ENTRY_FORMAT % (value_start + value_end)
+        else:
+            entry = _ENTRY_WITH_KEY_FORMAT % (
+                value_start + value_end + key_start + key_end
+            )
+        chunk.append(
+            f"{separator}{json.encoder.encode_basestring_ascii(pointer)}: {entry}"
+        )
+        separator = ", "
+        if len(chunk) == _CHUNK_SIZE:
+            file.write("".join(chunk))
+            chunk = []
+    chunk.append("}" if separator == ", " else "{}")
+    file.write("".join(chunk))
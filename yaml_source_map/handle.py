@@ -1,35 +1,250 @@
 """Calculate the YAML source map for a value."""
 
+import dataclasses
+import typing
+
 import yaml
 
 from yaml_source_map import errors
 
 from . import types
+from .selection import Selection
+
+_MAPPING_START = (yaml.FlowMappingStartToken, yaml.BlockMappingStartToken)
+_MAPPING_END = (yaml.FlowMappingEndToken, yaml.BlockEndToken)
+_SEQUENCE_START = (yaml.FlowSequenceStartToken, yaml.BlockSequenceStartToken)
+_SEQUENCE_END = (yaml.FlowSequenceEndToken, yaml.BlockEndToken)
+_DOCUMENT_END = (yaml.DocumentEndToken, yaml.StreamEndToken)
+_BETWEEN_DOCUMENTS = (yaml.DirectiveToken, yaml.DocumentEndToken)
+_EMPTY_DOCUMENT = _BETWEEN_DOCUMENTS + (yaml.DocumentStartToken, yaml.StreamEndToken)
+_MAPPING_STOP = _MAPPING_END + _DOCUMENT_END
+_SEQUENCE_STOP = _SEQUENCE_END + _DOCUMENT_END
+_COLLECTION_START = _MAPPING_START + _SEQUENCE_START
+_COLLECTION_END = (
+    yaml.FlowMappingEndToken,
+    yaml.FlowSequenceEndToken,
+    yaml.BlockEndToken,
+)
+# The index of a value that is not selected
+_NOT_SELECTED = -1
+
+
+def entry(
+    value_start: types.TMark,
+    value_end: types.TMark,
+    key_start: typing.Optional[types.TMark],
+    key_end: typing.Optional[types.TMark],
+    anchor: typing.Optional[str] = None,
+) -> types.Entry:
+    """
+    Convert the marks of the tokens of a value to a source map entry.
 
+    Args:
+        value_start: The mark at the start of the value.
+        value_end: The mark at the end of the value.
+        key_start: The mark at the start of the key of the value.
+        key_end: The mark at the end of the key of the value.
+        anchor: The JSON pointer of the anchored value if the value is an alias.
+
+    Returns:
+        The source map entry.
 
-def value(*, loader: yaml.Loader) -> types.TSourceMapEntries:
+    """
+    if key_start is None or key_end is None:
+        return types.Entry(
+            value_start=types.Location(
+                value_start.line, value_start.column, value_start.index
+            ),
+            value_end=types.Location(value_end.line, value_end.column, value_end.index),
+            anchor=anchor,
+        )
+    return types.Entry(
+        value_start=types.Location(
+            value_start.line, value_start.column, value_start.index
+        ),
+        value_end=types.Location(value_end.line, value_end.column, value_end.index),
+        key_start=types.Location(key_start.line, key_start.column, key_start.index),
+        key_end=types.Location(key_end.line, key_end.column, key_end.index),
+        anchor=anchor,
+    )
+
+
+@dataclasses.dataclass
+class _Collection:  # pylint: disable=too-many-instance-attributes
+    """
+    A mapping or sequence whose end has not been reached yet.
+
+    Attrs:
+        is_mapping: Whether the collection is a mapping.
+        pointer: The JSON pointer to the collection.
+        index: The index of the entry of the collection in document order or -1 if
+            the collection is not selected.
+        value_start: The mark at the start of the collection.
+        key_start: The mark at the start of the key of the collection.
+        key_end: The mark at the end of the key of the collection.
+        length: The number of values in the collection so far.
+        limit: The number of values of the collection to calculate the source map
+            for, all if None.
+
+    """
+
+    is_mapping: bool
+    pointer: str
+    index: int
+    value_start: types.TMark
+    key_start: typing.Optional[types.TMark]
+    key_end: typing.Optional[types.TMark]
+    length: int = 0
+    limit: typing.Optional[int] = None
+
+
+def value(
+    *,
+    loader: types.TLoader,
+    selection: typing.Optional[Selection] = None,
+    max_depth: typing.Optional[int] = None,
+    max_items: typing.Optional[int] = None,
+) -> types.TSourceMapEntries:
     """
     Calculate the source map of any value.
 
     Args:
         loader: Source of YAML tokens.
+        selection: The values to calculate the source map for, all if None.
+        max_depth: The depth below which no values are included, see walk.
+        max_items: The number of values of each mapping and sequence that are
+            included, see walk.
 
     Returns:
         A list of JSON pointers and source map entries.
 
     """
-    if isinstance(
-        loader.peek_token(), (yaml.FlowSequenceStartToken, yaml.BlockSequenceStartToken)
-    ):
-        return sequence(loader=loader)
-    if isinstance(
-        loader.peek_token(), (yaml.FlowMappingStartToken, yaml.BlockMappingStartToken)
-    ):
-        return mapping(loader=loader)
-    return primitive(loader=loader)
+    aliases: typing.Dict[str, str] = {}
+    return entries(
+        walk(
+            loader=loader,
+            selection=selection,
+            max_depth=max_depth,
+            max_items=max_items,
+            aliases=aliases,
+        ),
+        aliases=aliases,
+    )
+
+
+def entries(
+    marks: types.TIndexedMarks,
+    *,
+    aliases: typing.Optional[typing.Mapping[str, str]] = None,
+) -> types.TSourceMapEntries:
+    """
+    Convert the marks of each value to source map entries in document order.
+
+    Args:
+        marks: The index in document order, the JSON pointer and the marks at the
+            start and end of the value and its key for each value, see walk.
+        aliases: The JSON pointer of the anchored value of each alias, filled by walk
+            while the marks are retrieved.
+
+    Returns:
+        A list of JSON pointers and source map entries.
+
+    """
+    source_map_entries: typing.List[typing.Any] = []
+    for index, pointer, value_start, value_end, key_start, key_end in marks:
+        # Reserve the entries of mappings and sequences that have not ended yet
+        if index >= len(source_map_entries):
+            source_map_entries.extend([None] * (index + 1 - len(source_map_entries)))
+        source_map_entries[index] = (
+            pointer,
+            entry(
+                value_start,
+                value_end,
+                key_start,
+                key_end,
+                aliases.get(pointer) if aliases else None,
+            ),
+        )
+    return source_map_entries
+
+
+def document_end(*, loader: types.TLoader) -> None:
+    """
+    Consume the end of the document and check that there is no other document.
+
+    Args:
+        loader: Source of YAML tokens.
+
+    """
+    while isinstance(loader.peek_token(), yaml.DocumentEndToken):
+        loader.get_token()
+    if not isinstance(loader.get_token(), yaml.StreamEndToken):
+        raise errors.InvalidInputError("source must contain a single document")
+
+
+def documents(
+    *,
+    loader: types.TLoader,
+    selection: typing.Optional[Selection] = None,
+    max_depth: typing.Optional[int] = None,
+    max_items: typing.Optional[int] = None,
+) -> typing.Iterator[typing.Tuple[types.TIndexedMarks, typing.Dict[str, str]]]:
+    """
+    Calculate the source map of each document of a stream one entry at a time.
+
+    The tokens between documents are consumed the same way as by the PyYAML parser:
+    directives and document end markers are skipped and a document start marker that
+    is not followed by a value starts an empty document, whose null value spans no
+    characters at the start of the next token. The marks of each document must be
+    consumed before the next document is retrieved.
+
+    Args:
+        loader: Source of YAML tokens whose stream start has been consumed.
+        selection: The values of each document to calculate the source map for, all
+            if None.
+        max_depth: The depth below which no values are included, see walk.
+        max_items: The number of values of each mapping and sequence that are
+            included, see walk.
 
+    Returns:
+        The marks of the values of each document and the JSON pointer of the anchored
+        value of each of its aliases, which is filled while the marks are retrieved,
+        see walk.
 
-def mapping(*, loader: yaml.Loader) -> types.TSourceMapEntries:
+    """
+    while True:
+        while isinstance(loader.peek_token(), _BETWEEN_DOCUMENTS):
+            loader.get_token()
+        token = loader.peek_token()
+        if isinstance(token, yaml.StreamEndToken):
+            loader.get_token()
+            return
+
+        if isinstance(token, yaml.DocumentStartToken):
+            loader.get_token()
+            token = loader.peek_token()
+            if isinstance(token, _EMPTY_DOCUMENT):
+                yield _empty_document(token.start_mark, selection=selection), {}
+                continue
+        aliases: typing.Dict[str, str] = {}
+        yield walk(
+            loader=loader,
+            selection=selection,
+            max_depth=max_depth,
+            max_items=max_items,
+            aliases=aliases,
+        ), aliases
+
+
+def _empty_document(
+    mark: types.TMark, *, selection: typing.Optional[Selection]
+) -> types.TIndexedMarks:
+    """Calculate the source map of an empty document."""
+    if selection is None or selection.match(""):
+        yield 0, "", mark, mark, None, None
+
+
+def mapping(*, loader: types.TLoader) -> types.TSourceMapEntries:
     """
     Calculate the source map of a mapping value.
 
@@ -40,167 +255,351 @@ def mapping(*, loader: yaml.Loader) -> types.TSourceMapEntries:
         A list of JSON pointers and source map entries.
 
     """
-    # Look for mapping start
-    token = loader.get_token()
-    if not isinstance(token, (yaml.FlowMappingStartToken, yaml.BlockMappingStartToken)):
+    token = loader.peek_token()
+    if not isinstance(token, _MAPPING_START):
         raise errors.InvalidYamlError(f"expected mapping start but received {token=}")
-    value_start = types.Location(
-        token.start_mark.line, token.start_mark.column, token.start_mark.index
-    )
+    return value(loader=loader)
 
-    # Handle values
-    entries: types.TSourceMapEntries = []
-    while not isinstance(
-        loader.peek_token(),
-        (
-            yaml.FlowMappingEndToken,
-            yaml.BlockEndToken,
-            yaml.DocumentEndToken,
-            yaml.StreamEndToken,
-        ),
-    ):
-        # Retrieve key
-        key_token = loader.get_token()
-        if not isinstance(key_token, yaml.KeyToken):
-            raise errors.InvalidYamlError(f"expected key but received {key_token=}")
-        key_value_token = loader.get_token()
-        assert isinstance(key_value_token, yaml.ScalarToken)
-        key_start = types.Location(
-            key_value_token.start_mark.line,
-            key_value_token.start_mark.column,
-            key_value_token.start_mark.index,
-        )
-        key_end = types.Location(
-            key_value_token.end_mark.line,
-            key_value_token.end_mark.column,
-            key_value_token.end_mark.index,
-        )
-        key_value = key_value_token.value
-
-        # Retrieve values
-        assert isinstance(loader.get_token(), yaml.ValueToken)
-        value_entries = iter(value(loader=loader))
-        value_entry = next(value_entries)
-
-        # Write pointers
-        entries.append(
-            (
-                f"/{key_value}",
-                types.Entry(
-                    value_start=value_entry[1].value_start,
-                    value_end=value_entry[1].value_end,
+
+def sequence(*, loader: types.TLoader) -> types.TSourceMapEntries:
+    """
+    Calculate the source map of a sequence value.
+
+    Args:
+        loader: Source of YAML tokens.
+
+    Returns:
+        A list of JSON pointers and source map entries.
+
+    """
+    token = loader.peek_token()
+    if not isinstance(token, _SEQUENCE_START):
+        raise errors.InvalidYamlError(f"expected sequence start but received {token=}")
+    return value(loader=loader)
+
+
+def primitive(*, loader: types.TLoader) -> types.TSourceMapEntries:
+    """
+    Calculate the source map of a primitive type.
+
+    Args:
+        loader: Source of YAML tokens.
+
+    Returns:
+        A list of JSON pointers and source map entries.
+
+    """
+    token = loader.peek_token()
+    if not isinstance(token, yaml.ScalarToken):
+        raise errors.InvalidYamlError(f"expected scalar but received {token=}")
+    return value(loader=loader)
+
+
+def walk(  # pylint: disable=too-many-branches,too-many-locals,too-many-statements
+    *,
+    loader: types.TLoader,
+    selection: typing.Optional[Selection] = None,
+    max_depth: typing.Optional[int] = None,
+    max_items: typing.Optional[int] = None,
+    aliases: typing.Optional[typing.Dict[str, str]] = None,
+) -> types.TIndexedMarks:
+    """
+    Calculate the source map of any value one entry at a time.
+
+    Each entry is yielded as soon as the tokens of its value have been consumed. The
+    entry of a mapping or sequence is therefore yielded after the entries of its
+    values. The index of each entry is its position in document order. Rather than
+    source map entries, the marks of the tokens are yielded so that the caller only
+    converts what it needs, entry converts them to a source map entry.
+
+    Mappings and sequences whose end has not been reached yet are kept on a stack
+    rather than handled recursively so that the depth of the value is not limited by
+    the recursion limit.
+
+    If a selection is passed, only the selected values are yielded and indexed. The
+    tokens of values that neither are selected nor contain selected values are
+    skipped without calculating the JSON pointers of their values.
+
+    Similarly, the tokens of the values of mappings and sequences beyond max_depth
+    and of any values after the first max_items of a mapping or sequence are skipped.
+    The entry of the mapping or sequence is still yielded with its full span.
+
+    An alias is a value of its own that spans the alias and whose entry is linked to
+    the JSON pointer of the anchored value rather than repeating the entries of the
+    anchored value, so that the work stays linear in the size of the source however
+    often aliases are nested. The span of an anchored value includes its anchor.
+
+    Args:
+        loader: Source of YAML tokens.
+        selection: The values to calculate the source map for, all if None.
+        max_depth: The depth of the most deeply nested values that are included with
+            0 being the document, all if None.
+        max_items: The number of values of each mapping and sequence that are
+            included, all if None.
+        aliases: Filled with the JSON pointer of the anchored value of each alias
+            that is yielded, unless the anchored value is not included.
+
+    Returns:
+        The index in document order, the JSON pointer and the marks at the start and
+        end of the value and its key for each value.
+
+    """
+    stack: typing.List[_Collection] = []
+    count = 0
+    pointer = ""
+    key_start: typing.Optional[types.TMark] = None
+    key_end: typing.Optional[types.TMark] = None
+    # The JSON pointer of the value of each anchor, None if it is not included
+    anchors: typing.Dict[str, typing.Optional[str]] = {}
+
+    while True:
+        # Start the next value
+        token = loader.get_token()
+        value_start = token.start_mark
+        anchor = None
+        if isinstance(token, yaml.AnchorToken):
+            anchor = token.value
+            anchors[anchor] = None
+            token = loader.get_token()
+
+        if selection is not None and not selection.may_contain(pointer):
+            _skip_value(loader=loader, token=token, anchors=anchors)
+            if stack:
+                _skip_flow_entry(loader=loader)
+        elif isinstance(token, yaml.ScalarToken):
+            if selection is None or selection.match(pointer):
+                if anchor is not None:
+                    anchors[anchor] = pointer
+                yield count, pointer, value_start, token.end_mark, key_start, key_end
+                count += 1
+            if stack:
+                _skip_flow_entry(loader=loader)
+        elif isinstance(token, yaml.AliasToken):
+            anchored = _anchored(token, anchors=anchors)
+            if selection is None or selection.match(pointer):
+                if anchored is not None and aliases is not None:
+                    aliases[pointer] = anchored
+                yield count, pointer, value_start, token.end_mark, key_start, key_end
+                count += 1
+            # An alias is never the document since no anchor is defined before it
+            _skip_flow_entry(loader=loader)
+        elif isinstance(token, _COLLECTION_START):
+            selected = selection is None or selection.match(pointer)
+            if anchor is not None and selected:
+                anchors[anchor] = pointer
+            stack.append(
+                _Collection(
+                    is_mapping=isinstance(token, _MAPPING_START),
+                    pointer=pointer,
+                    index=count if selected else _NOT_SELECTED,
+                    value_start=value_start,
                     key_start=key_start,
                     key_end=key_end,
-                ),
+                    limit=(
+                        0
+                        if max_depth is not None and len(stack) >= max_depth
+                        else max_items
+                    ),
+                )
             )
+            if selected:
+                count += 1
+        else:
+            raise errors.InvalidYamlError(f"expected value but received {token=}")
+
+        # Finish collections until the next value is found
+        while stack:
+            collection = stack[-1]
+            token = loader.peek_token()
+
+            if not isinstance(
+                token, _MAPPING_STOP if collection.is_mapping else _SEQUENCE_STOP
+            ):
+                if (
+                    collection.limit is not None
+                    and collection.length >= collection.limit
+                ):
+                    _skip_item(loader=loader, collection=collection, anchors=anchors)
+                    continue
+
+                if collection.is_mapping:
+                    key, key_start, key_end = _key(loader=loader, anchors=anchors)
+                    pointer = f"{collection.pointer}/{key}"
+                else:
+                    # Skip block entry
+                    if isinstance(token, yaml.BlockEntryToken):
+                        loader.get_token()
+                    pointer = f"{collection.pointer}/{collection.length}"
+                    key_start = None
+                    key_end = None
+                collection.length += 1
+                break
+
+            stack.pop()
+            value_end = _finish(loader=loader, collection=collection)
+            if collection.index != _NOT_SELECTED:
+                yield (
+                    collection.index,
+                    collection.pointer,
+                    collection.value_start,
+                    value_end,
+                    collection.key_start,
+                    collection.key_end,
+                )
+
+            if stack:
+                _skip_flow_entry(loader=loader)
+        else:
+            return
+
+
+def _key(
+    *, loader: types.TLoader, anchors: typing.Dict[str, typing.Optional[str]]
+) -> typing.Tuple[str, types.TMark, types.TMark]:
+    """
+    Consume the key of the next value of a mapping.
+
+    Args:
+        loader: Source of YAML tokens.
+        anchors: The JSON pointer of the value of each anchor, keys have none.
+
+    Returns:
+        The key and the marks at its start, including its anchor, and its end.
+
+    """
+    key_token = loader.get_token()
+    if not isinstance(key_token, yaml.KeyToken):
+        raise errors.InvalidYamlError(f"expected key but received {key_token=}")
+    key_value_token = loader.get_token()
+    key_start = key_value_token.start_mark
+    if isinstance(key_value_token, yaml.AnchorToken):
+        anchors[key_value_token.value] = None
+        key_value_token = loader.get_token()
+    if not isinstance(key_value_token, yaml.ScalarToken):
+        raise errors.InvalidYamlError(
+            f"expected scalar key but received {key_value_token=}"
         )
-        entries.extend(
-            (f"/{key_value}{pointer}", entry) for pointer, entry in value_entries
-        )
+    assert isinstance(loader.get_token(), yaml.ValueToken)
+    return key_value_token.value, key_start, key_value_token.end_mark
 
-        # Skip flow entry
-        if isinstance(loader.peek_token(), (yaml.FlowEntryToken)):
-            loader.get_token()
 
-    # Look for mapping end
-    token = loader.get_token()
-    if not isinstance(token, (yaml.FlowMappingEndToken, yaml.BlockEndToken)):
-        raise errors.InvalidYamlError(f"expected mapping end but received {token=}")
-    value_end = types.Location(
-        token.end_mark.line, token.end_mark.column, token.end_mark.index
-    )
+def _anchored(
+    token: yaml.AliasToken, *, anchors: typing.Dict[str, typing.Optional[str]]
+) -> typing.Optional[str]:
+    """
+    Find the JSON pointer of the anchored value of an alias.
+
+    Args:
+        token: The token of the alias.
+        anchors: The JSON pointer of the value of each anchor.
 
-    return [("", types.Entry(value_start=value_start, value_end=value_end))] + entries
+    Returns:
+        The JSON pointer or None if the anchored value is not included.
 
+    """
+    if token.value not in anchors:
+        raise errors.InvalidYamlError(f"found undefined alias {token.value}")
+    return anchors[token.value]
 
-def sequence(*, loader: yaml.Loader) -> types.TSourceMapEntries:
+
+def _finish(*, loader: types.TLoader, collection: _Collection) -> types.TMark:
     """
-    Calculate the source map of a sequence value.
+    Consume the end of a mapping or sequence.
 
     Args:
         loader: Source of YAML tokens.
+        collection: The mapping or sequence.
 
     Returns:
-        A list of JSON pointers and source map entries.
+        The mark at the end of the mapping or sequence.
 
     """
-    # Look for sequence start
     token = loader.get_token()
-    if not isinstance(
-        token, (yaml.FlowSequenceStartToken, yaml.BlockSequenceStartToken)
-    ):
-        raise errors.InvalidYamlError(f"expected sequence start but received {token=}")
-    value_start = types.Location(
-        token.start_mark.line, token.start_mark.column, token.start_mark.index
-    )
+    if collection.is_mapping and not isinstance(token, _MAPPING_END):
+        raise errors.InvalidYamlError(f"expected mapping end but received {token=}")
+    if not collection.is_mapping and not isinstance(token, _SEQUENCE_END):
+        raise errors.InvalidYamlError(f"expected sequence end but received {token=}")
 
-    # Handle values
-    sequence_index = 0
-    entries: types.TSourceMapEntries = []
-    while not isinstance(
-        loader.peek_token(),
-        (
-            yaml.FlowSequenceEndToken,
-            yaml.BlockEndToken,
-            yaml.DocumentEndToken,
-            yaml.StreamEndToken,
-        ),
-    ):
-        # Skip block entry
-        if isinstance(loader.peek_token(), yaml.BlockEntryToken):
-            loader.get_token()
+    return token.end_mark
 
-        # Retrieve values
-        value_entries = value(loader=loader)
-        entries.extend(
-            (f"/{sequence_index}{pointer}", entry) for pointer, entry in value_entries
-        )
-        sequence_index += 1
 
-        # Skip flow entry
-        if isinstance(loader.peek_token(), (yaml.FlowEntryToken)):
-            loader.get_token()
+def _skip_flow_entry(*, loader: types.TLoader) -> None:
+    """Consume the separator before the next value of a flow collection."""
+    if isinstance(loader.peek_token(), yaml.FlowEntryToken):
+        loader.get_token()
 
-    # Look for sequence end
-    token = loader.get_token()
-    if not isinstance(token, (yaml.FlowSequenceEndToken, yaml.BlockEndToken)):
-        raise errors.InvalidYamlError(f"expected sequence end but received {token=}")
-    value_end = types.Location(
-        token.end_mark.line, token.end_mark.column, token.end_mark.index
-    )
 
-    return [("", types.Entry(value_start=value_start, value_end=value_end))] + entries
+def _skip_item(
+    *,
+    loader: types.TLoader,
+    collection: _Collection,
+    anchors: typing.Dict[str, typing.Optional[str]],
+) -> None:
+    """
+    Consume the tokens of the next value of a mapping or sequence and its key.
 
+    Args:
+        loader: Source of YAML tokens.
+        collection: The mapping or sequence.
+        anchors: The JSON pointer of the value of each anchor, the anchors of the
+            skipped values have none.
 
-def primitive(*, loader: yaml.Loader) -> types.TSourceMapEntries:
     """
-    Calculate the source map of a primitive type.
+    if collection.is_mapping:
+        _key(loader=loader, anchors=anchors)
+    elif isinstance(loader.peek_token(), yaml.BlockEntryToken):
+        loader.get_token()
+
+    token = loader.get_token()
+    if isinstance(token, yaml.AnchorToken):
+        anchors[token.value] = None
+        token = loader.get_token()
+    _skip_value(loader=loader, token=token, anchors=anchors)
+    _skip_flow_entry(loader=loader)
+
+
+def _skip_value(
+    *,
+    loader: types.TLoader,
+    token: yaml.Token,
+    anchors: typing.Dict[str, typing.Optional[str]],
+) -> None:
+    """
+    Consume the tokens of a value whose first token has been consumed.
 
     Args:
         loader: Source of YAML tokens.
+        token: The first token of the value after its anchor.
+        anchors: The JSON pointer of the value of each anchor, the anchors of the
+            skipped values have none.
+
+    """
+    if isinstance(token, yaml.AliasToken):
+        _anchored(token, anchors=anchors)
+    elif isinstance(token, _COLLECTION_START):
+        _skip(loader=loader, anchors=anchors)
 
-    Returns:
-        A list of JSON pointers and source map entries.
 
+def _skip(
+    *, loader: types.TLoader, anchors: typing.Dict[str, typing.Optional[str]]
+) -> None:
     """
-    token = loader.get_token()
-    if not isinstance(token, yaml.ScalarToken):
-        raise errors.InvalidYamlError(f"expected scalar but received {token=}")
+    Consume the tokens of a mapping or sequence whose start has been consumed.
 
-    return [
-        (
-            "",
-            types.Entry(
-                value_start=types.Location(
-                    token.start_mark.line,
-                    token.start_mark.column,
-                    token.start_mark.index,
-                ),
-                value_end=types.Location(
-                    token.end_mark.line,
-                    token.end_mark.column,
-                    token.end_mark.index,
-                ),
-            ),
-        )
-    ]
+    Args:
+        loader: Source of YAML tokens.
+        anchors: The JSON pointer of the value of each anchor, the anchors of the
+            skipped values have none.
+
+    """
+    depth = 1
+    while depth:
+        token = loader.get_token()
+        if isinstance(token, _COLLECTION_START):
+            depth += 1
+        elif isinstance(token, _COLLECTION_END):
+            depth -= 1
+        elif isinstance(token, yaml.AnchorToken):
+            anchors[token.value] = None
+        elif isinstance(token, yaml.AliasToken):
+            _anchored(token, anchors=anchors)
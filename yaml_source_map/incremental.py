@@ -0,0 +1,273 @@
+"""Recalculate the source map after the source has been edited."""
+
+import sys
+import typing
+
+from yaml import parser, reader, scanner
+
+from . import errors, handle, loader, types
+from .lines import LineIndex
+from .shifted import ShiftedArray
+from .source_map import SourceMap
+
+# The position of the value start, value end, key start and key end
+_FIELDS = 4
+# The first character of flow mappings and sequences
+_FLOW_START = "[{"
+# Not counted in the column by the PyYAML scanner
+_BYTE_ORDER_MARK = "\ufeff"
+
+
+def _calculate(source: str, *, engine: types.TEngine) -> SourceMap:
+    """Calculate the compact source map of a YAML document."""
+    token_loader = loader.create(source, engine=engine)
+    token_loader.get_token()
+    aliases: typing.Dict[str, str] = {}
+    source_map = SourceMap.from_indexed_marks(
+        handle.walk(loader=token_loader, aliases=aliases),
+        LineIndex.from_source(source),
+        aliases,
+    )
+    handle.document_end(loader=token_loader)
+    return source_map
+
+
+def _first_index(
+    positions: typing.Sequence[int], low: int, high: int, position: int
+) -> int:
+    """Find the first entry between low and high whose value starts at or after a position."""
+    while low < high:
+        middle = (low + high) // 2
+        if positions[middle * _FIELDS] < position:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def _containers(  # pylint: disable=too-many-locals
+    source_map: SourceMap, source: str, start: int, end: int
+) -> typing.List[int]:
+    """
+    Find the mappings and sequences whose values contain the replaced characters.
+
+    The value start of entries in document order never decreases. Any value that
+    contains the replaced characters therefore contains the last entry whose value
+    starts before them and its JSON pointer is a prefix of the JSON pointer of that
+    entry.
+
+    Only block mappings and sequences are returned since the tokens of flow mappings
+    and sequences depend on the indentation of the block they are in. A block mapping
+    or sequence ends at the next token, so that the indentation before the token on
+    its line is not part of the mapping or sequence.
+
+    Args:
+        source_map: The source map before the replacement.
+        source: The YAML document before the replacement.
+        start: The position of the first replaced character.
+        end: The position after the last replaced character.
+
+    Returns:
+        The index of each block mapping and sequence with at least one value that
+        contains the replaced characters but does not start or end with them,
+        innermost first.
+
+    """
+    positions = source_map.positions
+    lines = source_map.lines
+    count = len(source_map.pointers)
+    last = _first_index(positions, 0, count, start) - 1
+    if last < 0:
+        return []
+
+    pointer = source_map.pointers[last]
+    candidates = {pointer[:index] for index, char in enumerate(pointer) if char == "/"}
+    candidates.add(pointer)
+    containers = []
+    for candidate in candidates:
+        index = source_map.indexes.get(candidate)
+        if index is None:
+            continue
+        value_start = positions[index * _FIELDS]
+        value_end = positions[index * _FIELDS + 1]
+        line_start = lines.line_starts[lines.location(value_end).line]
+        if not source[line_start:value_end].strip(" \t"):
+            value_end = line_start
+        if (
+            source[value_start] not in _FLOW_START
+            and value_start < start
+            and end < value_end
+            and index + 1 < count
+            and positions[(index + 1) * _FIELDS] < value_end
+        ):
+            containers.append(index)
+    return sorted(containers, reverse=True)
+
+
+def _splice(  # pylint: disable=too-many-arguments,too-many-locals
+    source_map: SourceMap,
+    source: str,
+    *,
+    containers: typing.List[int],
+    start: int,
+    end: int,
+    length: int,
+    engine: types.TEngine,
+) -> typing.Optional[SourceMap]:
+    """
+    Recalculate the source map of the innermost mapping or sequence of an edit.
+
+    The source of the mapping or sequence is scanned on its own with the characters
+    before it on its first line replaced by spaces so that its indentation does not
+    change. If it is not valid on its own or no longer ends at the same place, the
+    structure of the document may have changed. If it contains aliases, their anchored
+    values may be anywhere in the document.
+
+    Args:
+        source_map: The source map before the edit.
+        source: The YAML document after the edit.
+        containers: The mappings and sequences containing the edit, innermost first.
+        start: The position of the first replaced character.
+        end: The position after the last replaced character.
+        length: The number of characters that replaced them.
+        engine: The engine that scans the source.
+
+    Returns:
+        The source map after the edit or None if the structure may have changed.
+
+    """
+    delta = length - (end - start)
+    positions = source_map.positions
+    pointers = source_map.pointers
+    index = containers[0]
+    value_start = positions[index * _FIELDS]
+    value_end = positions[index * _FIELDS + 1]
+    stop = _first_index(positions, index + 1, len(pointers), value_end)
+
+    lines = source_map.lines
+    padding = value_start - lines.line_starts[lines.location(value_start).line]
+    snippet = " " * padding + source[value_start : value_end + delta]
+    try:
+        snippet_map = _calculate(snippet, engine=engine)
+    except (
+        reader.ReaderError,
+        scanner.ScannerError,
+        parser.ParserError,
+        errors.BaseError,
+    ):
+        return None
+    snippet_positions = snippet_map.positions
+    if (
+        snippet_map.aliases
+        or len(snippet_map.pointers) < 2
+        or snippet_positions[0] != padding
+        or snippet_positions[1] != len(snippet)
+    ):
+        return None
+
+    offset = value_start - padding
+    new_positions = [
+        position + offset if position >= 0 else position
+        for position in snippet_positions
+    ]
+    # The key of the mapping or sequence is before the edit
+    new_positions[2] = positions[index * _FIELDS + 2]
+    new_positions[3] = positions[index * _FIELDS + 3]
+    new_positions_array = ShiftedArray.from_sequence(positions).splice(
+        index * _FIELDS,
+        stop * _FIELDS,
+        new_positions,
+        delta,
+        {
+            container * _FIELDS + 1: positions[container * _FIELDS + 1] + delta
+            for container in containers[1:]
+        },
+    )
+
+    container_pointer = pointers[index]
+    new_pointers = [
+        sys.intern(container_pointer + pointer) for pointer in snippet_map.pointers
+    ]
+    new_lines = lines.edit(source, start, end, length)
+    if list(pointers[index:stop]) == new_pointers:
+        return SourceMap(
+            pointers, new_positions_array, new_lines, indexes=source_map.indexes
+        )
+    return SourceMap(
+        list(pointers[:index]) + new_pointers + list(pointers[stop:]),
+        new_positions_array,
+        new_lines,
+    )
+
+
+def recalculate(  # pylint: disable=too-many-arguments
+    source_map: SourceMap,
+    source: str,
+    *,
+    start: int,
+    end: int,
+    text: str,
+    engine: types.TEngine = "auto",
+) -> SourceMap:
+    """
+    Recalculate a compact source map after some characters have been replaced.
+
+    Only the innermost mapping or sequence that contains the replaced characters is
+    scanned again. The positions after it are shifted lazily and the lines and columns
+    are resolved using the updated line index. If the replaced characters are not
+    within a mapping or sequence below the document, its structure may have changed or
+    the document contains aliases, the source map is calculated for the whole source.
+
+    Args:
+        source_map: The compact source map of the source before the replacement.
+        source: The YAML document before the replacement.
+        start: The position of the first replaced character.
+        end: The position after the last replaced character.
+        text: The characters that replace them.
+        engine: The engine that scans the source, see calculate.
+
+    Returns:
+        The compact source map of the source after the replacement.
+
+    """
+    if not isinstance(source_map, SourceMap):
+        raise errors.InvalidInputError(
+            f"source_map must be a SourceMap, got {type(source_map)}"
+        )
+    if not isinstance(source, str) or not isinstance(text, str):
+        raise errors.InvalidInputError("source and text must be strings")
+    if not 0 <= start <= end <= len(source):
+        raise errors.InvalidInputError(
+            f"start and end must be between 0 and {len(source)} in order, "
+            f"got {start} and {end}"
+        )
+    new_source = source[:start] + text + source[end:]
+    if not new_source:
+        raise errors.InvalidInputError("source must not be empty")
+
+    containers = _containers(source_map, source, start, end)
+    if (
+        containers
+        and containers[0] != 0
+        and not source_map.aliases
+        and _BYTE_ORDER_MARK not in source
+        and _BYTE_ORDER_MARK not in text
+    ):
+        new_source_map = _splice(
+            source_map,
+            new_source,
+            containers=containers,
+            start=start,
+            end=end,
+            length=len(text),
+            engine=engine,
+        )
+        if new_source_map is not None:
+            return new_source_map
+
+    try:
+        return _calculate(new_source, engine=engine)
+    except reader.ReaderError as error:
+        raise errors.InvalidYamlError(f"YAML is not valid: {error.reason}") from error
+    except (scanner.ScannerError, parser.ParserError) as error:
+        raise errors.InvalidInputError("YAML is not valid") from error
@@ -0,0 +1,185 @@
+"""Find the values of a source map at a position in the source."""
+
+import array
+import bisect
+import typing
+
+from . import errors, types
+from .source_map import SourceMap
+
+# Stored instead of the index of a missing entry
+_MISSING = -1
+
+
+def _spans(
+    source_map: typing.Mapping[str, types.Entry],
+) -> typing.Iterator[typing.Tuple[str, int, int]]:
+    """Retrieve the start and end position of each entry including its key."""
+    if isinstance(source_map, SourceMap):
+        yield from source_map.spans()
+        return
+
+    for pointer, entry in source_map.items():
+        start = entry.value_start.position
+        if entry.key_start is not None:
+            start = min(start, entry.key_start.position)
+        yield pointer, start, entry.value_end.position
+
+
+class PositionIndex:
+    """
+    Index of the spans of the values of a source map by their position.
+
+    The span of a value includes its key and excludes the position at its end. Spans
+    of values are either nested or do not overlap so that the innermost value at a
+    position only changes at the start and end of a span. Those boundaries are stored
+    in sorted order so that the innermost value at a position is found using binary
+    search. The spans are also stored in order of their start so that the values that
+    start in a range are found using binary search.
+
+    """
+
+    def __init__(self, source_map: typing.Mapping[str, types.Entry]) -> None:
+        """
+        Construct.
+
+        Args:
+            source_map: The source map to index.
+
+        """
+        # Sort the spans so that each value comes after the values it is nested in
+        spans = sorted(
+            _spans(source_map), key=lambda span: (span[1], -span[2], len(span[0]))
+        )
+        self._pointers = [pointer for pointer, _, _ in spans]
+        self._starts = array.array("q", (start for _, start, _ in spans))
+        self._ends = array.array("q", (end for _, _, end in spans))
+        self._parents = array.array("q")
+        self._boundaries = array.array("q")
+        self._innermost = array.array("q")
+
+        stack: typing.List[int] = []
+        for index, (_, start, end) in enumerate(spans):
+            while stack and self._ends[stack[-1]] <= start:
+                self._add_boundary(self._ends[stack.pop()], stack)
+            self._parents.append(stack[-1] if stack else _MISSING)
+            stack.append(index)
+            self._add_boundary(start, stack)
+        while stack:
+            self._add_boundary(self._ends[stack.pop()], stack)
+
+    def _add_boundary(self, position: int, stack: typing.List[int]) -> None:
+        """Record that the innermost value from the position is the top of the stack."""
+        innermost = stack[-1] if stack else _MISSING
+        if self._boundaries and self._boundaries[-1] == position:
+            self._innermost[-1] = innermost
+        else:
+            self._boundaries.append(position)
+            self._innermost.append(innermost)
+
+    def _innermost_index(self, position: int) -> int:
+        """Find the index of the innermost span that contains the position."""
+        boundary = bisect.bisect_right(self._boundaries, position) - 1
+        if boundary < 0:
+            return _MISSING
+        return self._innermost[boundary]
+
+    def lookup(self, position: int) -> typing.Optional[str]:
+        """
+        Find the JSON pointer of the innermost value at a position.
+
+        Args:
+            position: The number of characters before the location in the source.
+
+        Returns:
+            The JSON pointer or None if no value is at the position.
+
+        """
+        index = self._innermost_index(position)
+        if index == _MISSING:
+            return None
+        return self._pointers[index]
+
+    def ancestors(self, position: int) -> typing.List[str]:
+        """
+        Find the JSON pointers of all values at a position.
+
+        Args:
+            position: The number of characters before the location in the source.
+
+        Returns:
+            The JSON pointers starting with the outermost value and ending with the
+            innermost value.
+
+        """
+        pointers = []
+        index = self._innermost_index(position)
+        while index != _MISSING:
+            pointers.append(self._pointers[index])
+            index = self._parents[index]
+        pointers.reverse()
+        return pointers
+
+    def lookup_many(
+        self, positions: typing.Iterable[int]
+    ) -> typing.List[typing.Optional[str]]:
+        """
+        Find the JSON pointer of the innermost value at many positions.
+
+        Each position is searched for using binary search, so that the time taken is
+        logarithmic in the number of values for each position however few positions
+        there are.
+
+        Args:
+            positions: The positions in the source.
+
+        Returns:
+            The JSON pointer or None for each position in the order of the positions.
+
+        """
+        boundaries = self._boundaries
+        innermost = self._innermost
+        pointers: typing.List[typing.Optional[str]] = []
+        for position in positions:
+            boundary = bisect.bisect_right(boundaries, position) - 1
+            index = innermost[boundary] if boundary >= 0 else _MISSING
+            pointers.append(None if index == _MISSING else self._pointers[index])
+        return pointers
+
+    def overlapping(self, start: int, end: int) -> typing.List[str]:
+        """
+        Find the JSON pointers of all values whose span overlaps a range.
+
+        The values that start before the range and overlap it contain the start of the
+        range and are found by following the parents of the innermost value at the
+        start. The values that start in the range are adjacent in order of their
+        start. The time taken is therefore logarithmic in the number of values plus
+        the number of values that are returned.
+
+        Args:
+            start: The position at the start of the range.
+            end: The position after the end of the range.
+
+        Returns:
+            The JSON pointers in order of the start of their span.
+
+        """
+        if end < start:
+            raise errors.InvalidInputError(
+                f"end must not be before start {start}, got {end}"
+            )
+        if end == start:
+            return []
+
+        pointers = []
+        index = self._innermost_index(start)
+        while index != _MISSING:
+            if self._starts[index] < start:
+                pointers.append(self._pointers[index])
+            index = self._parents[index]
+        pointers.reverse()
+
+        first = bisect.bisect_left(self._starts, start)
+        last = bisect.bisect_left(self._starts, end)
+        pointers.extend(self._pointers[first:last])
+        return pointers
@@ -0,0 +1,288 @@
+"""Convert between character positions and lines and columns of a source."""
+
+import array
+import bisect
+import re
+import sys
+import typing
+
+from . import errors, types
+from .shifted import ShiftedArray
+
+# Line breaks as counted by the PyYAML scanner
+_LINE_BREAK = re.compile("\r\n|[\n\r\x85\u2028\u2029]")
+# Not counted in the column by the PyYAML scanner
+_BYTE_ORDER_MARK = "\ufeff"
+
+
+def _read_only_view(integers: typing.Sequence[int]) -> typing.Sequence[int]:
+    """View the integers of a typed array so that they cannot be changed."""
+    return memoryview(typing.cast("array.array[int]", integers)).toreadonly()
+
+
+class LineIndex:
+    """
+    The position at which each line of a source starts.
+
+    Resolves the line and column of a character position using binary search. Line
+    breaks and byte order marks are counted the same way as by the PyYAML scanner so
+    that the locations match those of calculate.
+
+    """
+
+    def __init__(
+        self,
+        line_starts: typing.Sequence[int],
+        length: int,
+        byte_order_marks: typing.Sequence[int] = (),
+        *,
+        read_only: bool = False,
+    ) -> None:
+        """
+        Construct.
+
+        Args:
+            line_starts: The position of the first character of each line.
+            length: The number of characters in the source.
+            byte_order_marks: The position of each byte order mark in the source.
+            read_only: Whether to copy the line starts and byte order marks so that
+                they cannot be changed through the properties.
+
+        """
+        self._line_starts: typing.Sequence[int] = line_starts
+        self._length = length
+        self._byte_order_marks: typing.Sequence[int] = byte_order_marks
+        self._read_only = read_only
+        if read_only:
+            self._line_starts = array.array("q", line_starts)
+            self._byte_order_marks = array.array("q", byte_order_marks)
+
+    @classmethod
+    def from_source(cls, source: str) -> "LineIndex":
+        """
+        Calculate the line index of a source.
+
+        Args:
+            source: The YAML document.
+
+        Returns:
+            The line index.
+
+        """
+        builder = LineIndexBuilder()
+        builder.add(source)
+        return builder.build()
+
+    def edit(self, source: str, start: int, end: int, length: int) -> "LineIndex":
+        """
+        Calculate the line index after characters of the source have been replaced.
+
+        Only the lines of the replaced characters are searched for line breaks, the
+        lines after them are shifted lazily.
+
+        Args:
+            source: The YAML document after the replacement.
+            start: The position of the first replaced character.
+            end: The position after the last replaced character.
+            length: The number of characters that replaced them.
+
+        Returns:
+            The line index of the source after the replacement.
+
+        """
+        if self._byte_order_marks or _BYTE_ORDER_MARK in source[start : start + length]:
+            return self.from_source(source)
+
+        line_starts = ShiftedArray.from_sequence(self._line_starts)
+        # A carriage return before the start could form a line break with the
+        # replacement
+        first = bisect.bisect_right(line_starts, max(start - 1, 0))
+        new_end = start + length
+        new_line_starts = [
+            match.end()
+            for match in _LINE_BREAK.finditer(
+                source, line_starts[first - 1], new_end + 1
+            )
+            if match.end() <= new_end
+        ]
+        stop = bisect.bisect_right(line_starts, end)
+        return LineIndex(
+            line_starts.splice(first, stop, new_line_starts, length - (end - start)),
+            self._length + length - (end - start),
+        )
+
+    def read_only(self) -> "LineIndex":
+        """
+        Copy the line index so that it cannot be changed, for example to share it.
+
+        Returns:
+            The line index whose line starts and byte order marks are read-only.
+
+        """
+        return LineIndex(
+            self._line_starts, self._length, self._byte_order_marks, read_only=True
+        )
+
+    @property
+    def line_starts(self) -> typing.Sequence[int]:
+        """The position of the first character of each line."""
+        if self._read_only:
+            return _read_only_view(self._line_starts)
+        return self._line_starts
+
+    @property
+    def length(self) -> int:
+        """The number of characters in the source."""
+        return self._length
+
+    @property
+    def byte_order_marks(self) -> typing.Sequence[int]:
+        """The position of each byte order mark in the source."""
+        if self._read_only:
+            return _read_only_view(self._byte_order_marks)
+        return self._byte_order_marks
+
+    def __len__(self) -> int:
+        """Return the number of lines."""
+        return len(self._line_starts)
+
+    def _byte_order_mark_count(self, start: int, end: int) -> int:
+        """Count the byte order marks from the start up to but excluding the end."""
+        return bisect.bisect_left(self._byte_order_marks, end) - bisect.bisect_left(
+            self._byte_order_marks, start
+        )
+
+    def location(self, position: int) -> types.Location:
+        """
+        Calculate the location of a character position.
+
+        Args:
+            position: The number of characters before the location in the source.
+
+        Returns:
+            The location.
+
+        """
+        if not 0 <= position <= self._length:
+            raise errors.InvalidInputError(
+                f"position must be between 0 and {self._length}, got {position}"
+            )
+        line = bisect.bisect_right(self._line_starts, position) - 1
+        line_start = self._line_starts[line]
+        column = position - line_start
+        if self._byte_order_marks:
+            column -= self._byte_order_mark_count(line_start, position)
+        return types.Location(line, column, position)
+
+    def position(self, line: int, column: int) -> int:
+        """
+        Calculate the character position of a line and column.
+
+        Args:
+            line: The number of new line characters before the location in the source.
+            column: The number of characters before the location in the source since
+                the last new line character.
+
+        Returns:
+            The number of characters before the location in the source.
+
+        """
+        if not 0 <= line < len(self._line_starts):
+            raise errors.InvalidInputError(
+                f"line must be between 0 and {len(self._line_starts) - 1}, got {line}"
+            )
+        if column < 0:
+            raise errors.InvalidInputError(f"column must not be negative, got {column}")
+        line_start = self._line_starts[line]
+        position = line_start + column
+        # Byte order marks before the column are not counted in the column
+        index = bisect.bisect_left(self._byte_order_marks, line_start)
+        while (
+            index < len(self._byte_order_marks)
+            and self._byte_order_marks[index] <= position
+        ):
+            position += 1
+            index += 1
+
+        line_end = (
+            self._line_starts[line + 1] - 1
+            if line + 1 < len(self._line_starts)
+            else self._length
+        )
+        if position > line_end:
+            raise errors.InvalidInputError(f"column {column} is not on line {line}")
+        return position
+
+    def span(self, first_line: int, last_line: int) -> typing.Tuple[int, int]:
+        """
+        Calculate the positions at the start and end of a range of lines.
+
+        Args:
+            first_line: The first line of the range.
+            last_line: The last line of the range.
+
+        Returns:
+            The position at the start of the first line and the position after the
+            line break at the end of the last line.
+
+        """
+        if not 0 <= first_line <= last_line < len(self._line_starts):
+            raise errors.InvalidInputError(
+                f"lines must be between 0 and {len(self._line_starts) - 1} in order, "
+                f"got {first_line} and {last_line}"
+            )
+        end = (
+            self._line_starts[last_line + 1]
+            if last_line + 1 < len(self._line_starts)
+            else self._length
+        )
+        return self._line_starts[first_line], end
+
+    def __sizeof__(self) -> int:
+        """Return the number of bytes used by the line index."""
+        return (
+            object.__sizeof__(self)
+            + sys.getsizeof(self._line_starts)
+            + sys.getsizeof(self._byte_order_marks)
+        )
+
+
+class LineIndexBuilder:
+    """Record the line index of a source that is read in chunks."""
+
+    def __init__(self) -> None:
+        """Construct."""
+        self._line_starts = array.array("q", [0])
+        self._byte_order_marks = array.array("q")
+        self._length = 0
+
+    def add(self, text: str) -> None:
+        """
+        Record the line breaks and byte order marks of the next chunk of the source.
+
+        Args:
+            text: The chunk, which must not end with a carriage return unless it is
+                the end of the source since it could be followed by a line feed.
+
+        """
+        offset = self._length
+        self._line_starts.extend(
+            offset + match.end() for match in _LINE_BREAK.finditer(text)
+        )
+        if _BYTE_ORDER_MARK in text:
+            self._byte_order_marks.extend(
+                offset + index
+                for index, char in enumerate(text)
+                if char == _BYTE_ORDER_MARK
+            )
+        self._length += len(text)
+
+    def build(self) -> LineIndex:
+        """
+        Create the line index of the chunks so far.
+
+        Returns:
+            The line index.
+
+        """
+        return LineIndex(self._line_starts, self._length, self._byte_order_marks)
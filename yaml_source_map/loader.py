@@ -0,0 +1,207 @@
+"""Create sources of YAML tokens for calculating the source map."""
+
+import collections
+import typing
+
+import yaml
+from yaml import error, parser, reader, scanner
+
+from . import errors, types
+from .lines import LineIndex
+
+# Characters that end a line according to the YAML specification
+_LINE_BREAKS = "\n\r\x85\u2028\u2029"
+_BYTE_ORDER_MARK = "\ufeff"
+
+
+class _Parser(reader.Reader, scanner.Scanner, parser.Parser):
+    """Parse YAML and record each token once the parser has accepted it."""
+
+    def __init__(self, source: typing.Union[str, types.TTextStream]) -> None:
+        """Construct."""
+        reader.Reader.__init__(self, source)
+        scanner.Scanner.__init__(self)
+        parser.Parser.__init__(self)
+        self.accepted_tokens: typing.Deque[yaml.Token] = collections.deque()
+
+    def get_token(self) -> yaml.Token:
+        """Retrieve the next token for the parser and record it."""
+        token = super().get_token()
+        self.accepted_tokens.append(token)
+        return token
+
+
+class PythonLoader:
+    """
+    Source of YAML tokens that have been validated by the pure Python parser.
+
+    The source is only scanned once. Tokens are released only after the parser has
+    accepted them so that invalid YAML raises the scanner or parser error before the
+    invalid token is handed out.
+
+    """
+
+    def __init__(self, source: typing.Union[str, types.TTextStream]) -> None:
+        """
+        Construct.
+
+        Args:
+            source: The YAML document or a stream that reads it in chunks.
+
+        """
+        self._parser = _Parser(source)
+        self._tokens = self._parser.accepted_tokens
+
+    def _fill(self) -> None:
+        """Advance the parser until a token has been accepted."""
+        while not self._tokens:
+            if self._parser.get_event() is None:
+                raise errors.InvalidYamlError("no more tokens in the source")
+
+    def peek_token(self) -> yaml.Token:
+        """Retrieve the next token without consuming it."""
+        if not self._tokens:
+            self._fill()
+        return self._tokens[0]
+
+    def get_token(self) -> yaml.Token:
+        """Retrieve and consume the next token."""
+        if not self._tokens:
+            self._fill()
+        return self._tokens.popleft()
+
+
+def _validate(source: str) -> None:
+    """Parse a source with libyaml to validate it without creating Python objects."""
+    try:
+        libyaml_loader = yaml.CLoader(source)
+    except UnicodeEncodeError as encode_error:
+        raise reader.ReaderError(
+            "<unicode string>",
+            encode_error.start,
+            ord(source[encode_error.start]),
+            "unicode",
+            "special characters are not allowed",
+        ) from encode_error
+    libyaml_loader.raw_parse()
+
+
+class LibyamlLoader:
+    """
+    Source of YAML tokens scanned by libyaml.
+
+    libyaml cannot hand out tokens and parse them at the same time, so the source is
+    read twice: the libyaml parser validates it first without creating any Python
+    objects, then it is scanned for tokens. The validation pass takes about 5% of the
+    time of calculating a source map. libyaml moves the tokens at the end of a source
+    without a final line break onto a new line, the marks of those tokens are
+    corrected to match the pure Python scanner. Characters that cannot be encoded,
+    such as lone surrogates, raise the same ReaderError as the pure Python reader.
+
+    """
+
+    def __init__(
+        self,
+        source: typing.Union[str, types.TTextStream],
+        *,
+        lines: typing.Optional[LineIndex] = None,
+    ) -> None:
+        """
+        Construct.
+
+        Args:
+            source: The YAML document or a stream that reads it in chunks.
+            lines: The line index of a source that has already been validated by the
+                libyaml parser, required for streams since they are only read once.
+
+        """
+        if lines is None:
+            if not isinstance(source, str):
+                raise errors.InvalidInputError("lines are required for a stream")
+            _validate(source)
+            self._length = len(source)
+            self._line_start = max(source.rfind(char) for char in _LINE_BREAKS) + 1
+        else:
+            self._length = lines.length
+            self._line_start = lines.line_starts[-1]
+        self._parser = yaml.CLoader(source)
+        self._end_mark: typing.Optional[error.Mark] = None
+
+    def _correct(self, token: yaml.Token) -> yaml.Token:
+        """Correct the marks of a token at the end of the source."""
+        # The source ends with a line break
+        if self._line_start == self._length:
+            return token
+
+        if self._end_mark is None:
+            self._end_mark = error.Mark(
+                token.start_mark.name,
+                self._length,
+                token.start_mark.line - 1,
+                self._length - self._line_start,
+                None,
+                None,
+            )
+        token.start_mark = token.end_mark = self._end_mark
+        return token
+
+    def peek_token(self) -> yaml.Token:
+        """Retrieve the next token without consuming it."""
+        token = self._parser.peek_token()
+        if token.start_mark.index == self._length:
+            return self._correct(token)
+        return token
+
+    def get_token(self) -> yaml.Token:
+        """Retrieve and consume the next token."""
+        token = self._parser.get_token()
+        if token.start_mark.index == self._length:
+            return self._correct(token)
+        return token
+
+
+def create(source: str, *, engine: types.TEngine = "auto") -> types.TLoader:
+    """
+    Create the source of YAML tokens for an engine.
+
+    Args:
+        source: The YAML document.
+        engine: The engine that scans the source. "libyaml" uses the libyaml bindings
+            of PyYAML, "python" uses the pure Python scanner and "auto" uses libyaml if
+            it is available and otherwise falls back to the pure Python scanner.
+            Sources with a byte order mark are always scanned by the pure Python
+            scanner because libyaml counts their positions and columns differently.
+
+    Returns:
+        The source of YAML tokens.
+
+    """
+    # libyaml does not count byte order marks the same way as PyYAML
+    if resolve(engine) == "libyaml" and _BYTE_ORDER_MARK not in source:
+        return LibyamlLoader(source)
+    return PythonLoader(source)
+
+
+def resolve(engine: types.TEngine) -> typing.Literal["libyaml", "python"]:
+    """
+    Resolve the engine that scans a source.
+
+    Args:
+        engine: The engine, "auto" uses libyaml if it is available and otherwise falls
+            back to the pure Python scanner.
+
+    Returns:
+        The engine that is available.
+
+    """
+    if engine == "auto":
+        return "libyaml" if yaml.__with_libyaml__ else "python"
+    if engine == "libyaml":
+        if not yaml.__with_libyaml__:
+            raise errors.InvalidInputError("libyaml is not available")
+        return engine
+    if engine == "python":
+        return engine
+    raise errors.InvalidInputError(
+        f"engine must be one of auto, libyaml or python, got {engine}"
+    )
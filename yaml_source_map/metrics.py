@@ -0,0 +1,271 @@
+"""Collect the timings and counters of calculating source maps when asked to."""
+
+import contextlib
+import contextvars
+import dataclasses
+import time
+import typing
+
+import yaml
+
+from . import types
+
+_COLLECTION_START = frozenset(
+    (
+        yaml.BlockMappingStartToken,
+        yaml.BlockSequenceStartToken,
+        yaml.FlowMappingStartToken,
+        yaml.FlowSequenceStartToken,
+    )
+)
+_COLLECTION_END = frozenset(
+    (yaml.BlockEndToken, yaml.FlowMappingEndToken, yaml.FlowSequenceEndToken)
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class Metrics:  # pylint: disable=too-many-instance-attributes
+    """
+    The time spent in each phase and the counters of calculating a source map.
+
+    libyaml validates the YAML syntax with its parser before the source is tokenized,
+    the pure Python scanner validates it while the source is tokenized. Source maps
+    retrieved from a cache are not calculated and therefore not reported.
+
+    Attrs:
+        validate: The seconds spent checking the arguments, looking the source map up
+            in the cache and, for libyaml, validating the source.
+        tokenize: The seconds spent scanning and parsing the source into tokens.
+        walk: The seconds spent calculating the JSON pointers and marks of the values
+            from the tokens.
+        build: The seconds spent creating the entries, the line index and the source
+            map from the marks.
+        tokens: The number of tokens of the source.
+        entries: The number of entries of the source map.
+        max_depth: The deepest nesting of mappings and sequences of the source.
+        bytes: The size of the source encoded as UTF-8.
+
+    """
+
+    validate: float
+    tokenize: float
+    walk: float
+    build: float
+    tokens: int
+    entries: int
+    max_depth: int
+    bytes: int
+
+
+TCallback = typing.Callable[[Metrics], None]
+_CALLBACK: contextvars.ContextVar[typing.Optional[TCallback]] = contextvars.ContextVar(
+    "yaml_source_map_metrics", default=None
+)
+
+
+@contextlib.contextmanager
+def collect_metrics(
+    callback: typing.Optional[TCallback] = None,
+) -> typing.Iterator[typing.List[Metrics]]:
+    """
+    Collect the metrics of each source map calculated by calculate in the context.
+
+    The collector is stored in a context variable, so it applies to the current
+    thread and to the asyncio tasks created within the context but not to other
+    threads or processes. Collectors that are nested all receive the metrics.
+    Nothing is measured while no collector is active, and nothing is reported for
+    source maps retrieved from a cache.
+
+    Args:
+        callback: Called with the metrics of each source map as soon as it has been
+            calculated, for example to export them to a metrics system.
+
+    Returns:
+        The metrics of each source map calculated so far in calculation order.
+
+    """
+    collected: typing.List[Metrics] = []
+    outer = _CALLBACK.get()
+
+    def collect(metrics: Metrics) -> None:
+        """Record the metrics and pass them on to the callbacks."""
+        collected.append(metrics)
+        if callback is not None:
+            callback(metrics)
+        if outer is not None:
+            outer(metrics)
+
+    token = _CALLBACK.set(collect)
+    try:
+        yield collected
+    finally:
+        _CALLBACK.reset(token)
+
+
+class _Loader:
+    """Source of YAML tokens that times and counts the tokens of another source."""
+
+    def __init__(self, loader: types.TLoader, recorder: "Recorder") -> None:
+        """
+        Construct.
+
+        Args:
+            loader: Source of YAML tokens.
+            recorder: Records the time and counters.
+
+        """
+        self._loader = loader
+        self._recorder = recorder
+
+    def peek_token(self) -> yaml.Token:
+        """Retrieve the next token without consuming it."""
+        start = time.perf_counter()
+        token = self._loader.peek_token()
+        self._recorder.tokenize += time.perf_counter() - start
+        return token
+
+    def get_token(self) -> yaml.Token:
+        """Retrieve and consume the next token."""
+        start = time.perf_counter()
+        token = self._loader.get_token()
+        self._recorder.tokenize += time.perf_counter() - start
+        self._recorder.count(token)
+        return token
+
+
+class Recorder:  # pylint: disable=too-many-instance-attributes
+    """
+    Records the timings and counters of calculating one source map.
+
+    The phases interleave since the values are walked while the source is
+    tokenized, so the time spent tokenizing and walking is accumulated separately
+    and subtracted from the phase that is timed around them.
+
+    """
+
+    def __init__(self, callback: TCallback, source: str) -> None:
+        """
+        Construct.
+
+        Args:
+            callback: Called with the metrics once the source map has been
+                calculated.
+            source: The YAML document.
+
+        """
+        self._callback = callback
+        self._source = source
+        self._seconds = dict.fromkeys(("validate", "tokenize", "walk", "build"), 0.0)
+        self._last = time.perf_counter()
+        # The time spent tokenizing and walking since the last lap
+        self.tokenize = 0.0
+        self._walk = 0.0
+        self._tokens = 0
+        self._depth = 0
+        self._max_depth = 0
+
+    def lap(self, phase: str) -> None:
+        """
+        Add the time since the last lap to a phase.
+
+        Args:
+            phase: The phase that ended, except for the time spent tokenizing and
+                walking.
+
+        """
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self._last = now
+        self._seconds[phase] += elapsed - self.tokenize - self._walk
+        self._seconds["tokenize"] += self.tokenize
+        self._seconds["walk"] += self._walk
+        self.tokenize = 0.0
+        self._walk = 0.0
+
+    def count(self, token: yaml.Token) -> None:
+        """
+        Count a consumed token and the depth of the mappings and sequences.
+
+        Args:
+            token: The token.
+
+        """
+        self._tokens += 1
+        token_type = type(token)
+        if token_type in _COLLECTION_START:
+            self._depth += 1
+            self._max_depth = max(self._max_depth, self._depth)
+        elif token_type in _COLLECTION_END:
+            self._depth -= 1
+
+    def loader(self, loader: types.TLoader) -> types.TLoader:
+        """
+        Time and count the tokens of a source of YAML tokens.
+
+        Args:
+            loader: Source of YAML tokens.
+
+        Returns:
+            The source of the same tokens.
+
+        """
+        return _Loader(loader, self)
+
+    def walk(self, marks: types.TIndexedMarks) -> types.TIndexedMarks:
+        """
+        Time the calculation of the marks of the values.
+
+        Args:
+            marks: The marks of the values, see handle.walk.
+
+        Returns:
+            The same marks.
+
+        """
+        iterator = iter(marks)
+        while True:
+            start = time.perf_counter()
+            tokenize = self.tokenize
+            value_marks = next(iterator, None)
+            self._walk += time.perf_counter() - start - (self.tokenize - tokenize)
+            if value_marks is None:
+                return
+            yield value_marks
+
+    def report(self, *, entries: int) -> None:
+        """
+        Pass the metrics to the callback once the source map has been calculated.
+
+        Args:
+            entries: The number of entries of the source map.
+
+        """
+        self._callback(
+            Metrics(
+                validate=self._seconds["validate"],
+                tokenize=self._seconds["tokenize"],
+                walk=self._seconds["walk"],
+                build=self._seconds["build"],
+                tokens=self._tokens,
+                entries=entries,
+                max_depth=self._max_depth,
+                bytes=len(self._source.encode("utf-8", "surrogatepass")),
+            )
+        )
+
+
+def record(source: str) -> typing.Optional[Recorder]:
+    """
+    Start recording the metrics of calculating a source map if they are collected.
+
+    Args:
+        source: The YAML document.
+
+    Returns:
+        The recorder, None if no metrics are collected in the current context.
+
+    """
+    callback = _CALLBACK.get()
+    if callback is None:
+        return None
+    return Recorder(callback, source)
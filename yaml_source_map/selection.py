@@ -0,0 +1,82 @@
+"""Select the values to calculate the source map for."""
+
+import fnmatch
+import re
+import typing
+
+# Characters that make a pattern a glob pattern rather than a JSON pointer
+_WILDCARDS = re.compile(r"[*?[]")
+
+
+class Selection:
+    """
+    The JSON pointers and glob patterns of the values to calculate the source map for.
+
+    Glob patterns are matched using fnmatch so that * also matches across /, for
+    example /paths/* matches every value nested in /paths. To skip the values nested
+    in a value without calculating their JSON pointers, whether any of them could
+    match is decided using the JSON pointer of the value only. For JSON pointers the
+    value has to be an ancestor and for glob patterns the value and the part of the
+    pattern before the first wildcard have to start the same way.
+
+    """
+
+    def __init__(self, patterns: typing.Iterable[str]) -> None:
+        """
+        Construct.
+
+        Args:
+            patterns: The JSON pointers and glob patterns.
+
+        """
+        self._pointers: typing.Set[str] = set()
+        # Every position of / in a JSON pointer could be the end of an ancestor
+        self._ancestors: typing.Set[str] = set()
+        self._prefixes: typing.List[str] = []
+        expressions: typing.List[str] = []
+
+        for pattern in patterns:
+            wildcard = _WILDCARDS.search(pattern)
+            if wildcard is None:
+                self._pointers.add(pattern)
+                self._ancestors.update(
+                    pattern[:index] for index, char in enumerate(pattern) if char == "/"
+                )
+            else:
+                self._prefixes.append(pattern[: wildcard.start()])
+                expressions.append(fnmatch.translate(pattern))
+
+        self._expression = re.compile("|".join(expressions)) if expressions else None
+
+    def match(self, pointer: str) -> bool:
+        """
+        Check whether the source map is calculated for a value.
+
+        Args:
+            pointer: The JSON pointer to the value.
+
+        Returns:
+            Whether the JSON pointer or any glob pattern matches.
+
+        """
+        if pointer in self._pointers:
+            return True
+        return self._expression is not None and bool(self._expression.match(pointer))
+
+    def may_contain(self, pointer: str) -> bool:
+        """
+        Check whether the source map could be calculated for a value or its values.
+
+        Args:
+            pointer: The JSON pointer to the value.
+
+        Returns:
+            False if neither the value nor the values nested in it can match.
+
+        """
+        if pointer in self._pointers or pointer in self._ancestors:
+            return True
+        return any(
+            pointer.startswith(prefix) or prefix.startswith(pointer)
+            for prefix in self._prefixes
+        )
@@ -0,0 +1,379 @@
+"""Convert compact source maps to and from a versioned binary format."""
+
+import array
+import collections.abc
+import copyreg
+import io
+import mmap
+import struct
+import sys
+import typing
+
+from . import errors
+from .lines import LineIndex
+from .source_map import SourceMap
+
+TBuffer = typing.Union[  # pylint: disable=invalid-name
+    bytes, bytearray, memoryview, mmap.mmap
+]
+
+# Identifies serialized source maps
+_MAGIC = b"YSMP"
+# Incremented whenever the layout changes
+FORMAT_VERSION = 3
+# The magic, format version, number of entries, number of bytes of the JSON pointers,
+# number of lines, number of characters in the source, number of byte order marks,
+# number of aliases and number of bytes of the JSON pointers of the aliases
+_HEADER = struct.Struct("<4sHxxqqqqqqq")
+_ITEM_SIZE = 8
+# The position of the value start, value end, key start and key end
+_FIELDS = 4
+
+
+def _to_bytes(values: typing.Iterable[int]) -> bytes:
+    """Convert integers to little-endian 64-bit integers."""
+    items = array.array("q", values)
+    if sys.byteorder == "big":  # pragma: no cover
+        items.byteswap()
+    return items.tobytes()
+
+
+def _integers(data: memoryview) -> typing.Sequence[int]:
+    """View little-endian 64-bit integers without copying them where possible."""
+    if sys.byteorder == "big":  # pragma: no cover
+        items = array.array("q", data.tobytes())
+        items.byteswap()
+        return items
+    return typing.cast(typing.Sequence[int], data.cast("q"))
+
+
+class _Pointers(typing.Sequence[str]):
+    """The JSON pointers of a serialized source map decoded when they are retrieved."""
+
+    def __init__(self, offsets: typing.Sequence[int], data: memoryview) -> None:
+        """
+        Construct.
+
+        Args:
+            offsets: The offset of each JSON pointer in the data followed by the end
+                of the last one.
+            data: The UTF-8 encoded JSON pointers.
+
+        """
+        self._offsets = offsets
+        self._data = data
+
+    def encoded(self, index: int) -> bytes:
+        """Retrieve the UTF-8 encoded JSON pointer of an entry."""
+        return bytes(self._data[self._offsets[index] : self._offsets[index + 1]])
+
+    @typing.overload
+    def __getitem__(self, index: int) -> str:
+        """Retrieve a JSON pointer."""
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> typing.List[str]:
+        """Retrieve a range of JSON pointers."""
+
+    def __getitem__(
+        self, index: typing.Union[int, slice]
+    ) -> typing.Union[str, typing.List[str]]:
+        """Decode a JSON pointer or a range of JSON pointers."""
+        if isinstance(index, slice):
+            return [self[item] for item in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return str(self.encoded(index), "utf-8", "surrogatepass")
+
+    def __len__(self) -> int:
+        """Return the number of JSON pointers."""
+        return len(self._offsets) - 1
+
+
+class _IndexItems(collections.abc.ItemsView):
+    """The JSON pointers and indexes in document order without looking them up."""
+
+    _mapping: "_Indexes"
+
+    def __iter__(self) -> typing.Iterator[typing.Tuple[str, int]]:
+        """Iterate over the JSON pointers with their index."""
+        return (
+            (pointer, index) for index, pointer in enumerate(self._mapping.pointers)
+        )
+
+
+class _Indexes(typing.Mapping[str, int]):
+    """
+    The index of the entry of each JSON pointer of a serialized source map.
+
+    JSON pointers are found using binary search over the entries sorted by their UTF-8
+    encoded JSON pointer so that no dictionary has to be built.
+
+    """
+
+    def __init__(self, pointers: _Pointers, order: typing.Sequence[int]) -> None:
+        """
+        Construct.
+
+        Args:
+            pointers: The JSON pointers in document order.
+            order: The index of each entry sorted by its UTF-8 encoded JSON pointer.
+
+        """
+        self.pointers = pointers
+        self._order = order
+
+    def __getitem__(self, pointer: str) -> int:
+        """Find the index of the entry of a JSON pointer."""
+        if not isinstance(pointer, str):
+            raise KeyError(pointer)
+        encoded = pointer.encode("utf-8", "surrogatepass")
+        low, high = 0, len(self._order)
+        while low < high:
+            middle = (low + high) // 2
+            if self.pointers.encoded(self._order[middle]) < encoded:
+                low = middle + 1
+            else:
+                high = middle
+        if (
+            low < len(self._order)
+            and self.pointers.encoded(self._order[low]) == encoded
+        ):
+            return self._order[low]
+        raise KeyError(pointer)
+
+    def __iter__(self) -> typing.Iterator[str]:
+        """Iterate over the JSON pointers in document order."""
+        return iter(self.pointers)
+
+    def __len__(self) -> int:
+        """Return the number of JSON pointers."""
+        return len(self.pointers)
+
+    def items(self) -> _IndexItems:
+        """Return the JSON pointers with their index in document order."""
+        return _IndexItems(self)
+
+
+def dumps(source_map: SourceMap) -> bytes:
+    """
+    Convert a compact source map to bytes.
+
+    The header is followed by little-endian 64-bit integers and then the UTF-8 encoded
+    JSON pointers. The integers are the positions of each entry, the offset of each
+    JSON pointer followed by the end of the last one, the index of each entry sorted
+    by JSON pointer, the line starts and the byte order marks of the source and the
+    offset of the JSON pointer of each alias and its anchored value followed by the
+    end of the last one. Only the last entry of a repeated key is included.
+
+    Args:
+        source_map: The compact source map.
+
+    Returns:
+        The bytes of the source map.
+
+    """
+    if not isinstance(source_map, SourceMap):
+        raise errors.InvalidInputError(
+            f"source_map must be a SourceMap, got {type(source_map)}, calculate it with "
+            "compact=True"
+        )
+    positions = source_map.positions
+    encoded_pointers = []
+    entry_positions = array.array("q")
+    for pointer, index in source_map.indexes.items():
+        encoded_pointers.append(pointer.encode("utf-8", "surrogatepass"))
+        entry_positions.extend(positions[index * _FIELDS : (index + 1) * _FIELDS])
+    offsets = [0]
+    for encoded_pointer in encoded_pointers:
+        offsets.append(offsets[-1] + len(encoded_pointer))
+    order = sorted(range(len(encoded_pointers)), key=encoded_pointers.__getitem__)
+    encoded_aliases = [
+        pointer.encode("utf-8", "surrogatepass")
+        for alias in source_map.aliases.items()
+        for pointer in alias
+    ]
+    alias_offsets = [0]
+    for encoded_alias in encoded_aliases:
+        alias_offsets.append(alias_offsets[-1] + len(encoded_alias))
+
+    lines = source_map.lines
+    return b"".join(
+        (
+            _HEADER.pack(
+                _MAGIC,
+                FORMAT_VERSION,
+                len(encoded_pointers),
+                offsets[-1],
+                len(lines),
+                lines.length,
+                len(lines.byte_order_marks),
+                len(source_map.aliases),
+                alias_offsets[-1],
+            ),
+            _to_bytes(entry_positions),
+            _to_bytes(offsets),
+            _to_bytes(order),
+            _to_bytes(lines.line_starts),
+            _to_bytes(lines.byte_order_marks),
+            _to_bytes(alias_offsets),
+            *encoded_pointers,
+            *encoded_aliases,
+        )
+    )
+
+
+def _header(data: memoryview) -> typing.Tuple[int, int, int, int, int, int, int]:
+    """Check the header and retrieve the numbers of items it contains."""
+    if len(data) < _HEADER.size:
+        raise errors.InvalidInputError("data is not a serialized source map")
+    magic, format_version, *counts = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise errors.InvalidInputError("data is not a serialized source map")
+    if format_version != FORMAT_VERSION:
+        raise errors.InvalidInputError(
+            f"expected format version {FORMAT_VERSION}, got {format_version}"
+        )
+    (
+        count,
+        pointer_size,
+        line_count,
+        length,
+        byte_order_mark_count,
+        alias_count,
+        alias_size,
+    ) = counts
+    if min(counts) < 0:
+        raise errors.InvalidInputError("data of the serialized source map is corrupt")
+    expected_size = (
+        _HEADER.size
+        + _ITEM_SIZE
+        * (6 * count + 1 + line_count + byte_order_mark_count + 2 * alias_count + 1)
+        + pointer_size
+        + alias_size
+    )
+    if len(data) != expected_size:
+        raise errors.InvalidInputError("data of the serialized source map is truncated")
+    return (
+        count,
+        pointer_size,
+        line_count,
+        length,
+        byte_order_mark_count,
+        alias_count,
+        alias_size,
+    )
+
+
+def _pointers(offsets: typing.Sequence[int], data: memoryview) -> _Pointers:
+    """
+    View JSON pointers after checking the bounds of their offsets.
+
+    The JSON pointers are decoded when they are retrieved, so only the first and last
+    offset are checked to keep loading independent of the number of entries.
+
+    """
+    if offsets[0] != 0 or offsets[-1] != len(data):
+        raise errors.InvalidInputError("data of the serialized source map is corrupt")
+    return _Pointers(offsets, data)
+
+
+def _aliases(alias_pointers: _Pointers) -> typing.Dict[str, str]:
+    """Decode the JSON pointer of each alias and of its anchored value."""
+    try:
+        return {
+            alias_pointers[index]: alias_pointers[index + 1]
+            for index in range(0, len(alias_pointers), 2)
+        }
+    except UnicodeDecodeError as error:
+        raise errors.InvalidInputError(
+            "data of the serialized source map is corrupt"
+        ) from error
+
+
+def loads(data: TBuffer) -> SourceMap:
+    """
+    Create a compact source map backed by bytes created by dumps.
+
+    The data is not copied, the positions and line starts are read from it directly
+    and the JSON pointers are decoded when they are retrieved, so loading takes the
+    same time regardless of the number of entries. The data must therefore not be
+    changed or closed while the source map is used.
+
+    Args:
+        data: The bytes of the source map, for example a memory-mapped file.
+
+    Returns:
+        The source map.
+
+    """
+    view = memoryview(data)
+    count, pointer_size, line_count, length, byte_order_mark_count, alias_count, _ = (
+        _header(view)
+    )
+    sections = []
+    start = _HEADER.size
+    for item_count in (
+        _FIELDS * count,
+        count + 1,
+        count,
+        line_count,
+        byte_order_mark_count,
+        2 * alias_count + 1,
+    ):
+        end = start + _ITEM_SIZE * item_count
+        sections.append(_integers(view[start:end]))
+        start = end
+
+    pointers = _pointers(sections[1], view[start : start + pointer_size])
+    return SourceMap(
+        pointers,
+        sections[0],
+        LineIndex(sections[3], length, sections[4]),
+        indexes=_Indexes(pointers, sections[2]),
+        # Aliases are rare, so they are decoded rather than searched
+        aliases=_aliases(_pointers(sections[5], view[start + pointer_size :])),
+    )
+
+
+def dump(source_map: SourceMap, file: typing.BinaryIO) -> None:
+    """
+    Write a compact source map to a binary file.
+
+    Args:
+        source_map: The compact source map.
+        file: The file opened for writing bytes.
+
+    """
+    file.write(dumps(source_map))
+
+
+def load(file: typing.BinaryIO) -> SourceMap:
+    """
+    Read a compact source map from a binary file.
+
+    Files on disk are memory-mapped so that only the parts that are used are read,
+    other files are read in full.
+
+    Args:
+        file: The file opened for reading bytes.
+
+    Returns:
+        The source map.
+
+    """
+    try:
+        data: TBuffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, io.UnsupportedOperation):
+        data = file.read()
+    return loads(data)
+
+
+def _reduce(
+    source_map: SourceMap,
+) -> typing.Tuple[typing.Callable[[TBuffer], SourceMap], typing.Tuple[bytes]]:
+    """Pickle a source map using the binary format."""
+    return loads, (dumps(source_map),)
+
+
+copyreg.pickle(SourceMap, _reduce)
@@ -0,0 +1,190 @@
+"""Integers that are shifted lazily when items before them are replaced."""
+
+import array
+import bisect
+import sys
+import typing
+
+# The number of ranges with an offset after which the offsets are added to the items
+_MAX_RANGES = 64
+
+
+class ShiftedArray(typing.Sequence[int]):
+    """
+    Integers stored in a typed array with an offset added to ranges of them when read.
+
+    Replacing items and shifting the items after them only copies the typed array
+    rather than adding the offset to each item, which is much slower in Python. The
+    offset of each item is found using binary search over the ranges. Negative items
+    mark missing values and are never shifted. Once there are too many ranges the
+    offsets are added to the items.
+
+    """
+
+    def __init__(
+        self,
+        values: "array.array[int]",
+        starts: typing.Sequence[int] = (),
+        offsets: typing.Sequence[int] = (),
+    ) -> None:
+        """
+        Construct.
+
+        Args:
+            values: The items without their offsets.
+            starts: The index of the first item of each range in ascending order.
+            offsets: The offset added to the items of each range.
+
+        """
+        self._values = values
+        self._starts = starts
+        self._offsets = offsets
+
+    @classmethod
+    def from_sequence(cls, values: typing.Sequence[int]) -> "ShiftedArray":
+        """
+        Create shifted integers from a sequence of integers.
+
+        Args:
+            values: The integers.
+
+        Returns:
+            The integers if they are already shifted and otherwise a copy of them.
+
+        """
+        if isinstance(values, ShiftedArray):
+            return values
+        return cls(array.array("q", values))
+
+    def offset(self, index: int) -> int:
+        """
+        Calculate the offset that is added to an item.
+
+        Args:
+            index: The index of the item.
+
+        Returns:
+            The offset.
+
+        """
+        if not self._starts:
+            return 0
+        range_index = bisect.bisect_right(self._starts, index) - 1
+        return self._offsets[range_index] if range_index >= 0 else 0
+
+    @typing.overload
+    def __getitem__(self, index: int) -> int:
+        """Retrieve an item."""
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> typing.List[int]:
+        """Retrieve a range of items."""
+
+    def __getitem__(
+        self, index: typing.Union[int, slice]
+    ) -> typing.Union[int, typing.List[int]]:
+        """Retrieve an item or a range of items with their offset."""
+        if isinstance(index, slice):
+            return [self[item] for item in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self._values)
+        value = self._values[index]
+        if value < 0:
+            return value
+        return value + self.offset(index)
+
+    def __len__(self) -> int:
+        """Return the number of items."""
+        return len(self._values)
+
+    def materialize(self) -> "ShiftedArray":
+        """
+        Add the offsets to the items.
+
+        Returns:
+            The items without any ranges with an offset.
+
+        """
+        values = array.array("q", self._values)
+        for range_index, start in enumerate(self._starts):
+            offset = self._offsets[range_index]
+            stop = (
+                self._starts[range_index + 1]
+                if range_index + 1 < len(self._starts)
+                else len(values)
+            )
+            values[start:stop] = array.array(
+                "q",
+                (
+                    value + offset if value >= 0 else value
+                    for value in values[start:stop]
+                ),
+            )
+        return ShiftedArray(values)
+
+    def splice(  # pylint: disable=too-many-locals
+        self,
+        start: int,
+        stop: int,
+        values: typing.Sequence[int],
+        delta: int,
+        changes: typing.Optional[typing.Mapping[int, int]] = None,
+    ) -> "ShiftedArray":
+        """
+        Replace a range of items and shift the items after them.
+
+        Args:
+            start: The index of the first replaced item.
+            stop: The index after the last replaced item.
+            values: The items that replace the range.
+            delta: Added to the items after the range.
+            changes: New values of items before the range by their index.
+
+        Returns:
+            The items after the replacement, the items are not changed.
+
+        """
+        changes = changes or {}
+        base = self.offset(start)
+        stored = array.array(
+            "q", (value - base if value >= 0 else value for value in values)
+        )
+        stored_changes = {
+            index: value - self.offset(index) for index, value in changes.items()
+        }
+        # Shifted items must not become negative since that marks missing values
+        if self._starts and (
+            len(self._starts) >= _MAX_RANGES
+            or any(value < 0 <= original for value, original in zip(stored, values))
+            or any(value < 0 for value in stored_changes.values())
+        ):
+            return self.materialize().splice(start, stop, values, delta, changes)
+
+        new_values = self._values[:start] + stored + self._values[stop:]
+        for index, value in stored_changes.items():
+            new_values[index] = value
+
+        starts = [item for item in self._starts if item <= start]
+        offsets = list(self._offsets[: len(starts)])
+        if starts and starts[-1] == start + len(values):
+            starts.pop()
+            offsets.pop()
+        starts.append(start + len(values))
+        offsets.append(self.offset(stop) + delta)
+        shift = len(values) - (stop - start)
+        for range_index in range(
+            bisect.bisect_right(self._starts, stop), len(self._starts)
+        ):
+            starts.append(self._starts[range_index] + shift)
+            offsets.append(self._offsets[range_index] + delta)
+
+        return ShiftedArray(new_values, starts, offsets)
+
+    def __sizeof__(self) -> int:
+        """Return the number of bytes used by the items."""
+        return (
+            object.__sizeof__(self)
+            + sys.getsizeof(self._values)
+            + sys.getsizeof(self._starts)
+            + sys.getsizeof(self._offsets)
+        )
@@ -0,0 +1,251 @@
+"""Compact source map that stores the positions of the entries in a typed array."""
+
+import array
+import collections.abc
+import sys
+import typing
+from types import MappingProxyType
+
+from . import errors, types
+from .lines import LineIndex
+
+# The position of the value start, value end, key start and key end
+_FIELDS = 4
+# Stored instead of the position of a missing key
+_MISSING = -1
+
+
+def collect(
+    marks: types.TIndexedMarks,
+) -> typing.Tuple[typing.List[str], "array.array[int]"]:
+    """
+    Collect the JSON pointers and positions of the marks of each value.
+
+    Args:
+        marks: The index in document order, the JSON pointer and the marks at the
+            start and end of the value and its key for each value.
+
+    Returns:
+        The JSON pointer of each entry in document order and the position of the value
+        start, value end, key start and key end of each entry with -1 for a missing
+        key.
+
+    """
+    pointers: typing.List[str] = []
+    positions = array.array("q")
+    for index, pointer, value_start, value_end, key_start, key_end in marks:
+        # Reserve the entries of mappings and sequences that have not ended yet
+        if index >= len(pointers):
+            missing = index + 1 - len(pointers)
+            pointers.extend([""] * missing)
+            positions.extend(array.array("q", [0]) * (_FIELDS * missing))
+
+        pointers[index] = sys.intern(pointer)
+        offset = index * _FIELDS
+        positions[offset] = value_start.index
+        positions[offset + 1] = value_end.index
+        if key_start is not None and key_end is not None:
+            positions[offset + 2] = key_start.index
+            positions[offset + 3] = key_end.index
+        else:
+            positions[offset + 2] = positions[offset + 3] = _MISSING
+    return pointers, positions
+
+
+class SourceMap(collections.abc.Mapping):
+    """
+    Source map that stores the positions of the entries in a typed array.
+
+    Behaves like the dictionary returned by calculate. Only the character positions
+    are stored, the entries are created when they are retrieved with their line and
+    column resolved using the line index of the source. A source map for a large
+    document therefore uses a fraction of the memory. The size reported by
+    sys.getsizeof includes the pointers, the typed array and the line index.
+
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        pointers: typing.Sequence[str],
+        positions: typing.Sequence[int],
+        lines: LineIndex,
+        indexes: typing.Optional[typing.Mapping[str, int]] = None,
+        aliases: typing.Optional[typing.Mapping[str, str]] = None,
+        *,
+        read_only: bool = False,
+    ) -> None:
+        """
+        Construct.
+
+        Args:
+            pointers: The JSON pointer of each entry in document order.
+            positions: The position of the value start, value end, key start and key
+                end of each entry with -1 for a missing key.
+            lines: The line index of the source.
+            indexes: The index of the entry of each JSON pointer, calculated from the
+                pointers if None.
+            aliases: The JSON pointer of the anchored value of each alias, none if
+                None.
+            read_only: Whether to copy the pointers, positions, indexes and aliases
+                so that they cannot be changed through the properties.
+
+        """
+        if len(positions) != _FIELDS * len(pointers):
+            raise errors.InvalidInputError(
+                f"expected {_FIELDS * len(pointers)} positions, got {len(positions)}"
+            )
+        self._pointers = pointers
+        self._positions = positions
+        self._lines = lines
+        self._indexes = (
+            {pointer: index for index, pointer in enumerate(pointers)}
+            if indexes is None
+            else indexes
+        )
+        self._aliases: typing.Mapping[str, str] = {} if aliases is None else aliases
+        self._read_only = read_only
+        if read_only:
+            self._pointers = tuple(self._pointers)
+            self._positions = array.array("q", self._positions)
+            self._lines = lines.read_only()
+            self._indexes = dict(self._indexes)
+            self._aliases = dict(self._aliases)
+
+    @classmethod
+    def from_indexed_marks(
+        cls,
+        marks: types.TIndexedMarks,
+        lines: LineIndex,
+        aliases: typing.Optional[typing.Mapping[str, str]] = None,
+    ) -> "SourceMap":
+        """
+        Create a source map from the marks of each value with its document order.
+
+        Args:
+            marks: The index in document order, the JSON pointer and the marks at the
+                start and end of the value and its key for each value.
+            lines: The line index of the source.
+            aliases: The JSON pointer of the anchored value of each alias, which may
+                be filled while the marks are retrieved.
+
+        Returns:
+            The source map.
+
+        """
+        pointers, positions = collect(marks)
+        return cls(pointers, positions, lines, aliases=aliases)
+
+    def read_only(self) -> "SourceMap":
+        """
+        Copy the source map so that it cannot be changed, for example to share it.
+
+        Returns:
+            The source map whose pointers, positions, indexes, aliases and line index
+            are read-only.
+
+        """
+        return SourceMap(
+            self._pointers,
+            self._positions,
+            self._lines,
+            indexes=self._indexes,
+            aliases=self._aliases,
+            read_only=True,
+        )
+
+    @property
+    def lines(self) -> LineIndex:
+        """The line index of the source to convert positions to lines and columns."""
+        return self._lines
+
+    @property
+    def pointers(self) -> typing.Sequence[str]:
+        """The JSON pointer of each entry in document order."""
+        return self._pointers
+
+    @property
+    def positions(self) -> typing.Sequence[int]:
+        """The position of the value start, value end, key start and key end."""
+        if self._read_only:
+            return memoryview(
+                typing.cast("array.array[int]", self._positions)
+            ).toreadonly()
+        return self._positions
+
+    @property
+    def indexes(self) -> typing.Mapping[str, int]:
+        """The index of the entry of each JSON pointer in document order."""
+        if self._read_only:
+            return MappingProxyType(self._indexes)
+        return self._indexes
+
+    @property
+    def aliases(self) -> typing.Mapping[str, str]:
+        """The JSON pointer of the anchored value of each alias."""
+        if self._read_only:
+            return MappingProxyType(self._aliases)
+        return self._aliases
+
+    def spans(self) -> typing.Iterator[typing.Tuple[str, int, int]]:
+        """
+        Iterate over the span of each entry without creating the entries.
+
+        Returns:
+            The JSON pointer and the position at the start of the key, or the value
+            if there is no key, and the position at the end of the value of each
+            entry in document order.
+
+        """
+        for pointer, index in self._indexes.items():
+            offset = index * _FIELDS
+            value_start = self._positions[offset]
+            key_start = self._positions[offset + 2]
+            start = (
+                value_start if key_start == _MISSING else min(value_start, key_start)
+            )
+            yield pointer, start, self._positions[offset + 1]
+
+    def __getitem__(self, pointer: str) -> types.Entry:
+        """Create the entry for a JSON pointer."""
+        offset = self._indexes[pointer] * _FIELDS
+        value_start, value_end, key_start, key_end = self._positions[
+            offset : offset + _FIELDS
+        ]
+        anchor = self._aliases.get(pointer) if self._aliases else None
+        if key_start == _MISSING:
+            return types.Entry(
+                value_start=self._lines.location(value_start),
+                value_end=self._lines.location(value_end),
+                anchor=anchor,
+            )
+        return types.Entry(
+            value_start=self._lines.location(value_start),
+            value_end=self._lines.location(value_end),
+            key_start=self._lines.location(key_start),
+            key_end=self._lines.location(key_end),
+            anchor=anchor,
+        )
+
+    def __iter__(self) -> typing.Iterator[str]:
+        """Iterate over the JSON pointers in document order."""
+        return iter(self._indexes)
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self._indexes)
+
+    def __repr__(self) -> str:
+        """Represent the source map."""
+        return f"SourceMap({dict(self)!r})"
+
+    def __sizeof__(self) -> int:
+        """Return the number of bytes used by the source map."""
+        return (
+            object.__sizeof__(self)
+            + sys.getsizeof(self._pointers)
+            + sum(sys.getsizeof(pointer) for pointer in self._pointers)
+            + sys.getsizeof(self._positions)
+            + sys.getsizeof(self._lines)
+            + sys.getsizeof(self._indexes)
+            + sys.getsizeof(self._aliases)
+        )
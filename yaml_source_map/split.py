@@ -0,0 +1,225 @@
+"""Split YAML streams at document boundaries to calculate them in parallel processes."""
+
+import array
+import bisect
+import concurrent.futures
+import functools
+import os
+import re
+import typing
+
+import yaml
+from yaml import reader
+
+from . import batch, errors, serialize
+from .lines import LineIndex
+from .source_map import SourceMap
+
+# A document start marker at the start of a line, which always starts a document
+# since the PyYAML scanner checks for it before anything else at column 0
+_DOCUMENT_START = re.compile(
+    "(?:(?<=[\n\r\x85\u2028\u2029])|\\A)---(?=[ \t\r\n\x85\u2028\u2029]|\\Z)"
+)
+# The directives of a document are on the lines before its start marker
+_DIRECTIVE = "%"
+# A document end marker at the start of a line, after which lines starting with %
+# can only be directives
+_DOCUMENT_END = re.compile("\\.\\.\\.(?=[ \t\r\n\x85\u2028\u2029]|\\Z)")
+# The number of chunks per process so that uneven documents are balanced
+_CHUNKS_PER_WORKER = 4
+
+
+def document_starts(source: str, lines: LineIndex) -> typing.List[int]:
+    """
+    Find the position at which each document after the first starts.
+
+    Lines starting with % before a start marker are only taken to be directives at
+    the start of the stream or after a document end marker, since they might
+    otherwise continue a plain scalar of the previous document. The stream is not
+    split at such a start marker, so that the document is scanned together with the
+    previous one.
+
+    Args:
+        source: The YAML stream.
+        lines: The line index of the source.
+
+    Returns:
+        The position of the start of the line of the directives or start marker of
+        each document that has one, in order.
+
+    """
+    starts = []
+    line_starts = lines.line_starts
+    for match in _DOCUMENT_START.finditer(source):
+        marker_line = line = bisect.bisect_right(line_starts, match.start()) - 1
+        while line > 0 and source.startswith(_DIRECTIVE, line_starts[line - 1]):
+            line -= 1
+        if line == 0 or (
+            line < marker_line
+            and not _DOCUMENT_END.match(source, line_starts[line - 1])
+        ):
+            continue
+        starts.append(line_starts[line])
+    return starts
+
+
+def split(source: str, lines: LineIndex, count: int) -> typing.List[int]:
+    """
+    Split a stream at document boundaries into chunks of about the same size.
+
+    Args:
+        source: The YAML stream.
+        lines: The line index of the source.
+        count: The number of chunks to aim for.
+
+    Returns:
+        The position at which each chunk starts, the first one being 0.
+
+    """
+    target = len(source) / count
+    chunk_starts = [0]
+    for start in document_starts(source, lines):
+        if start - chunk_starts[-1] >= target:
+            chunk_starts.append(start)
+    return chunk_starts
+
+
+class _ChunkError(Exception):
+    """
+    The error of a chunk and the PyYAML error that caused it.
+
+    The cause is an argument since it is dropped when the error is pickled to send it
+    back from the worker process.
+
+    """
+
+
+def _calculate_chunk(
+    calculate: typing.Callable[[str], typing.List[SourceMap]], chunk: str
+) -> typing.List[bytes]:
+    """Calculate the source maps of the documents of a chunk in a worker process."""
+    try:
+        source_maps = calculate(chunk)
+    except errors.BaseError as error:
+        raise _ChunkError(error, error.__cause__) from None
+    # The line index of the chunk is replaced by the one of the stream, so it is not
+    # sent back with each source map
+    no_lines = LineIndex([0], 0)
+    return [
+        serialize.dumps(
+            SourceMap(
+                source_map.pointers,
+                source_map.positions,
+                no_lines,
+                indexes=source_map.indexes,
+                aliases=source_map.aliases,
+            )
+        )
+        for source_map in source_maps
+    ]
+
+
+def _shift(source_map: SourceMap, offset: int, lines: LineIndex) -> SourceMap:
+    """Move the positions of a source map of a chunk to those of the whole stream."""
+    positions: typing.Sequence[int] = source_map.positions
+    if offset:
+        # Missing keys are negative and stay missing
+        positions = array.array(
+            "q",
+            (
+                position + offset if position >= 0 else position
+                for position in positions
+            ),
+        )
+    return SourceMap(
+        source_map.pointers,
+        positions,
+        lines,
+        indexes=source_map.indexes,
+        aliases=source_map.aliases,
+    )
+
+
+def _shift_mark(
+    mark: typing.Optional[yaml.Mark], offset: int, lines: LineIndex
+) -> typing.Optional[yaml.Mark]:
+    """Move a mark of a chunk to the whole stream, libyaml marks cannot be changed."""
+    if mark is None:
+        return None
+    # Chunks start at the start of a line, so the columns stay the same
+    return yaml.Mark(
+        mark.name,
+        mark.index + offset,
+        mark.line + lines.location(offset).line,
+        mark.column,
+        mark.buffer,
+        mark.pointer,
+    )
+
+
+def _shift_error(
+    error: typing.Optional[BaseException], source: str, offset: int, lines: LineIndex
+) -> None:
+    """Move the marks of a PyYAML error of a chunk to those of the whole stream."""
+    if isinstance(error, reader.ReaderError):
+        # libyaml reads the source encoded as UTF-8 and counts the position in bytes
+        if error.encoding == "unicode":
+            error.position += offset
+        else:
+            error.position += len(source[:offset].encode("utf-8", "surrogatepass"))
+    elif isinstance(error, yaml.MarkedYAMLError):
+        error.context_mark = _shift_mark(error.context_mark, offset, lines)
+        error.problem_mark = _shift_mark(error.problem_mark, offset, lines)
+
+
+def calculate_all(
+    source: str,
+    *,
+    calculate: typing.Callable[[str], typing.List[SourceMap]],
+    lines: LineIndex,
+    workers: typing.Optional[int],
+) -> typing.List[SourceMap]:
+    """
+    Calculate the source maps of the documents of a stream in parallel processes.
+
+    The stream is split into chunks at the start markers of its documents, each
+    chunk is scanned by a worker process and the positions of its source maps are
+    moved by the position of the chunk in the stream. The source maps share the line
+    index of the whole stream. The error of the first chunk that could not be
+    calculated is raised with the marks of the PyYAML error that caused it moved the
+    same way.
+
+    Args:
+        source: The YAML stream.
+        calculate: Calculates the compact source map of each document of a stream,
+            must be picklable.
+        lines: The line index of the source.
+        workers: The number of processes, the number of processors if None.
+
+    Returns:
+        The source map of each document.
+
+    """
+    batch.check_positive("workers", workers)
+    worker_count = workers or os.cpu_count() or 1
+    chunk_starts = split(source, lines, _CHUNKS_PER_WORKER * worker_count)
+    chunk_ends = chunk_starts[1:] + [len(source)]
+    chunk_results = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=worker_count) as executor:
+        results = executor.map(
+            functools.partial(_calculate_chunk, calculate),
+            (source[start:end] for start, end in zip(chunk_starts, chunk_ends)),
+        )
+        for start in chunk_starts:
+            try:
+                chunk_results.append(next(results))
+            except _ChunkError as chunk_error:
+                error, cause = chunk_error.args
+                _shift_error(cause, source, start, lines)
+                raise error from cause
+
+    return [
+        _shift(serialize.loads(data), start, lines)
+        for start, chunk_result in zip(chunk_starts, chunk_results)
+        for data in chunk_result
+    ]
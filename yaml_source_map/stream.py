@@ -0,0 +1,218 @@
+"""Read YAML documents from files and bytes in chunks."""
+
+import codecs
+import contextlib
+import io
+import os
+import typing
+
+import yaml
+
+from . import errors, loader, types
+from .lines import LineIndex, LineIndexBuilder
+
+TFile = typing.Union[  # pylint: disable=invalid-name
+    str, "os.PathLike[str]", bytes, typing.BinaryIO
+]
+
+
+def _encoding(data: bytes) -> str:
+    """Detect the encoding from the first bytes the same way as the PyYAML reader."""
+    if data.startswith(codecs.BOM_UTF16_LE):
+        return "utf-16-le"
+    if data.startswith(codecs.BOM_UTF16_BE):
+        return "utf-16-be"
+    return "utf-8"
+
+
+class TextReader:
+    """
+    Decode a binary stream in chunks the same way as the PyYAML reader.
+
+    The encoding is UTF-16 if the stream starts with its byte order mark and UTF-8
+    otherwise, the byte order mark is kept in the text like PyYAML does. A carriage
+    return at the end of a chunk is held back until the next chunk so that a line
+    break is never split. The line index of the text is recorded while it is read.
+
+    """
+
+    def __init__(
+        self,
+        stream: typing.BinaryIO,
+        *,
+        record_lines: bool = True,
+        allow_empty: bool = True,
+    ) -> None:
+        """
+        Construct.
+
+        Args:
+            stream: The stream opened for reading bytes.
+            record_lines: Whether to record the line index of the text.
+            allow_empty: Whether the stream may decode to no text at all,
+                InvalidInputError is raised at its end otherwise.
+
+        """
+        self._stream = stream
+        self._decoder: typing.Optional[codecs.IncrementalDecoder] = None
+        self._encoding = "utf-8"
+        self._carriage_return = ""
+        self._eof = False
+        self._allow_empty = allow_empty
+        self._builder = LineIndexBuilder() if record_lines else None
+
+    def _read_bytes(self, size: int) -> bytes:
+        """Read the next bytes and detect the encoding from the first ones."""
+        data = self._stream.read(size)
+        if not isinstance(data, bytes):
+            raise errors.InvalidInputError(
+                f"stream must be opened for reading bytes, got {type(data)}"
+            )
+        if self._decoder is None:
+            while 0 < len(data) < 2:
+                more = self._stream.read(size)
+                if not more:
+                    break
+                data += more
+            self._encoding = _encoding(data)
+            self._decoder = codecs.getincrementaldecoder(self._encoding)()
+        return data
+
+    def read(self, size: int = 4096) -> str:
+        """
+        Read and decode the next chunk of the stream.
+
+        Args:
+            size: The number of bytes to read.
+
+        Returns:
+            The text of the chunk, an empty string at the end of the stream.
+
+        """
+        text = ""
+        while not text and not self._eof:
+            data = self._read_bytes(size)
+            self._eof = not data
+            try:
+                text = self._carriage_return + typing.cast(
+                    codecs.IncrementalDecoder, self._decoder
+                ).decode(data, final=self._eof)
+            except UnicodeDecodeError as error:
+                raise errors.InvalidInputError(
+                    f"source is not valid {self._encoding}: {error.reason}"
+                ) from error
+            self._carriage_return = ""
+            if not self._eof and text.endswith("\r"):
+                text, self._carriage_return = text[:-1], "\r"
+
+        if text:
+            self._allow_empty = True
+        elif not self._allow_empty:
+            raise errors.InvalidInputError("source must not be empty")
+        if self._builder is not None:
+            self._builder.add(text)
+        return text
+
+    def lines(self) -> LineIndex:
+        """
+        Create the line index of the text read so far.
+
+        Returns:
+            The line index.
+
+        """
+        if self._builder is None:
+            raise errors.InvalidInputError("lines are not recorded")
+        return self._builder.build()
+
+
+class FileSource:
+    """
+    YAML document read from a binary stream in chunks.
+
+    The text is never held in memory in full. libyaml reads the stream twice, first
+    to validate it and record its line index and then to scan it for tokens, so
+    streams that cannot seek and sources with a byte order mark are scanned by the
+    pure Python scanner which reads the stream once.
+
+    """
+
+    def __init__(self, stream: typing.BinaryIO) -> None:
+        """
+        Construct.
+
+        Args:
+            stream: The stream opened for reading bytes.
+
+        """
+        self._stream = stream
+        seekable = getattr(stream, "seekable", None)
+        self._start = stream.tell() if seekable is not None and seekable() else None
+        self._reader: typing.Optional[TextReader] = None
+        self._lines: typing.Optional[LineIndex] = None
+
+    def create(self, *, engine: types.TEngine) -> types.TLoader:
+        """
+        Create the source of YAML tokens for an engine.
+
+        Args:
+            engine: The engine that scans the source, see loader.create.
+
+        Returns:
+            The source of YAML tokens.
+
+        """
+        if loader.resolve(engine) == "python" or self._start is None:
+            self._reader = TextReader(self._stream, allow_empty=False)
+            return loader.PythonLoader(self._reader)
+
+        reader = TextReader(self._stream, allow_empty=False)
+        yaml.CLoader(reader).raw_parse()
+        self._lines = reader.lines()
+        self._stream.seek(self._start)
+        # libyaml does not count byte order marks the same way as PyYAML
+        if self._lines.byte_order_marks:
+            return loader.PythonLoader(TextReader(self._stream, record_lines=False))
+        return loader.LibyamlLoader(
+            TextReader(self._stream, record_lines=False), lines=self._lines
+        )
+
+    def lines(self) -> LineIndex:
+        """
+        Retrieve the line index of the source once it has been scanned.
+
+        Returns:
+            The line index.
+
+        """
+        if self._lines is None:
+            if self._reader is None:
+                raise errors.InvalidInputError("source has not been scanned")
+            self._lines = self._reader.lines()
+        return self._lines
+
+
+@contextlib.contextmanager
+def open_file(file: TFile) -> typing.Iterator[FileSource]:
+    """
+    Open the YAML document of a path, bytes or a binary stream.
+
+    Args:
+        file: The path of the YAML document, its bytes or a stream opened for reading
+            bytes, which is not closed.
+
+    Returns:
+        The source that reads the YAML document in chunks.
+
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as stream:
+            yield FileSource(stream)
+    elif isinstance(file, bytes):
+        yield FileSource(io.BytesIO(file))
+    elif callable(getattr(file, "read", None)):
+        yield FileSource(file)
+    else:
+        raise errors.InvalidInputError(
+            f"file must be a path, bytes or a binary stream, got {type(file)}"
+        )
@@ -4,6 +4,43 @@ import dataclasses
 import typing
 
 
+class _Slotted:  # pylint: disable=too-few-public-methods
+    """
+    Base of frozen dataclasses that store their fields in slots.
+
+    Slots keep instances small since they do not have a __dict__, which slots=True of
+    dataclasses only provides from Python 3.10 onwards. The subclasses declare
+    __slots__ themselves and construct their instances in their own __init__ since a
+    default of a field would conflict with its slot.
+
+    """
+
+    __slots__: typing.Tuple[str, ...] = ()
+
+    def __reduce__(self) -> typing.Tuple[typing.Any, ...]:
+        """Construct copies from the fields since they cannot be set afterwards."""
+        return (self.__class__, tuple(getattr(self, name) for name in self.__slots__))
+
+
+def _setters(
+    cls: typing.Type[_Slotted],
+) -> typing.Tuple[typing.Callable[[typing.Any, typing.Any], None], ...]:
+    """
+    Retrieve the function that sets each slot of a frozen class.
+
+    The slots are set through their descriptors since __setattr__ raises
+    FrozenInstanceError, which is faster than object.__setattr__.
+
+    Args:
+        cls: The frozen class.
+
+    Returns:
+        The function that sets each slot in the order of __slots__.
+
+    """
+    return tuple(cls.__dict__[name].__set__ for name in cls.__slots__)
+
+
 class TLocationDict(
     typing.TypedDict
 ):  # pylint: disable=inherit-non-class,too-few-public-methods
@@ -14,8 +51,8 @@ class TLocationDict(
     pos: int
 
 
-@dataclasses.dataclass
-class Location:
+@dataclasses.dataclass(frozen=True, init=False)
+class Location(_Slotted):
     """
     The location of a source map entry.
 
@@ -27,10 +64,21 @@ class Location:
 
     """
 
+    __slots__ = ("line", "column", "position")
+
     line: int
     column: int
     position: int
 
+    def __init__(self, line: int, column: int, position: int) -> None:
+        """Construct."""
+        _SET_LINE(self, line)
+        _SET_COLUMN(self, column)
+        _SET_POSITION(self, position)
+
+
+_SET_LINE, _SET_COLUMN, _SET_POSITION = _setters(Location)
+
 
 class TEntryDictBase(
     typing.TypedDict
@@ -48,8 +96,8 @@ class TEntryDict(TEntryDictBase, total=False):  # pylint: disable=too-few-public
     keyEnd: TLocationDict
 
 
-@dataclasses.dataclass
-class Entry:
+@dataclasses.dataclass(frozen=True, init=False)
+class Entry(_Slotted):
     """
     The start and end location for a value in the source.
 
@@ -60,14 +108,73 @@ class Entry:
             an object.
         key_end: The end location of the key included if the item is directly within an
             object.
+        anchor: The JSON pointer of the value whose anchor an alias refers to, None if
+            the value is not an alias or the anchored value is not in the source map.
 
     """
 
+    __slots__ = ("value_start", "value_end", "key_start", "key_end", "anchor")
+
     value_start: Location
     value_end: Location
-    key_start: typing.Optional[Location] = None
-    key_end: typing.Optional[Location] = None
+    key_start: typing.Optional[Location]
+    key_end: typing.Optional[Location]
+    anchor: typing.Optional[str]
+
+    def __init__(
+        self,
+        value_start: Location,
+        value_end: Location,
+        key_start: typing.Optional[Location] = None,
+        key_end: typing.Optional[Location] = None,
+        anchor: typing.Optional[str] = None,
+    ) -> None:
+        """Construct."""
+        _SET_VALUE_START(self, value_start)
+        _SET_VALUE_END(self, value_end)
+        _SET_KEY_START(self, key_start)
+        _SET_KEY_END(self, key_end)
+        _SET_ANCHOR(self, anchor)
+
+
+(
+    _SET_VALUE_START,
+    _SET_VALUE_END,
+    _SET_KEY_START,
+    _SET_KEY_END,
+    _SET_ANCHOR,
+) = _setters(Entry)
+
+
+class TMark(typing.Protocol):  # pylint: disable=too-few-public-methods
+    """The location of a token in the source."""
+
+    line: int
+    column: int
+    index: int
+
+
+class TTextStream(typing.Protocol):  # pylint: disable=too-few-public-methods
+    """Stream that reads a YAML document in chunks."""
+
+    def read(self, size: int) -> str:
+        """Read the next chunk, an empty string at the end of the stream."""
+
+
+class TLoader(typing.Protocol):
+    """Source of YAML tokens."""
+
+    def peek_token(self) -> typing.Any:
+        """Retrieve the next token without consuming it."""
+
+    def get_token(self) -> typing.Any:
+        """Retrieve and consume the next token."""
 
 
+TEngine = typing.Literal["auto", "libyaml", "python"]
 TSourceMapEntries = typing.List[typing.Tuple[str, Entry]]
+TSourceMapIterator = typing.Iterator[typing.Tuple[str, Entry]]
+TIndexedMarks = typing.Iterator[
+    typing.Tuple[int, str, TMark, TMark, typing.Optional[TMark], typing.Optional[TMark]]
+]
 TSourceMap = typing.Dict[str, Entry]